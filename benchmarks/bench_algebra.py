@@ -0,0 +1,147 @@
+"""Measure merges, diffs and containment checks of BEL models.
+
+Usage: python benchmarks/bench_algebra.py [--statements N] [--documents N]
+                                          [--changes N]
+
+Models are copied by pickling, so that equal statements of different models
+are different objects, as when they are read from different files. Set
+operations on statements are compared with momapy_bel.algebra, whose
+fingerprints are timed separately (cold) from the operations (warm).
+"""
+
+import argparse
+import pickle
+import random
+import time
+
+import momapy_bel.algebra
+import momapy_bel.core
+
+
+def make_statements(n_statements, seed=0):
+    random_ = random.Random(seed)
+    terms = [
+        momapy_bel.core.ProteinAbundance(
+            namespace="HGNC",
+            identifier=f"GENE{i}",
+            location=momapy_bel.core.Location(
+                namespace="GO", identifier="cytoplasm"
+            ),
+        )
+        for i in range(n_statements // 4)
+    ]
+    terms += [
+        momapy_bel.core.ComplexAbundance(
+            members=frozenset(random_.sample(terms, 3))
+        )
+        for _ in range(n_statements // 8)
+    ]
+    return [
+        random_.choice(momapy_bel.core.RELATION_CLSES)(
+            source=random_.choice(terms), target=random_.choice(terms)
+        )
+        for _ in range(n_statements)
+    ]
+
+
+def copy(obj):
+    return pickle.loads(pickle.dumps(obj))
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=200000)
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--changes", type=int, default=1000)
+    args = parser.parse_args()
+    statements = make_statements(args.statements + args.changes)
+    old_model = momapy_bel.core.BELModel(
+        statements=frozenset(statements[: args.statements])
+    )
+    removed_statements = random.Random(1).sample(
+        statements[: args.statements], args.changes
+    )
+    new_model = copy(
+        momapy_bel.core.BELModel(
+            statements=old_model.statements.difference(removed_statements)
+            | frozenset(statements[args.statements :])
+        )
+    )
+    sub_model = copy(
+        momapy_bel.core.BELModel(
+            statements=frozenset(statements[: args.statements // 2])
+        )
+    )
+    # Documents overlap by half
+    document_size = 2 * args.statements // args.documents
+    documents = [
+        copy(
+            momapy_bel.core.BELModel(
+                statements=frozenset(
+                    statements[
+                        i * document_size // 2 : i * document_size // 2
+                        + document_size
+                    ]
+                )
+            )
+        )
+        for i in range(args.documents)
+    ]
+
+    duration, _ = timed(
+        lambda: (
+            old_model.statements - new_model.statements,
+            new_model.statements - old_model.statements,
+        )
+    )
+    print(f"diff, set differences: {duration:.3f}s")
+    duration, _ = timed(
+        lambda: sub_model.statements.issubset(old_model.statements)
+    )
+    print(f"containment, issubset: {duration:.3f}s")
+    duration, _ = timed(
+        lambda: frozenset().union(
+            *[document.statements for document in documents]
+        )
+    )
+    print(f"merge, frozenset union: {duration:.3f}s")
+
+    duration, _ = timed(
+        lambda: [
+            momapy_bel.algebra.get_fingerprint_to_statement(bel_model)
+            for bel_model in [old_model, new_model, sub_model] + documents
+        ]
+    )
+    print(f"fingerprints, once per model: {duration:.3f}s")
+    duration, bel_model_diff = timed(
+        lambda: momapy_bel.algebra.diff(old_model, new_model)
+    )
+    print(f"diff, algebra: {duration:.3f}s")
+    duration, is_submodel = timed(
+        lambda: momapy_bel.algebra.is_submodel(sub_model, old_model)
+    )
+    print(f"containment, algebra: {duration:.3f}s")
+    duration, (merged_model, _) = timed(
+        lambda: momapy_bel.algebra.merge(documents)
+    )
+    print(f"merge, algebra: {duration:.3f}s")
+    assert is_submodel
+    assert (
+        len(bel_model_diff.added)
+        + len(bel_model_diff.removed)
+        + 2 * len(bel_model_diff.changed)
+        == 2 * args.changes
+    )
+    assert len(merged_model.statements) == len(
+        frozenset().union(*[document.statements for document in documents])
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Compare saving and loading a BEL model as BELB and as text BEL.
+
+Usage: python benchmarks/bench_belb.py [--statements N] [--terms T]
+
+The model is the one read from the synthetic file of bench_reader.py. Both
+formats must load back to the same statements, and BELB to the same
+annotations. The BELB file is also opened memory-mapped, and one statement
+in a hundred accessed.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import bench_reader
+
+import momapy_bel.io.bel
+import momapy_bel.io.belb
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def get_annotations(result):
+    return {
+        (None if element is result.obj else element): annotations
+        for element, annotations in result.element_to_annotations.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=200000)
+    parser.add_argument("--terms", type=int, default=20000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        input_file_path = os.path.join(directory, "input.bel")
+        with open(input_file_path, "w") as f:
+            bench_reader.write_bel_file(f, args.statements, args.terms)
+        result = momapy_bel.io.bel.BELReader.read(input_file_path)
+        for label, writer_cls, reader_cls, file_name in [
+            (
+                "text",
+                momapy_bel.io.bel.BELWriter,
+                momapy_bel.io.bel.BELReader,
+                "output.bel",
+            ),
+            (
+                "belb",
+                momapy_bel.io.belb.BELBWriter,
+                momapy_bel.io.belb.BELBReader,
+                "output.belb",
+            ),
+        ]:
+            file_path = os.path.join(directory, file_name)
+            save_time, _ = timed(
+                lambda: writer_cls.write(
+                    result.obj,
+                    file_path,
+                    result.namespace_definitions,
+                    result.annotation_definitions,
+                    result.element_to_annotations,
+                )
+            )
+            load_time, loaded_result = timed(
+                lambda: reader_cls.read(file_path)
+            )
+            assert loaded_result.obj.statements == result.obj.statements
+            # Text BEL keeps one annotation per name for each statement
+            if reader_cls is momapy_bel.io.belb.BELBReader:
+                assert get_annotations(loaded_result) == get_annotations(
+                    result
+                )
+            print(
+                f"{label}: {os.path.getsize(file_path) / 1e6:.1f} MB, "
+                f"save {save_time:.2f}s, load {load_time:.2f}s"
+            )
+        open_time, mapped_result = timed(
+            lambda: momapy_bel.io.belb.BELBReader.read(file_path, mapped=True)
+        )
+        statements = mapped_result.obj.statements
+        access_time, _ = timed(
+            lambda: [
+                statements.get_statement(index)
+                for index in range(0, len(statements), 100)
+            ]
+        )
+        assert set(statements) == result.obj.statements
+        print(
+            f"belb mapped: open {open_time * 1e3:.2f}ms, "
+            f"{len(statements) // 100} statements {access_time:.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
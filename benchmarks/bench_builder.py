@@ -0,0 +1,90 @@
+"""Measure small edits of a large BEL model.
+
+Usage: python benchmarks/bench_builder.py [--statements N] [--edits N]
+
+Each edit adds a statement and removes another one, builds the model and
+queries its index by source. Edits are applied by replacing the statements
+of the model, and with an incremental builder. Converting the model with the
+generic builder is timed once.
+"""
+
+import argparse
+import dataclasses
+import random
+import time
+
+import momapy.builder
+
+import momapy_bel.core
+
+
+def make_statements(n_statements, seed=0):
+    random_ = random.Random(seed)
+    terms = [
+        momapy_bel.core.ProteinAbundance(namespace="HGNC", identifier=f"GENE{i}")
+        for i in range(n_statements // 4)
+    ]
+    return [
+        random_.choice(momapy_bel.core.RELATION_CLSES)(
+            source=random_.choice(terms), target=random_.choice(terms)
+        )
+        for _ in range(n_statements)
+    ]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def edit_by_replacing(bel_model, edits):
+    for added_statement, removed_statement in edits:
+        bel_model = dataclasses.replace(
+            bel_model,
+            statements=(bel_model.statements - {removed_statement})
+            | {added_statement},
+        )
+        bel_model.index.get_statements_by_source(added_statement.source)
+    return bel_model
+
+
+def edit_incrementally(bel_model, edits):
+    builder = momapy_bel.core.IncrementalBELModelBuilder.from_object(bel_model)
+    for added_statement, removed_statement in edits:
+        builder.remove_statement(removed_statement)
+        builder.add_statement(added_statement)
+        bel_model = builder.build()
+        bel_model.index.get_statements_by_source(added_statement.source)
+    return bel_model
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=200000)
+    parser.add_argument("--edits", type=int, default=20)
+    args = parser.parse_args()
+    statements = make_statements(args.statements + args.edits)
+    bel_model = momapy_bel.core.BELModel(
+        statements=frozenset(statements[: args.statements])
+    )
+    edits = list(
+        zip(
+            statements[args.statements :],
+            random.Random(1).sample(statements[: args.statements], args.edits),
+        )
+    )
+    duration, _ = timed(
+        lambda: momapy.builder.builder_from_object(bel_model).build()
+    )
+    print(f"generic builder, one round trip: {duration:.3f}s")
+    duration, replaced_model = timed(lambda: edit_by_replacing(bel_model, edits))
+    print(f"replacing statements: {duration / args.edits * 1000:.1f}ms/edit")
+    bel_model.index.get_statements_by_source(statements[0].source)
+    duration, built_model = timed(lambda: edit_incrementally(bel_model, edits))
+    print(f"incremental builder: {duration / args.edits * 1000:.1f}ms/edit")
+    assert built_model == replaced_model
+
+
+if __name__ == "__main__":
+    main()
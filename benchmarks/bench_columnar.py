@@ -0,0 +1,109 @@
+"""Compare queries on BEL models to the same queries on their columnar form.
+
+Usage: python benchmarks/bench_columnar.py [--statements N] [--terms N]
+
+Counts relations by class, selects the increases statements of a set of
+sources, and joins statements whose target is the source of another one.
+"""
+
+import argparse
+import collections
+import random
+import time
+
+import momapy_bel.columnar
+import momapy_bel.core
+
+
+def make_bel_model(n_statements, n_terms, seed=0):
+    random_ = random.Random(seed)
+    terms = [
+        momapy_bel.core.ProteinAbundance(namespace="HGNC", identifier=f"GENE{i}")
+        for i in range(n_terms)
+    ]
+    relation_clses = momapy_bel.columnar.RELATION_CLSES
+    statements = [
+        random_.choice(relation_clses)(
+            source=random_.choice(terms), target=random_.choice(terms)
+        )
+        for _ in range(n_statements)
+    ]
+    return momapy_bel.core.BELModel(statements=frozenset(statements)), terms
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def count_relations(bel_model):
+    return collections.Counter(
+        type(statement) for statement in bel_model.statements
+    )
+
+
+def select(bel_model, sources):
+    return [
+        statement
+        for statement in bel_model.statements
+        if type(statement) is momapy_bel.core.Increases
+        and statement.source in sources
+    ]
+
+
+def join(bel_model):
+    source_to_statements = collections.defaultdict(list)
+    for statement in bel_model.statements:
+        source_to_statements[statement.source].append(statement)
+    return [
+        (statement, other_statement)
+        for statement in bel_model.statements
+        for other_statement in source_to_statements.get(statement.target, [])
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=200000)
+    parser.add_argument("--terms", type=int, default=50000)
+    args = parser.parse_args()
+    bel_model, terms = make_bel_model(args.statements, args.terms)
+    sources = set(terms[::10])
+    duration, columnar_model = timed(
+        lambda: momapy_bel.columnar.ColumnarBELModel.from_bel_model(bel_model)
+    )
+    print(f"conversion: {duration:.3f}s")
+    for name, func, columnar_func in [
+        (
+            "count",
+            lambda: count_relations(bel_model),
+            lambda: columnar_model.count_relations(),
+        ),
+        (
+            "select",
+            lambda: len(select(bel_model, sources)),
+            lambda: len(
+                columnar_model.select(
+                    relation_clses=[momapy_bel.core.Increases],
+                    sources=sources,
+                )
+            ),
+        ),
+        (
+            "join",
+            lambda: len(join(bel_model)),
+            lambda: len(columnar_model.join()[0]),
+        ),
+    ]:
+        duration, result = timed(func)
+        columnar_duration, columnar_result = timed(columnar_func)
+        assert result == columnar_result
+        print(
+            f"{name}: {duration:.3f}s, columnar {columnar_duration:.4f}s, "
+            f"speedup {duration / columnar_duration:.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
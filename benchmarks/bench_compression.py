@@ -0,0 +1,66 @@
+"""Compare writing BEL to a gzip file serially and by parallel blocks.
+
+Usage: python benchmarks/bench_compression.py [--statements N] [--terms T]
+    [--threads N]
+
+All outputs, .bz2 and .xz ones included, must read back to the statements
+of the uncompressed output.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import bench_reader
+
+import momapy_bel.io.bel
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=200000)
+    parser.add_argument("--terms", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        input_file_path = os.path.join(directory, "input.bel")
+        with open(input_file_path, "w") as f:
+            bench_reader.write_bel_file(f, args.statements, args.terms)
+        result = momapy_bel.io.bel.BELReader.read(input_file_path)
+        for label, file_name, compression_threads in [
+            ("uncompressed", "output.bel", None),
+            ("gzip", "output.bel.gz", None),
+            (f"gzip, {args.threads} threads", "output.bel.gz", args.threads),
+            ("bzip2", "output.bel.bz2", None),
+            ("xz", "output.bel.xz", None),
+        ]:
+            file_path = os.path.join(directory, file_name)
+            write_time, _ = timed(
+                lambda: momapy_bel.io.bel.BELWriter.write(
+                    result.obj,
+                    file_path,
+                    result.namespace_definitions,
+                    result.annotation_definitions,
+                    result.element_to_annotations,
+                    compression_threads=compression_threads,
+                )
+            )
+            read_time, read_result = timed(
+                lambda: momapy_bel.io.bel.BELReader.read(file_path)
+            )
+            assert read_result.obj.statements == result.obj.statements
+            print(
+                f"{label}: {os.path.getsize(file_path) / 1e6:.1f} MB, "
+                f"write {write_time:.2f}s, read {read_time:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
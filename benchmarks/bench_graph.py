@@ -0,0 +1,128 @@
+"""Compare neighbourhood expansions on the causal graph of a BEL model to
+the same expansions over its statements.
+
+Usage: python benchmarks/bench_graph.py [--statements N] [--terms N]
+    [--queries N] [--hops K]
+"""
+
+import argparse
+import collections
+import random
+import time
+
+import momapy_bel.core
+import momapy_bel.graph
+
+
+def make_bel_model(n_statements, n_terms, seed=0):
+    random_ = random.Random(seed)
+    terms = [
+        momapy_bel.core.ProteinAbundance(namespace="HGNC", identifier=f"GENE{i}")
+        for i in range(n_terms)
+    ]
+    relation_clses = list(momapy_bel.graph.CAUSAL_RELATION_CLS_TO_SIGN)
+    statements = [
+        random_.choice(relation_clses)(
+            source=random_.choice(terms), target=random_.choice(terms)
+        )
+        for _ in range(n_statements)
+    ]
+    return momapy_bel.core.BELModel(statements=frozenset(statements)), terms
+
+
+def k_hop(source_to_targets, nodes, k):
+    depths = {node: 0 for node in nodes}
+    frontier = list(nodes)
+    for depth in range(1, k + 1):
+        next_frontier = []
+        for node in frontier:
+            for target in source_to_targets.get(node, []):
+                if target not in depths:
+                    depths[target] = depth
+                    next_frontier.append(target)
+        frontier = next_frontier
+    return [node for node, depth in depths.items() if depth > 0]
+
+
+def shortest_path(source_to_targets, source, target):
+    parents = {source: None}
+    frontier = [source]
+    while frontier and target not in parents:
+        next_frontier = []
+        for node in frontier:
+            for neighbor in source_to_targets.get(node, []):
+                if neighbor not in parents:
+                    parents[neighbor] = node
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    if target not in parents:
+        return None
+    path = [target]
+    while path[-1] != source:
+        path.append(parents[path[-1]])
+    return path[::-1]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=200000)
+    parser.add_argument("--terms", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--hops", type=int, default=2)
+    args = parser.parse_args()
+    bel_model, terms = make_bel_model(args.statements, args.terms)
+    queries = random.Random(1).sample(terms, args.queries)
+    duration, causal_graph = timed(
+        lambda: momapy_bel.graph.get_causal_graph(bel_model)
+    )
+    print(f"graph: {duration:.3f}s")
+    duration, _ = timed(lambda: momapy_bel.graph.get_causal_graph(bel_model))
+    print(f"cached graph: {duration:.6f}s")
+    # The first traversal imports parts of NumPy
+    causal_graph.k_hop([[node] for node in queries], args.hops)
+    source_to_targets = collections.defaultdict(list)
+    for statement in bel_model.statements:
+        source_to_targets[statement.source].append(statement.target)
+    duration, results = timed(
+        lambda: [k_hop(source_to_targets, [node], args.hops) for node in queries]
+    )
+    graph_duration, graph_results = timed(
+        lambda: causal_graph.k_hop([[node] for node in queries], args.hops)
+    )
+    assert all(
+        set(result) == set(graph_result)
+        for result, graph_result in zip(results, graph_results)
+    )
+    print(
+        f"{args.queries} {args.hops}-hop expansions: objects {duration:.3f}s, "
+        f"graph {graph_duration:.3f}s"
+    )
+    pairs = [tuple(random.Random(i).sample(terms, 2)) for i in range(100)]
+    duration, paths = timed(
+        lambda: [
+            shortest_path(source_to_targets, source, target)
+            for source, target in pairs
+        ]
+    )
+    graph_duration, graph_paths = timed(
+        lambda: [
+            causal_graph.shortest_path(source, target)
+            for source, target in pairs
+        ]
+    )
+    assert [len(path or ()) for path in paths] == [
+        len(path or ()) for path in graph_paths
+    ]
+    print(
+        f"100 shortest paths: objects {duration:.3f}s, "
+        f"graph {graph_duration:.3f}s"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Measure hashing and comparison of large BEL models.
+
+Usage: python benchmarks/bench_hash.py [--statements N] [--depth D]
+
+Each operation is timed twice on the same elements: the first (cold) run
+computes the hashes as it goes, which is what every run cost before hashes
+were cached; the second (warm) run uses the cached hashes. Annotations are
+looked up by statement, as done when writing a model. The cold hash of a
+single new element, which computes and stores its hash, is compared to the
+hash generated by dataclass() for the same fields.
+"""
+
+import argparse
+import dataclasses
+import time
+
+import momapy.core
+
+import momapy_bel.core
+
+
+def make_term(i, depth):
+    term = momapy_bel.core.ProteinAbundance(
+        namespace="HGNC",
+        identifier=f"GENE{i}",
+        location=momapy_bel.core.Location(
+            namespace="GO", identifier="cytoplasm"
+        ),
+    )
+    for level in range(depth):
+        term = momapy_bel.core.ComplexAbundance(
+            members=frozenset(
+                [
+                    term,
+                    momapy_bel.core.ProteinAbundance(
+                        namespace="HGNC", identifier=f"GENE{i}_{level}"
+                    ),
+                ]
+            )
+        )
+    return term
+
+
+def make_statements(n_statements, depth):
+    statements = []
+    for i in range(n_statements):
+        # Nested statements are hashed through tuples, whose hashes are not
+        # cached, unlike those of the frozensets of complexes and reactions
+        target = momapy_bel.core.Reaction(
+            reactants=frozenset([make_term(i + 1, depth)]),
+            products=frozenset([make_term(i + 2, depth)]),
+        )
+        for level in range(depth):
+            target = momapy_bel.core.DirectlyIncreases(
+                source=momapy_bel.core.Activity(
+                    abundance=make_term(i + level, 0)
+                ),
+                target=target,
+            )
+        statements.append(
+            momapy_bel.core.Increases(source=make_term(i, depth), target=target)
+        )
+    return statements
+
+
+def make_dataclass_hash_cls(element_cls):
+    fields = [
+        (field_.name, field_.type, field_)
+        for field_ in dataclasses.fields(element_cls)
+        if field_.name != "id_"
+    ]
+    return dataclasses.make_dataclass(
+        element_cls.__name__,
+        [
+            (
+                name,
+                type_,
+                dataclasses.field(
+                    default=field_.default,
+                    default_factory=field_.default_factory,
+                ),
+            )
+            for name, type_, field_ in fields
+        ],
+        bases=(momapy.core.ModelElement,),
+        frozen=True,
+        kw_only=True,
+    )
+
+
+def time_cold_hash(element_cls, n_elements):
+    location = momapy_bel.core.Location(namespace="GO", identifier="cytoplasm")
+    elements = [
+        element_cls(
+            namespace="HGNC", identifier=f"GENE{i}", location=location
+        )
+        for i in range(n_elements)
+    ]
+    duration, _ = timed(lambda: [hash(element) for element in elements])
+    return duration / n_elements
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=20000)
+    parser.add_argument("--depth", type=int, default=4)
+    args = parser.parse_args()
+    statements = make_statements(args.statements, args.depth)
+    other_statements = make_statements(args.statements, args.depth)
+    cold, model = timed(
+        lambda: momapy_bel.core.BELModel(statements=frozenset(statements))
+    )
+    warm, _ = timed(
+        lambda: momapy_bel.core.BELModel(statements=frozenset(statements))
+    )
+    print(f"build model: cold {cold:.3f}s, warm {warm:.3f}s")
+    annotations = {statement: frozenset() for statement in statements}
+    cold, _ = timed(
+        lambda: [annotations.get(statement) for statement in other_statements]
+    )
+    warm, _ = timed(
+        lambda: [annotations.get(statement) for statement in other_statements]
+    )
+    print(f"annotation lookups: cold {cold:.3f}s, warm {warm:.3f}s")
+    other_model = momapy_bel.core.BELModel(
+        statements=frozenset(other_statements)
+    )
+    duration, _ = timed(lambda: model.is_submodel(other_model))
+    print(f"is_submodel: {duration:.3f}s")
+    n_elements = 10 * args.statements
+    cached = time_cold_hash(momapy_bel.core.ProteinAbundance, n_elements)
+    generated = time_cold_hash(
+        make_dataclass_hash_cls(momapy_bel.core.ProteinAbundance), n_elements
+    )
+    print(
+        f"cold hash of a new element: cached {cached * 1e9:.0f}ns, "
+        f"dataclass {generated * 1e9:.0f}ns"
+    )
+
+
+if __name__ == "__main__":
+    main()
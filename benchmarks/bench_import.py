@@ -0,0 +1,112 @@
+"""Measure the time taken to import momapy_bel modules.
+
+Usage: python benchmarks/bench_import.py [--runs N] [--compare REV]
+    [--modules M [M ...]]
+
+Each module is imported in a fresh interpreter run with -X importtime, and
+the median of the cumulative import times reported by Python is printed,
+with the modules that took the most time on their own in the last run.
+Bytecode is compiled beforehand, so that it is not part of the measure.
+With --compare, the same measure is made on the sources of momapy_bel at
+the given git revision, extracted to a temporary directory.
+"""
+
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+DEFAULT_MODULES = ["momapy_bel.core", "momapy_bel.io.bel"]
+
+SRC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+
+def get_import_times(module_name, src_dir):
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(
+        [src_dir] + environment.get("PYTHONPATH", "").split(os.pathsep)
+    )
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        env=environment,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    ).stderr
+    module_name_to_times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, cumulative_time, imported_module_name = line[
+            len("import time:") :
+        ].split("|")
+        if self_time.strip().isdigit():
+            module_name_to_times[imported_module_name.strip()] = (
+                int(self_time) / 1e3,
+                int(cumulative_time) / 1e3,
+            )
+    return module_name_to_times
+
+
+def measure(module_name, src_dir, runs):
+    cumulative_times = []
+    for _ in range(runs):
+        module_name_to_times = get_import_times(module_name, src_dir)
+        cumulative_times.append(module_name_to_times[module_name][1])
+    slowest_module_names = sorted(
+        module_name_to_times,
+        key=lambda name: module_name_to_times[name][0],
+        reverse=True,
+    )[:5]
+    return statistics.median(cumulative_times), [
+        (name, module_name_to_times[name][0]) for name in slowest_module_names
+    ]
+
+
+def extract_src_dir(revision, directory):
+    archive_file_path = os.path.join(directory, "src.tar")
+    subprocess.run(
+        ["git", "archive", "-o", archive_file_path, revision, "src"],
+        cwd=os.path.dirname(SRC_DIR),
+        check=True,
+    )
+    with tarfile.open(archive_file_path) as archive:
+        archive.extractall(directory)
+    return os.path.join(directory, "src")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--compare")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        label_and_src_dirs = [("current", SRC_DIR)]
+        if args.compare is not None:
+            label_and_src_dirs.insert(
+                0, (args.compare, extract_src_dir(args.compare, directory))
+            )
+        for label, src_dir in label_and_src_dirs:
+            compileall.compile_dir(src_dir, quiet=1)
+            for module_name in args.modules:
+                median_time, slowest_modules = measure(
+                    module_name, src_dir, args.runs
+                )
+                print(
+                    f"{label}, {module_name}: {median_time:.1f}ms, slowest "
+                    + ", ".join(
+                        f"{name} {self_time:.1f}ms"
+                        for name, self_time in slowest_modules
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare full and incremental canonical writes of an edited model.
+
+Usage: python benchmarks/bench_incremental.py [--statements N]
+    [--changes N] [--block-size N]
+
+A model is written once with a block cache, then edited by removing and
+adding --changes statements, and written again with and without the block
+cache. Both outputs must match byte for byte.
+"""
+
+import argparse
+import io
+import time
+
+import synthetic
+
+import momapy_bel.core
+import momapy_bel.io.bel
+
+
+def write(bel_model, annotation_definitions, annotations, **options):
+    stream = io.StringIO()
+    start = time.perf_counter()
+    momapy_bel.io.bel.BELWriter.write(
+        bel_model,
+        stream,
+        [],
+        annotation_definitions,
+        annotations,
+        with_canonical_order=True,
+        **options,
+    )
+    return time.perf_counter() - start, stream.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=100000)
+    parser.add_argument("--changes", type=int, default=100)
+    parser.add_argument("--block-size", type=int, default=64)
+    args = parser.parse_args()
+    statements, annotation_definitions, annotations = (
+        synthetic.make_statements_and_annotations(
+            args.statements + args.changes
+        )
+    )
+    old_statements = statements[: args.statements]
+    new_statements = statements[args.changes :]
+    old_bel_model = momapy_bel.core.BELModel(
+        statements=frozenset(old_statements)
+    )
+    new_bel_model = momapy_bel.core.BELModel(
+        statements=frozenset(new_statements)
+    )
+    block_cache = momapy_bel.io.bel.BELStatementBlockCache(args.block_size)
+    first_time, _ = write(
+        old_bel_model,
+        annotation_definitions,
+        annotations,
+        block_cache=block_cache,
+    )
+    full_time, full_output = write(
+        new_bel_model, annotation_definitions, annotations
+    )
+    block_cache.hits = block_cache.misses = 0
+    incremental_time, incremental_output = write(
+        new_bel_model,
+        annotation_definitions,
+        annotations,
+        block_cache=block_cache,
+    )
+    assert incremental_output == full_output
+    print(
+        f"{args.statements} statements, {args.changes} removed and added: "
+        f"first write {first_time:.2f}s, full {full_time:.2f}s, "
+        f"incremental {incremental_time:.2f}s "
+        f"({full_time / incremental_time:.1f}x), "
+        f"block hit rate {block_cache.hit_rate():.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compare queries on the index of a BEL model to scans of its statements.
+
+Usage: python benchmarks/bench_index.py [--statements N] [--terms N]
+"""
+
+import argparse
+import random
+import time
+
+import momapy_bel.core
+
+
+def make_bel_model(n_statements, n_terms, seed=0):
+    random_ = random.Random(seed)
+    location = momapy_bel.core.Location(namespace="GO", identifier="nucleus")
+    terms = [
+        momapy_bel.core.ProteinAbundance(
+            namespace="HGNC",
+            identifier=f"GENE{i}",
+            location=location if i % 100 == 0 else None,
+        )
+        for i in range(n_terms)
+    ]
+    statements = [
+        random_.choice(momapy_bel.core.RELATION_CLSES)(
+            source=random_.choice(terms), target=random_.choice(terms)
+        )
+        for _ in range(n_statements)
+    ]
+    return momapy_bel.core.BELModel(statements=frozenset(statements)), terms
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=200000)
+    parser.add_argument("--terms", type=int, default=50000)
+    args = parser.parse_args()
+    bel_model, terms = make_bel_model(args.statements, args.terms)
+    term = terms[1]
+    index = bel_model.index
+    for name, scan, query in [
+        (
+            "by class",
+            lambda: [
+                statement
+                for statement in bel_model.statements
+                if isinstance(statement, momapy_bel.core.DirectlyIncreases)
+            ],
+            lambda: index.get_statements_by_class(
+                momapy_bel.core.DirectlyIncreases
+            ),
+        ),
+        (
+            "by source",
+            lambda: [
+                statement
+                for statement in bel_model.statements
+                if statement.source == term
+            ],
+            lambda: index.get_statements_by_source(term),
+        ),
+        (
+            "by namespace:identifier",
+            lambda: [
+                statement
+                for statement in bel_model.statements
+                if statement.source.identifier == "GENE1"
+                or statement.target.identifier == "GENE1"
+            ],
+            lambda: index.get_statements_by_namespace_identifier(
+                "HGNC", "GENE1"
+            ),
+        ),
+    ]:
+        scan_duration, scan_result = timed(scan)
+        build_duration, _ = timed(query)
+        query_duration, query_result = timed(query)
+        assert set(scan_result) == set(query_result)
+        print(
+            f"{name}: scan {scan_duration:.4f}s, "
+            f"first query {build_duration:.4f}s, "
+            f"next queries {query_duration:.6f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Report the memory used by instances of BEL model elements.
+
+Usage: python benchmarks/bench_memory.py [--instances N]
+
+Each element class is compared to a slotted copy of itself, whose fields
+and cached hash are stored in slots rather than in the instance __dict__.
+Instances are hashed, as they are once in a model, so that the cached hash
+is measured too. Field values, including ids, are shared between instances
+so that only the instances themselves are measured: each generated id adds
+about 85 bytes on top of the reported sizes.
+"""
+
+import argparse
+import dataclasses
+import gc
+import sys
+import tracemalloc
+
+import momapy_bel.core
+
+
+class SlottedBELModelElement(momapy_bel.core.BELModelElement):
+    __slots__ = ("_hash",)
+
+
+def make_slotted_cls(element_cls):
+    fields = [
+        (
+            field_.name,
+            field_.type,
+            dataclasses.field(
+                default=field_.default,
+                default_factory=field_.default_factory,
+                hash=field_.hash,
+                compare=field_.compare,
+            ),
+        )
+        for field_ in dataclasses.fields(element_cls)
+        if field_.name != "id_"
+    ]
+    return dataclasses.make_dataclass(
+        element_cls.__name__,
+        fields,
+        bases=(SlottedBELModelElement,),
+        frozen=True,
+        kw_only=True,
+        slots=True,
+    )
+
+
+def get_bytes_per_instance(element_cls, kwargs, n_instances):
+    gc.collect()
+    tracemalloc.start()
+    elements = [element_cls(**kwargs) for _ in range(n_instances)]
+    # Slots of hashes are empty rather than None until they are set, hence
+    # the same hash is set directly on the instances of both layouts
+    for element in elements:
+        object.__setattr__(element, "_hash", 0)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del elements
+    return size / n_instances
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--instances", type=int, default=100000)
+    args = parser.parse_args()
+    id_ = "id"
+    location = momapy_bel.core.Location(
+        id_=id_, namespace="GO", identifier="cytoplasm"
+    )
+    protein = momapy_bel.core.ProteinAbundance(
+        id_=id_, namespace="HGNC", identifier="TP53"
+    )
+    cases = [
+        (momapy_bel.core.Location, {"namespace": "GO", "identifier": "x"}),
+        (
+            momapy_bel.core.ProteinAbundance,
+            {"namespace": "HGNC", "identifier": "TP53", "location": location},
+        ),
+        (
+            momapy_bel.core.ComplexAbundance,
+            {"members": frozenset([protein])},
+        ),
+        (momapy_bel.core.Activity, {"abundance": protein}),
+        (momapy_bel.core.Increases, {"source": protein, "target": protein}),
+    ]
+    print(f"Python {sys.version.split()[0]}, bytes per hashed instance")
+    print(f"{'class':<20}{'__dict__':>10}{'slots':>10}{'saved':>10}")
+    for element_cls, kwargs in cases:
+        kwargs = dict(kwargs, id_=id_)
+        before = get_bytes_per_instance(element_cls, kwargs, args.instances)
+        after = get_bytes_per_instance(
+            make_slotted_cls(element_cls), kwargs, args.instances
+        )
+        print(
+            f"{element_cls.__name__:<20}{before:>10.0f}{after:>10.0f}"
+            f"{round(before - after):>10d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Compare the serial and parallel modes of BELWriter.
+
+Usage: python benchmarks/bench_parallel_writer.py [--statements N]
+    [--terms T] [--processes N] [--chunk-size N]
+
+The parallel output must match the serial one byte for byte, with and
+without grouped annotations.
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+
+import bench_reader
+
+import momapy_bel.io.bel
+
+
+def write(result, **options):
+    stream = io.StringIO()
+    start = time.perf_counter()
+    momapy_bel.io.bel.BELWriter.write(
+        result.obj,
+        stream,
+        result.namespace_definitions,
+        result.annotation_definitions,
+        result.element_to_annotations,
+        **options,
+    )
+    return time.perf_counter() - start, stream.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=200000)
+    parser.add_argument("--terms", type=int, default=20000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "input.bel")
+        with open(file_path, "w") as f:
+            bench_reader.write_bel_file(f, args.statements, args.terms)
+        result = momapy_bel.io.bel.BELReader.read(file_path)
+    for with_grouped_annotations in [False, True]:
+        serial_time, serial_output = write(
+            result, with_grouped_annotations=with_grouped_annotations
+        )
+        parallel_time, parallel_output = write(
+            result,
+            with_grouped_annotations=with_grouped_annotations,
+            processes=args.processes,
+            chunk_size=args.chunk_size,
+        )
+        assert parallel_output == serial_output
+        label = "grouped" if with_grouped_annotations else "per statement"
+        print(
+            f"{label}: serial {serial_time:.2f}s, "
+            f"{args.processes} processes {parallel_time:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare the pickling of BEL models with the default dataclass pickling.
+
+Usage: python benchmarks/bench_pickle.py [--statements N] [--terms T]
+
+The default pickling is that of the statements of the model, elements being
+pickled one by one by the dataclass machinery. Models are those of
+bench_reader.py's synthetic file, where equal terms are the same object,
+and a copy of it where each statement was pickled on its own, so that equal
+terms of different statements are different objects.
+"""
+
+import argparse
+import os
+import pickle
+import tempfile
+import time
+
+import bench_reader
+
+import momapy_bel.core
+import momapy_bel.io.bel
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def default_dumps(bel_model):
+    return pickle.dumps(bel_model.statements, pickle.HIGHEST_PROTOCOL)
+
+
+def default_loads(data):
+    return momapy_bel.core.BELModel(statements=pickle.loads(data))
+
+
+def dumps(bel_model):
+    return pickle.dumps(bel_model, pickle.HIGHEST_PROTOCOL)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=200000)
+    parser.add_argument("--terms", type=int, default=20000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "input.bel")
+        with open(file_path, "w") as f:
+            bench_reader.write_bel_file(f, args.statements, args.terms)
+        bel_model = momapy_bel.io.bel.BELReader.read(file_path).obj
+    copied_bel_model = momapy_bel.core.BELModel(
+        statements=frozenset(
+            pickle.loads(pickle.dumps(statement))
+            for statement in bel_model.statements
+        )
+    )
+    for label, bel_model_ in [
+        ("shared terms", bel_model),
+        ("copied terms", copied_bel_model),
+    ]:
+        for pickling, dumps_, loads_ in [
+            ("default", default_dumps, default_loads),
+            ("flattened", dumps, pickle.loads),
+        ]:
+            dumps_time, data = timed(lambda: dumps_(bel_model_))
+            loads_time, loaded_bel_model = timed(lambda: loads_(data))
+            assert loaded_bel_model.statements == bel_model_.statements
+            print(
+                f"{label}, {pickling}: {len(data) / 1e6:.1f} MB, "
+                f"dumps {dumps_time:.2f}s, loads {loads_time:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
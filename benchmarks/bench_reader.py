@@ -0,0 +1,75 @@
+"""Measure the throughput of BELReader on a large synthetic BEL file.
+
+Usage: python benchmarks/bench_reader.py [--statements N] [--terms T]
+
+The reader is expected to sustain at least TARGET_STATEMENTS_PER_SECOND on
+a single core; the script exits with a non-zero status otherwise.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import momapy_bel.io.bel
+
+TARGET_STATEMENTS_PER_SECOND = 30000
+
+RELATIONS = ["->", "-|", "=>", "=|", "association", "reg", "isA", "pos"]
+
+
+def make_term(rnd, i):
+    kind = i % 6
+    if kind == 0:
+        return f"p(HGNC:GENE{i}, pmod(Ph, S, {i % 500}))"
+    if kind == 1:
+        return f"p(HGNC:GENE{i}, loc(GO:cytoplasm))"
+    if kind == 2:
+        return f"complex(p(HGNC:GENE{i}), p(HGNC:GENE{i + 1}))"
+    if kind == 3:
+        return f"act(p(HGNC:GENE{i}), ma(GO:\"kinase activity\"))"
+    if kind == 4:
+        return (
+            f"tloc(p(HGNC:GENE{i}), fromLoc(GO:cytoplasm), toLoc(GO:nucleus))"
+        )
+    return f"bp(GO:\"process {i}\")"
+
+
+def write_bel_file(f, n_statements, n_terms, seed=0):
+    rnd = random.Random(seed)
+    terms = [make_term(rnd, i) for i in range(n_terms)]
+    f.write('SET DOCUMENT Name = "benchmark"\n')
+    f.write('DEFINE NAMESPACE HGNC AS URL "http://example.org/hgnc.belns"\n')
+    for i in range(n_statements):
+        if i % 10 == 0:
+            f.write(f'SET Citation = {{"PubMed", "{i}"}}\n')
+            f.write(f'SET Evidence = "evidence {i}"\n')
+        f.write(
+            f"{rnd.choice(terms)} {rnd.choice(RELATIONS)} {rnd.choice(terms)}\n"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=200000)
+    parser.add_argument("--terms", type=int, default=20000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "benchmark.bel")
+        with open(file_path, "w") as f:
+            write_bel_file(f, args.statements, args.terms)
+        start = time.perf_counter()
+        result = momapy_bel.io.bel.BELReader.read(file_path)
+        duration = time.perf_counter() - start
+    throughput = args.statements / duration
+    print(f"read {len(result.obj.statements)} distinct statements")
+    print(f"{duration:.2f}s, {throughput:.0f} statements/s")
+    print(f"target: {TARGET_STATEMENTS_PER_SECOND} statements/s")
+    if throughput < TARGET_STATEMENTS_PER_SECOND:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
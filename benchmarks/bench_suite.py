@@ -0,0 +1,228 @@
+"""Run the benchmark suite on synthetic BEL models of increasing sizes.
+
+Usage: python benchmarks/bench_suite.py [--sizes N [N ...]] [--seed S]
+    [--output FILE] [--check]
+
+Models are made by synthetic.py. Each size is measured in its own process,
+so that its peak memory is not that of a larger size. For each size, the
+suite times:
+
+- generate: making the statements and annotations
+- hash: hashing each statement of a second, equal model, the hashes cached
+  on its elements while it was made being cleared first
+- build: building a model from the statements, and from an incremental
+  builder
+- equality: comparing the two equal models
+- is_submodel: checking that half of the model is a submodel of it, by
+  statements and by fingerprints
+- write: writing the model to a BEL file, in statements and bytes per second
+
+The peak resident memory of the process is recorded last. Results are
+printed and written as JSON to the output file, with the commit and
+environment they were measured in, so that runs of different commits can
+be compared. With --check, the file written for the smallest size is read
+back and must give the same statements.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import synthetic
+
+import momapy_bel.algebra
+import momapy_bel.core
+import momapy_bel.io.bel
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def build_incrementally(statements):
+    builder = momapy_bel.core.IncrementalBELModelBuilder.from_object(
+        momapy_bel.core.BELModel()
+    )
+    for statement in statements:
+        builder.add_statement(statement)
+    return builder.build()
+
+
+def clear_hashes(statements):
+    element_ids = set()
+    elements = list(statements)
+    while elements:
+        element = elements.pop()
+        if id(element) not in element_ids:
+            element_ids.add(id(element))
+            # Elements are frozen, hence the cached hash is removed from
+            # their dictionaries rather than deleted as an attribute, and
+            # the class attribute _hash, None, is found again
+            element.__dict__.pop("_hash", None)
+            elements += momapy_bel.core._get_subelements(element)
+
+
+def has_cached_hashes(statements):
+    element_ids = set()
+    elements = list(statements)
+    while elements:
+        element = elements.pop()
+        if id(element) not in element_ids:
+            element_ids.add(id(element))
+            if element._hash is not None:
+                return True
+            elements += momapy_bel.core._get_subelements(element)
+    return False
+
+
+def get_peak_memory():
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak_memory
+    return peak_memory * 1024
+
+
+def measure(n_statements, seed, check=False):
+    results = {"statements": n_statements}
+    generate_time, (statements, annotation_definitions, annotations) = timed(
+        lambda: synthetic.make_statements_and_annotations(n_statements, seed)
+    )
+    results["generate_s"] = generate_time
+    other_statements, _, _ = synthetic.make_statements_and_annotations(
+        n_statements, seed
+    )
+    clear_hashes(other_statements)
+    assert not has_cached_hashes(other_statements)
+    results["hash_s"], _ = timed(
+        lambda: [hash(statement) for statement in other_statements]
+    )
+    results["build_s"], bel_model = timed(
+        lambda: momapy_bel.core.BELModel(statements=frozenset(statements))
+    )
+    results["build_incremental_s"], _ = timed(
+        lambda: build_incrementally(statements)
+    )
+    other_bel_model = momapy_bel.core.BELModel(
+        statements=frozenset(other_statements)
+    )
+    results["equality_s"], is_equal = timed(
+        lambda: bel_model == other_bel_model
+    )
+    assert is_equal
+    bel_submodel = momapy_bel.core.BELModel(
+        statements=frozenset(statements[: n_statements // 2])
+    )
+    results["is_submodel_s"], is_submodel = timed(
+        lambda: bel_submodel.is_submodel(bel_model)
+    )
+    assert is_submodel
+    results["is_submodel_fingerprints_s"], is_submodel = timed(
+        lambda: momapy_bel.algebra.is_submodel(bel_submodel, bel_model)
+    )
+    assert is_submodel
+    del other_statements, other_bel_model, bel_submodel
+    gc.collect()
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "output.bel")
+        write_time, _ = timed(
+            lambda: momapy_bel.io.bel.BELWriter.write(
+                bel_model, file_path, [], annotation_definitions, annotations
+            )
+        )
+        file_size = os.path.getsize(file_path)
+        if check:
+            result = momapy_bel.io.bel.BELReader.read(file_path)
+            assert result.obj.statements == bel_model.statements
+    results["write_s"] = write_time
+    results["write_statements_per_s"] = n_statements / write_time
+    results["write_bytes_per_s"] = file_size / write_time
+    results["file_bytes"] = file_size
+    results["peak_memory_bytes"] = get_peak_memory()
+    return results
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure_in_subprocess(n_statements, seed, check):
+    output = subprocess.run(
+        [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--measure",
+            str(n_statements),
+            "--seed",
+            str(seed),
+        ]
+        + (["--check"] if check else []),
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes", type=lambda size: int(float(size)), nargs="+"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_suite.json")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--measure", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure is not None:
+        json.dump(measure(args.measure, args.seed, args.check), sys.stdout)
+        return
+    sizes = sorted(args.sizes or DEFAULT_SIZES)
+    report = {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "seed": args.seed,
+        "results": [],
+    }
+    for index, n_statements in enumerate(sizes):
+        results = measure_in_subprocess(
+            n_statements, args.seed, args.check and index == 0
+        )
+        report["results"].append(results)
+        print(
+            f"{n_statements} statements: "
+            + ", ".join(
+                f"{name} {value:.3g}"
+                for name, value in results.items()
+                if name != "statements"
+            )
+        )
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
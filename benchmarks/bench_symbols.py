@@ -0,0 +1,103 @@
+"""Measure the rendering of namespace and identifier pairs through the
+symbol table.
+
+Usage: python benchmarks/bench_symbols.py [--statements N]
+
+The synthetic model of synthetic.py is written without a string cache, so
+that every pair of every term is rendered, once with the symbol table and
+once with the rendering used before it, which formatted each pair anew.
+Both must give the same output, as the model has no identifiers with
+quotes. The written file is then read back, and the number of distinct
+string objects among the namespaces and identifiers of its terms is
+counted.
+"""
+
+import argparse
+import io
+import time
+import unittest.mock
+
+import synthetic
+
+import momapy_bel.core
+import momapy_bel.io.bel
+
+
+def make_namespace_identifier_arg(cls, namespace, identifier):
+    if not identifier.isalnum():
+        identifier = f'"{identifier}"'
+    if namespace:
+        return f"{namespace}:{identifier}"
+    else:
+        return identifier
+
+
+def write(bel_model, annotation_definitions, annotations):
+    stream = io.StringIO()
+    start = time.perf_counter()
+    momapy_bel.io.bel.BELWriter.write(
+        bel_model,
+        stream,
+        [],
+        annotation_definitions,
+        annotations,
+        cache_size=0,
+    )
+    return time.perf_counter() - start, stream.getvalue()
+
+
+def count_strings(bel_model):
+    string_ids = set()
+    n_strings = 0
+    elements = list(bel_model.statements)
+    element_ids = set()
+    while elements:
+        element = elements.pop()
+        if id(element) in element_ids:
+            continue
+        element_ids.add(id(element))
+        for field_name in momapy_bel.core._get_element_field_names(
+            type(element)
+        ):
+            if "namespace" in field_name or "identifier" in field_name:
+                value = getattr(element, field_name)
+                if isinstance(value, str):
+                    string_ids.add(id(value))
+                    n_strings += 1
+        elements += momapy_bel.core._get_subelements(element)
+    return n_strings, len(string_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=100000)
+    args = parser.parse_args()
+    bel_model, annotation_definitions, annotations = (
+        synthetic.make_bel_model_and_annotations(args.statements)
+    )
+    with unittest.mock.patch.object(
+        momapy_bel.io.bel.BELWriter,
+        "_make_namespace_identifier_arg",
+        classmethod(make_namespace_identifier_arg),
+    ):
+        formatting_time, formatted_bel_string = write(
+            bel_model, annotation_definitions, annotations
+        )
+    symbol_time, bel_string = write(
+        bel_model, annotation_definitions, annotations
+    )
+    assert bel_string == formatted_bel_string
+    print(
+        f"write without cache: formatting {formatting_time:.2f}s, "
+        f"symbol table {symbol_time:.2f}s"
+    )
+    result = momapy_bel.io.bel.BELReader.read(io.StringIO(bel_string))
+    n_strings, n_distinct_strings = count_strings(result.obj)
+    print(
+        f"read: {n_strings} namespaces and identifiers, "
+        f"{n_distinct_strings} distinct string objects"
+    )
+
+
+if __name__ == "__main__":
+    main()
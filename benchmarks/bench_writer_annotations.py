@@ -0,0 +1,129 @@
+"""Compare the output of BELWriter with and without grouped annotations.
+
+Usage: python benchmarks/bench_writer_annotations.py [--statements N]
+    [--citations N] [--evidences N]
+
+Both outputs are read back with BELReader, and must give the same statements
+with the same annotations.
+"""
+
+import argparse
+import io
+import random
+import time
+
+import momapy_bel.core
+import momapy_bel.io.bel
+
+
+def make_bel_model_and_annotations(n_statements, n_citations, n_evidences):
+    random_ = random.Random(0)
+    citation_definition = momapy_bel.core.BELGenericAnnotationDefinition(
+        name="Citation", as_="https://example.org/citation"
+    )
+    evidence_definition = momapy_bel.core.BELGenericAnnotationDefinition(
+        name="Evidence", as_="https://example.org/evidence"
+    )
+    species_definition = momapy_bel.core.BELGenericAnnotationDefinition(
+        name="Species", as_=("9606", "10090")
+    )
+    terms = [
+        momapy_bel.core.ProteinAbundance(
+            namespace="HGNC", identifier=f"GENE{i}"
+        )
+        for i in range(max(2, n_statements // 4))
+    ]
+    statement_to_annotations = {}
+    for _ in range(n_statements):
+        statement = random_.choice(momapy_bel.core.RELATION_CLSES)(
+            source=random_.choice(terms), target=random_.choice(terms)
+        )
+        citation = random_.randrange(n_citations)
+        annotations = (
+            momapy_bel.core.BELGenericAnnotation(
+                definition=citation_definition,
+                args=("PubMed", str(citation)),
+            ),
+            momapy_bel.core.BELGenericAnnotation(
+                definition=evidence_definition,
+                args=(
+                    f"Evidence {citation}.{random_.randrange(n_evidences)}",
+                ),
+            ),
+            momapy_bel.core.BELGenericAnnotation(
+                definition=species_definition,
+                args=(random_.choice(species_definition.as_),),
+            ),
+        )
+        statement_to_annotations[statement] = annotations
+    bel_model = momapy_bel.core.BELModel(
+        statements=frozenset(statement_to_annotations)
+    )
+    annotation_definitions = [
+        citation_definition,
+        evidence_definition,
+        species_definition,
+    ]
+    return bel_model, annotation_definitions, statement_to_annotations
+
+
+def get_annotated_statements(statements_and_annotations):
+    return {
+        statement: frozenset(
+            (annotation.definition.name, annotation.args)
+            for annotation in annotations
+        )
+        for statement, annotations in statements_and_annotations
+    }
+
+
+def write(bel_model, annotation_definitions, annotations, grouped):
+    stream = io.StringIO()
+    start = time.perf_counter()
+    momapy_bel.io.bel.BELWriter.write(
+        bel_model,
+        stream,
+        [],
+        annotation_definitions,
+        annotations,
+        with_grouped_annotations=grouped,
+    )
+    return time.perf_counter() - start, stream.getvalue()
+
+
+def read(bel_string):
+    start = time.perf_counter()
+    statements_and_annotations = list(
+        momapy_bel.io.bel.BELReader.iter_statements(io.StringIO(bel_string))
+    )
+    return time.perf_counter() - start, statements_and_annotations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=100000)
+    parser.add_argument("--citations", type=int, default=5000)
+    parser.add_argument("--evidences", type=int, default=3)
+    args = parser.parse_args()
+    bel_model, annotation_definitions, annotations = (
+        make_bel_model_and_annotations(
+            args.statements, args.citations, args.evidences
+        )
+    )
+    expected = get_annotated_statements(annotations.items())
+    for grouped in [False, True]:
+        write_time, bel_string = write(
+            bel_model, annotation_definitions, annotations, grouped
+        )
+        read_time, statements_and_annotations = read(bel_string)
+        assert get_annotated_statements(statements_and_annotations) == expected
+        label = "grouped" if grouped else "per statement"
+        print(
+            f"{label}: {len(bel_string.splitlines())} lines, "
+            f"{len(bel_string) / 1e6:.1f} MB, "
+            f"write {write_time:.2f}s, read {read_time:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
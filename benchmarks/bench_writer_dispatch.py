@@ -0,0 +1,116 @@
+"""Compare the renderers of BELWriter with its former dispatches.
+
+Usage: python benchmarks/bench_writer_dispatch.py [--depth D] [--width W]
+    [--statements N] [--repeat N]
+
+Statements are rendered with the getattr dispatch to transformation
+functions, with the table of transformation functions, and with the
+renderers generated for each element class, which must all give the same
+strings.
+"""
+
+import argparse
+import timeit
+
+import momapy_bel.core
+import momapy_bel.io.bel
+
+
+class GetattrDispatchBELWriter(momapy_bel.io.bel.BELWriter):
+    # The dispatch used by BELWriter before renderers were compiled
+    @classmethod
+    def _bel_element_to_string(cls, bel_element):
+        key = type(bel_element)
+        transformation_func_name = cls._get_transformation_func(key)
+        transformation_func = getattr(cls, transformation_func_name)
+        return transformation_func(bel_element)
+
+
+class TransformationFuncBELWriter(momapy_bel.io.bel.BELWriter):
+    # The table of transformation functions used by BELWriter before
+    # renderers were generated for each element class
+    @classmethod
+    def _make_specialized_renderer(cls, transformation_func_name):
+        return None
+
+
+def make_deep_complex(depth, width, prefix="P"):
+    if depth == 0:
+        return momapy_bel.core.ProteinAbundance(
+            namespace="HGNC",
+            identifier=prefix,
+            location=momapy_bel.core.Location(
+                namespace="GO", identifier="cytoplasm"
+            ),
+        )
+    return momapy_bel.core.ComplexAbundance(
+        members=frozenset(
+            make_deep_complex(depth - 1, width, f"{prefix}{i}")
+            for i in range(width)
+        )
+    )
+
+
+def make_deep_reaction(depth, width):
+    return momapy_bel.core.Reaction(
+        reactants=frozenset(
+            make_deep_complex(depth, width, f"R{i}") for i in range(width)
+        ),
+        products=frozenset([make_deep_complex(depth, width, "PROD")]),
+    )
+
+
+def make_statements(depth, width, n_statements):
+    statements = []
+    for i in range(n_statements):
+        statements.append(
+            momapy_bel.core.Increases(
+                source=make_deep_complex(depth, width, f"S{i}"),
+                target=make_deep_reaction(depth, width),
+            )
+        )
+    return statements
+
+
+def time_writer(writer_cls, statements, repeat):
+    def render():
+        for statement in statements:
+            writer_cls._bel_statement_to_string(statement)
+
+    return min(timeit.repeat(render, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--width", type=int, default=3)
+    parser.add_argument("--statements", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    statements = make_statements(args.depth, args.width, args.statements)
+    writer_clses = [
+        ("getattr dispatch", GetattrDispatchBELWriter),
+        ("transformation functions", TransformationFuncBELWriter),
+        ("generated renderers", momapy_bel.io.bel.BELWriter),
+    ]
+    reference = None
+    for _, writer_cls in writer_clses:
+        strings = [
+            writer_cls._bel_statement_to_string(statement)
+            for statement in statements
+        ]
+        if reference is None:
+            reference = strings
+        assert strings == reference
+    reference_time = None
+    for label, writer_cls in writer_clses:
+        writer_time = time_writer(writer_cls, statements, args.repeat)
+        if reference_time is None:
+            reference_time = writer_time
+        print(
+            f"{label}: {writer_time:.4f}s "
+            f"({reference_time / writer_time:.2f}x)"
+        )
+
+if __name__ == "__main__":
+    main()
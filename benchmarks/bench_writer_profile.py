@@ -0,0 +1,69 @@
+"""Profile BELWriter by element type on a synthetic BEL model.
+
+Usage: python benchmarks/bench_writer_profile.py [--statements N]
+    [--handlers N]
+
+The model is made by synthetic.py. It is written without and with a
+profile, which must give the same output, and the handlers that took the
+most self time are printed with the time of each phase.
+"""
+
+import argparse
+import io
+import time
+
+import synthetic
+
+import momapy_bel.io.bel
+
+
+def write(bel_model, annotation_definitions, annotations, profile=None):
+    stream = io.StringIO()
+    start = time.perf_counter()
+    momapy_bel.io.bel.BELWriter.write(
+        bel_model,
+        stream,
+        [],
+        annotation_definitions,
+        annotations,
+        profile=profile,
+    )
+    return time.perf_counter() - start, stream.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", type=int, default=100000)
+    parser.add_argument("--handlers", type=int, default=10)
+    args = parser.parse_args()
+    bel_model, annotation_definitions, annotations = (
+        synthetic.make_bel_model_and_annotations(args.statements)
+    )
+    reports = []
+    profile = momapy_bel.io.bel.BELWriterProfile(hook=reports.append)
+    write_time, bel_string = write(
+        bel_model, annotation_definitions, annotations
+    )
+    profiled_write_time, profiled_bel_string = write(
+        bel_model, annotation_definitions, annotations, profile
+    )
+    assert profiled_bel_string == bel_string
+    report = reports[0]
+    print(
+        f"write {write_time:.2f}s, profiled write {profiled_write_time:.2f}s"
+    )
+    for phase_name, phase_time in report["phases"].items():
+        print(f"{phase_name}: {phase_time:.3f}s")
+    for handler_name, handler_stats in list(report["handlers"].items())[
+        : args.handlers
+    ]:
+        print(
+            f"{handler_name}: {handler_stats['calls']} calls, "
+            f"self {handler_stats['self_time']:.3f}s, "
+            f"cumulative {handler_stats['cumulative_time']:.3f}s, "
+            f"{handler_stats['output_size'] / 1e6:.1f}M characters"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Generate synthetic BEL models for benchmarks.
+
+The same size and seed always give equal models, made of distinct objects
+for each call. Statements relate terms drawn from a pool of about a quarter
+as many terms as statements, capped at MAX_TERMS, as in curated models where
+the same few proteins appear in many statements. Terms are proteins with
+modifications, variants or fusions, genes, RNAs, micro-RNAs, nested
+complexes and composites, activities, reactions, translocations,
+degradations, biological processes and pathologies. Reactions and
+translocations are also statements on their own. Each statement is
+annotated with a citation shared by about ten statements, an evidence and a
+species.
+"""
+
+import random
+
+import momapy_bel.core
+
+MAX_TERMS = 200000
+
+NAMESPACES = ["HGNC", "MGI"]
+
+MODIFICATION_TYPES = ["Ph", "Ac", "Me", "Ub", "Glyco"]
+
+AMINO_ACIDS = ["Ser", "Thr", "Tyr", "Lys"]
+
+LOCATIONS = ["cytoplasm", "nucleus", "plasma membrane", "cell surface"]
+
+ACTIVITIES = ["kin", "tscript", "cat", "gtp"]
+
+SPECIES = ("9606", "10090", "10116")
+
+
+class _Generator:
+    def __init__(self, n_statements, seed):
+        self.random = random.Random(seed)
+        self.n_terms = max(16, min(n_statements // 4, MAX_TERMS))
+        self.locations = [
+            momapy_bel.core.Location(namespace="GO", identifier=location)
+            for location in LOCATIONS
+        ]
+        self.terms = []
+
+    def make_identifier(self):
+        return f"GENE{self.random.randrange(self.n_terms)}"
+
+    def make_location(self):
+        if self.random.random() < 0.2:
+            return self.random.choice(self.locations)
+        return None
+
+    def make_fusion(self):
+        return momapy_bel.core.Fusion(
+            namespace5="HGNC",
+            identifier5=self.make_identifier(),
+            range5=f"r.1_{self.random.randrange(1, 1000)}",
+            namespace3="HGNC",
+            identifier3=self.make_identifier(),
+            range3=f"r.{self.random.randrange(1, 1000)}_2000",
+        )
+
+    def make_protein(self):
+        draw = self.random.random()
+        modifications = ()
+        fusion = None
+        variant = None
+        if draw < 0.3:
+            modifications = tuple(
+                momapy_bel.core.ProteinModification(
+                    namespace="",
+                    identifier=self.random.choice(MODIFICATION_TYPES),
+                    amino_acid=self.random.choice(AMINO_ACIDS),
+                    residue=str(self.random.randrange(1, 1000)),
+                )
+                for _ in range(self.random.randint(1, 3))
+            )
+        elif draw < 0.35:
+            fusion = self.make_fusion()
+        elif draw < 0.4:
+            variant = momapy_bel.core.Variant(
+                descriptor=f"p.Arg{self.random.randrange(1, 1000)}Cys"
+            )
+        # Fusions replace the namespace and identifier of the protein
+        return momapy_bel.core.ProteinAbundance(
+            namespace=(
+                None
+                if fusion is not None
+                else self.random.choice(NAMESPACES)
+            ),
+            identifier=None if fusion is not None else self.make_identifier(),
+            location=self.make_location(),
+            modifications=modifications,
+            fusion=fusion,
+            variant=variant,
+        )
+
+    def make_gene_product(self):
+        cls = self.random.choice(
+            [
+                momapy_bel.core.GeneAbundance,
+                momapy_bel.core.RNAAbundance,
+                momapy_bel.core.MicroRNAAbundance,
+            ]
+        )
+        fusion = self.make_fusion() if self.random.random() < 0.1 else None
+        # Fusions replace the namespace and identifier of the gene product
+        return cls(
+            namespace=None if fusion is not None else "HGNC",
+            identifier=None if fusion is not None else self.make_identifier(),
+            location=self.make_location(),
+            fusion=fusion,
+            variant=None,
+        )
+
+    def make_chemical(self):
+        return momapy_bel.core.Abundance(
+            namespace="CHEBI",
+            identifier=f"chemical {self.random.randrange(self.n_terms)}",
+            location=self.make_location(),
+        )
+
+    def make_abundance(self, depth=0):
+        draw = self.random.random()
+        if draw < 0.5 or depth >= 3:
+            return self.make_protein()
+        if draw < 0.65:
+            return self.make_gene_product()
+        if draw < 0.75:
+            return self.make_chemical()
+        members = frozenset(
+            self.make_abundance(depth + 1)
+            for _ in range(self.random.randint(2, 3))
+        )
+        if draw < 0.95:
+            return momapy_bel.core.ComplexAbundance(members=members)
+        return momapy_bel.core.CompositeAbundance(members=members)
+
+    def make_reaction(self):
+        return momapy_bel.core.Reaction(
+            reactants=frozenset(
+                self.make_chemical() for _ in range(self.random.randint(1, 3))
+            ),
+            products=frozenset(
+                self.make_chemical() for _ in range(self.random.randint(1, 2))
+            ),
+        )
+
+    def make_translocation(self):
+        from_identifier, to_identifier = self.random.sample(LOCATIONS, 2)
+        return momapy_bel.core.Translocation(
+            abundance=self.make_protein(),
+            from_namespace="GO",
+            from_identifier=from_identifier,
+            to_namespace="GO",
+            to_identifier=to_identifier,
+        )
+
+    def make_term(self):
+        draw = self.random.random()
+        if draw < 0.6:
+            return self.make_abundance()
+        if draw < 0.7:
+            return momapy_bel.core.Activity(
+                abundance=self.make_abundance(),
+                molecular_activity=momapy_bel.core.MolecularActivity(
+                    namespace="", identifier=self.random.choice(ACTIVITIES)
+                ),
+            )
+        if draw < 0.75:
+            return self.make_reaction()
+        if draw < 0.8:
+            return self.make_translocation()
+        if draw < 0.83:
+            return momapy_bel.core.Degradation(abundance=self.make_abundance())
+        if draw < 0.95:
+            return momapy_bel.core.BiologicalProcess(
+                namespace="GO",
+                identifier=f"process {self.random.randrange(self.n_terms)}",
+            )
+        return momapy_bel.core.Pathology(
+            namespace="MESH",
+            identifier=f"disease {self.random.randrange(self.n_terms)}",
+        )
+
+    def make_statement(self):
+        # Terms are drawn from the pool once it is full, so that they are
+        # shared between statements
+        draw = self.random.random()
+        if draw < 0.03:
+            return self.make_reaction()
+        if draw < 0.06:
+            return self.make_translocation()
+        terms = []
+        for _ in range(2):
+            if len(self.terms) < self.n_terms:
+                term = self.make_term()
+                self.terms.append(term)
+            else:
+                term = self.random.choice(self.terms)
+            terms.append(term)
+        return self.random.choice(momapy_bel.core.RELATION_CLSES)(
+            source=terms[0], target=terms[1]
+        )
+
+
+def make_statements_and_annotations(n_statements, seed=0):
+    """Return n_statements distinct statements, the annotation definitions
+    and the statement to annotations mapping of a synthetic model"""
+    generator = _Generator(n_statements, seed)
+    citation_definition = momapy_bel.core.BELGenericAnnotationDefinition(
+        name="Citation", as_="https://example.org/citation"
+    )
+    evidence_definition = momapy_bel.core.BELGenericAnnotationDefinition(
+        name="Evidence", as_="https://example.org/evidence"
+    )
+    species_definition = momapy_bel.core.BELGenericAnnotationDefinition(
+        name="Species", as_=SPECIES
+    )
+    species_annotations = [
+        momapy_bel.core.BELGenericAnnotation(
+            definition=species_definition, args=(species,)
+        )
+        for species in SPECIES
+    ]
+    statement_to_annotations = {}
+    citation_annotations = None
+    while len(statement_to_annotations) < n_statements:
+        statement = generator.make_statement()
+        if statement in statement_to_annotations:
+            continue
+        index = len(statement_to_annotations)
+        if index % 10 == 0:
+            citation_annotations = (
+                momapy_bel.core.BELGenericAnnotation(
+                    definition=citation_definition,
+                    args=("PubMed", str(index)),
+                ),
+                momapy_bel.core.BELGenericAnnotation(
+                    definition=evidence_definition,
+                    args=(f"Evidence for statements {index} and more",),
+                ),
+            )
+        statement_to_annotations[statement] = citation_annotations + (
+            generator.random.choice(species_annotations),
+        )
+    annotation_definitions = [
+        citation_definition,
+        evidence_definition,
+        species_definition,
+    ]
+    return (
+        list(statement_to_annotations),
+        annotation_definitions,
+        statement_to_annotations,
+    )
+
+
+def make_bel_model_and_annotations(n_statements, seed=0):
+    """Return a synthetic model of n_statements statements, its annotation
+    definitions and its statement to annotations mapping"""
+    statements, annotation_definitions, statement_to_annotations = (
+        make_statements_and_annotations(n_statements, seed)
+    )
+    bel_model = momapy_bel.core.BELModel(statements=frozenset(statements))
+    return bel_model, annotation_definitions, statement_to_annotations
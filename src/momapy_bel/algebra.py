@@ -0,0 +1,318 @@
+import dataclasses
+import hashlib
+import weakref
+
+import frozendict
+
+import momapy_bel.core
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class BELModelDiff:
+    # Changed statements are pairs of an old and a new statement: relations
+    # with the same source and target but another relation class, or equal
+    # statements whose annotations differ
+    added: frozenset[momapy_bel.core.BELModelElement] = frozenset()
+    removed: frozenset[momapy_bel.core.BELModelElement] = frozenset()
+    changed: tuple[
+        tuple[momapy_bel.core.BELModelElement, momapy_bel.core.BELModelElement],
+        ...,
+    ] = ()
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+def get_fingerprint(element):
+    return _get_fingerprint(element, {})
+
+
+def get_fingerprint_to_statement(bel_model):
+    # Fingerprints are computed once per model, and freed with it
+    return _get_fingerprint_to_statement(bel_model, {})
+
+
+def merge(bel_models, element_to_annotations_list=None):
+    # Returns the union of the models, and the union of their annotation
+    # maps if given, in the same order as the models. The first of equal
+    # statements is kept, and its annotations are those of all of them, in
+    # order of first appearance. Annotations of the models themselves are
+    # mapped to the merged model.
+    bel_models = list(bel_models)
+    memo = {}
+    fingerprint_to_statement_list = [
+        _get_fingerprint_to_statement(bel_model, memo) for bel_model in bel_models
+    ]
+    fingerprint_to_statement = {}
+    for model_fingerprint_to_statement in reversed(
+        fingerprint_to_statement_list
+    ):
+        fingerprint_to_statement.update(model_fingerprint_to_statement)
+    merged_model = momapy_bel.core.BELModel(
+        statements=frozenset(fingerprint_to_statement.values())
+    )
+    _set_fingerprint_to_statement(merged_model, fingerprint_to_statement)
+    if element_to_annotations_list is None:
+        return merged_model, None
+    element_to_annotations_list = list(element_to_annotations_list)
+    if len(element_to_annotations_list) != len(bel_models):
+        raise ValueError(
+            "there must be as many annotation maps as models to merge"
+        )
+    element_to_annotations = {}
+    for bel_model, model_fingerprint_to_statement, model_element_to_annotations in zip(
+        bel_models, fingerprint_to_statement_list, element_to_annotations_list
+    ):
+        if not model_element_to_annotations:
+            continue
+        statement_to_fingerprint = {
+            statement: fingerprint
+            for fingerprint, statement in model_fingerprint_to_statement.items()
+        }
+        for element, annotations in model_element_to_annotations.items():
+            if element is bel_model:
+                merged_element = merged_model
+            else:
+                fingerprint = statement_to_fingerprint.get(element)
+                if fingerprint is None:
+                    continue
+                merged_element = fingerprint_to_statement[fingerprint]
+            merged_annotations = element_to_annotations.setdefault(
+                merged_element, {}
+            )
+            for annotation in annotations:
+                merged_annotations.setdefault(annotation)
+    return merged_model, frozendict.frozendict(
+        {
+            element: tuple(annotations)
+            for element, annotations in element_to_annotations.items()
+        }
+    )
+
+
+def diff(
+    bel_model,
+    other_bel_model,
+    element_to_annotations=None,
+    other_element_to_annotations=None,
+):
+    # Returns the changes from bel_model to other_bel_model. Statements are
+    # compared by fingerprint, so that equal statements of the two models
+    # are never compared deeply. Annotations are compared only if both
+    # annotation maps are given.
+    fingerprint_to_statement = get_fingerprint_to_statement(bel_model)
+    other_fingerprint_to_statement = get_fingerprint_to_statement(
+        other_bel_model
+    )
+    removed_fingerprints = (
+        fingerprint_to_statement.keys() - other_fingerprint_to_statement.keys()
+    )
+    added_fingerprints = (
+        other_fingerprint_to_statement.keys() - fingerprint_to_statement.keys()
+    )
+    removed_statements = {
+        fingerprint_to_statement[fingerprint]
+        for fingerprint in removed_fingerprints
+    }
+    added_statements = {
+        other_fingerprint_to_statement[fingerprint]
+        for fingerprint in added_fingerprints
+    }
+    changed = []
+    # Removed and added relations between the same terms are paired in the
+    # order of their fingerprints, so that the pairing is deterministic
+    memo = {}
+    endpoints_to_removed_statements = {}
+    for fingerprint in sorted(removed_fingerprints):
+        statement = fingerprint_to_statement[fingerprint]
+        endpoints = _get_endpoint_fingerprints(statement, memo)
+        if endpoints is not None:
+            endpoints_to_removed_statements.setdefault(endpoints, []).append(
+                statement
+            )
+    for fingerprint in sorted(added_fingerprints):
+        statement = other_fingerprint_to_statement[fingerprint]
+        endpoints = _get_endpoint_fingerprints(statement, memo)
+        if endpoints is not None:
+            statements = endpoints_to_removed_statements.get(endpoints)
+            if statements:
+                removed_statement = statements.pop(0)
+                removed_statements.remove(removed_statement)
+                added_statements.remove(statement)
+                changed.append((removed_statement, statement))
+    if (
+        element_to_annotations is not None
+        and other_element_to_annotations is not None
+    ):
+        changed += _get_statements_with_changed_annotations(
+            fingerprint_to_statement,
+            other_fingerprint_to_statement,
+            element_to_annotations,
+            other_element_to_annotations,
+        )
+    return BELModelDiff(
+        added=frozenset(added_statements),
+        removed=frozenset(removed_statements),
+        changed=tuple(changed),
+    )
+
+
+def is_submodel(bel_model, other_bel_model):
+    return (
+        get_fingerprint_to_statement(bel_model).keys()
+        <= get_fingerprint_to_statement(other_bel_model).keys()
+    )
+
+
+def contains_statements(bel_model, statements):
+    fingerprint_to_statement = get_fingerprint_to_statement(bel_model)
+    memo = {}
+    return all(
+        _get_fingerprint(statement, memo) in fingerprint_to_statement
+        for statement in statements
+    )
+
+
+# Models are mapped by id, so that the fingerprints of a model are never
+# looked up by comparing it deeply with an equal model
+_bel_model_id_to_fingerprint_to_statement = {}
+
+
+def _get_fingerprint_to_statement(bel_model, memo):
+    fingerprint_to_statement = _bel_model_id_to_fingerprint_to_statement.get(
+        id(bel_model)
+    )
+    if fingerprint_to_statement is None:
+        fingerprint_to_statement = _make_fingerprint_to_statement(
+            bel_model, memo
+        )
+    return fingerprint_to_statement
+
+
+def _make_fingerprint_to_statement(bel_model, memo):
+    fingerprint_to_statement = {
+        _get_fingerprint(statement, memo): statement
+        for statement in bel_model.statements
+    }
+    _set_fingerprint_to_statement(bel_model, fingerprint_to_statement)
+    return fingerprint_to_statement
+
+
+def _set_fingerprint_to_statement(bel_model, fingerprint_to_statement):
+    _bel_model_id_to_fingerprint_to_statement[id(bel_model)] = (
+        fingerprint_to_statement
+    )
+    weakref.finalize(
+        bel_model,
+        _bel_model_id_to_fingerprint_to_statement.pop,
+        id(bel_model),
+        None,
+    )
+
+
+def _get_fingerprint(element, memo):
+    # The fingerprint of an element is a digest of its class and of the
+    # encoding of its fields but id_, those of its subelements included.
+    # Fingerprints do not depend on the process, unlike hashes of strings.
+    # The memo maps ids of elements to their fingerprints: elements must
+    # outlive it.
+    return _FingerprintMapper(memo).get_fingerprint(element)
+
+
+class _FingerprintMapper(momapy_bel.core._ValueMapper):
+    # Values are mapped to their encodings, prefixed by a type tag, and
+    # strings and collections by their length, so that different values
+    # have different encodings. Members of frozensets are encoded in sorted
+    # order.
+    _none_value = b"n"
+
+    def __init__(self, memo):
+        self._memo = memo
+
+    def get_fingerprint(self, element):
+        fingerprint = self._memo.get(id(element))
+        if fingerprint is None:
+            element_cls = type(element)
+            parts = [
+                f"{element_cls.__module__}.{element_cls.__qualname__}".encode()
+            ]
+            for field_name in momapy_bel.core._get_element_field_names(
+                element_cls
+            ):
+                parts.append(self._map_value(getattr(element, field_name)))
+            fingerprint = hashlib.blake2b(
+                b"\x00".join(parts), digest_size=16
+            ).digest()
+            self._memo[id(element)] = fingerprint
+        return fingerprint
+
+    def _map_string(self, string):
+        encoded_string = string.encode()
+        return b"s%d:%s" % (len(encoded_string), encoded_string)
+
+    def _map_element(self, element):
+        return b"e" + self.get_fingerprint(element)
+
+    def _map_tuple(self, members):
+        return _encode_values(b"t", members)
+
+    def _map_frozenset(self, members):
+        members.sort()
+        return _encode_values(b"f", members)
+
+    def _map_other(self, value):
+        encoded_value = repr(value).encode()
+        return b"r%d:%s" % (len(encoded_value), encoded_value)
+
+
+def _encode_values(tag, encoded_values):
+    return b"%s%d:%s" % (
+        tag,
+        len(encoded_values),
+        b"".join(
+            b"%d:%s" % (len(encoded_value), encoded_value)
+            for encoded_value in encoded_values
+        ),
+    )
+
+
+def _get_endpoint_fingerprints(statement, memo):
+    if type(statement) not in momapy_bel.core._RELATION_CLS_SET:
+        return None
+    return (
+        _get_fingerprint(statement.source, memo),
+        _get_fingerprint(statement.target, memo),
+    )
+
+
+def _get_statements_with_changed_annotations(
+    fingerprint_to_statement,
+    other_fingerprint_to_statement,
+    element_to_annotations,
+    other_element_to_annotations,
+):
+    # Only statements annotated in one of the maps may have changed
+    changed = []
+    fingerprints = set()
+    for element_to_annotations_, fingerprint_to_statement_ in [
+        (element_to_annotations, fingerprint_to_statement),
+        (other_element_to_annotations, other_fingerprint_to_statement),
+    ]:
+        statement_to_fingerprint = {
+            statement: fingerprint
+            for fingerprint, statement in fingerprint_to_statement_.items()
+        }
+        for element in element_to_annotations_:
+            fingerprint = statement_to_fingerprint.get(element)
+            if fingerprint is not None:
+                fingerprints.add(fingerprint)
+    for fingerprint in sorted(fingerprints):
+        statement = fingerprint_to_statement.get(fingerprint)
+        other_statement = other_fingerprint_to_statement.get(fingerprint)
+        if statement is None or other_statement is None:
+            continue
+        annotations = element_to_annotations.get(statement, ())
+        other_annotations = other_element_to_annotations.get(other_statement, ())
+        if set(annotations) != set(other_annotations):
+            changed.append((statement, other_statement))
+    return changed
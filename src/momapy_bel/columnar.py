@@ -0,0 +1,190 @@
+import collections
+import dataclasses
+import functools
+
+import numpy
+
+import momapy_bel.core
+
+# Relation codes are positions in this tuple: new relation classes must be
+# appended to it so that codes of existing arrays remain valid
+RELATION_CLSES = momapy_bel.core.RELATION_CLSES
+_RELATION_CLS_TO_CODE = {
+    relation_cls: code for code, relation_cls in enumerate(RELATION_CLSES)
+}
+
+
+def get_relation_code(relation_cls):
+    relation_code = _RELATION_CLS_TO_CODE.get(relation_cls)
+    if relation_code is None:
+        raise TypeError(f"{relation_cls.__name__} is not a relation")
+    return relation_code
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, eq=False)
+class ColumnarBELModel:
+    # Relation statements are stored as rows of three parallel arrays, sorted
+    # by source, relation and target. Their sources and targets are indices
+    # in the term table, which also holds nested statements. Statements that
+    # are terms on their own are stored as indices in term_statements. Equal
+    # terms share the same entry of the term table.
+    terms: tuple[momapy_bel.core.BELModelElement, ...] = ()
+    sources: numpy.ndarray = dataclasses.field(
+        default_factory=lambda: numpy.empty(0, dtype=numpy.intp)
+    )
+    relations: numpy.ndarray = dataclasses.field(
+        default_factory=lambda: numpy.empty(0, dtype=numpy.uint8)
+    )
+    targets: numpy.ndarray = dataclasses.field(
+        default_factory=lambda: numpy.empty(0, dtype=numpy.intp)
+    )
+    term_statements: numpy.ndarray = dataclasses.field(
+        default_factory=lambda: numpy.empty(0, dtype=numpy.intp)
+    )
+
+    def __len__(self):
+        return len(self.relations)
+
+    @functools.cached_property
+    def term_to_id(self):
+        return {term: term_id for term_id, term in enumerate(self.terms)}
+
+    @classmethod
+    def from_bel_model(cls, bel_model):
+        term_to_id = {}
+        sources = []
+        relations = []
+        targets = []
+        term_statements = []
+        for statement in bel_model.statements:
+            relation_code = _RELATION_CLS_TO_CODE.get(type(statement))
+            if relation_code is None:
+                term_statements.append(
+                    term_to_id.setdefault(statement, len(term_to_id))
+                )
+            else:
+                sources.append(
+                    term_to_id.setdefault(statement.source, len(term_to_id))
+                )
+                relations.append(relation_code)
+                targets.append(
+                    term_to_id.setdefault(statement.target, len(term_to_id))
+                )
+        sources = numpy.array(sources, dtype=numpy.intp)
+        relations = numpy.array(relations, dtype=numpy.uint8)
+        targets = numpy.array(targets, dtype=numpy.intp)
+        order = numpy.lexsort((targets, relations, sources))
+        columnar_model = cls(
+            terms=tuple(term_to_id),
+            sources=sources[order],
+            relations=relations[order],
+            targets=targets[order],
+            term_statements=numpy.sort(
+                numpy.array(term_statements, dtype=numpy.intp)
+            ),
+        )
+        columnar_model.__dict__["term_to_id"] = term_to_id
+        return columnar_model
+
+    def to_bel_model(self):
+        terms = self.terms
+        statements = [
+            RELATION_CLSES[relation_code](
+                source=terms[source_id], target=terms[target_id]
+            )
+            for source_id, relation_code, target_id in zip(
+                self.sources.tolist(),
+                self.relations.tolist(),
+                self.targets.tolist(),
+            )
+        ]
+        statements += [terms[term_id] for term_id in self.term_statements.tolist()]
+        return momapy_bel.core.BELModel(statements=frozenset(statements))
+
+    def get_term_id(self, term):
+        return self.term_to_id[term]
+
+    def get_term_ids(self, terms):
+        # Terms that are not in the term table are ignored
+        term_to_id = self.term_to_id
+        return numpy.array(
+            [term_to_id[term] for term in terms if term in term_to_id],
+            dtype=numpy.intp,
+        )
+
+    def mask(self, relation_clses=None, sources=None, targets=None):
+        mask = numpy.ones(len(self), dtype=bool)
+        if relation_clses is not None:
+            relation_codes = [
+                get_relation_code(relation_cls) for relation_cls in relation_clses
+            ]
+            mask &= numpy.isin(self.relations, relation_codes)
+        if sources is not None:
+            mask &= numpy.isin(self.sources, self.get_term_ids(sources))
+        if targets is not None:
+            mask &= numpy.isin(self.targets, self.get_term_ids(targets))
+        return mask
+
+    def take(self, indices):
+        # The term table is shared with the result, which holds relation
+        # statements only
+        indices = numpy.sort(numpy.asarray(indices, dtype=numpy.intp))
+        columnar_model = dataclasses.replace(
+            self,
+            sources=self.sources[indices],
+            relations=self.relations[indices],
+            targets=self.targets[indices],
+            term_statements=numpy.empty(0, dtype=numpy.intp),
+        )
+        if "term_to_id" in self.__dict__:
+            columnar_model.__dict__["term_to_id"] = self.term_to_id
+        return columnar_model
+
+    def select(self, relation_clses=None, sources=None, targets=None):
+        return self.take(
+            numpy.flatnonzero(
+                self.mask(
+                    relation_clses=relation_clses,
+                    sources=sources,
+                    targets=targets,
+                )
+            )
+        )
+
+    def count_relations(self):
+        counts = numpy.bincount(self.relations, minlength=len(RELATION_CLSES))
+        return collections.Counter(
+            {
+                RELATION_CLSES[relation_code]: count
+                for relation_code, count in enumerate(counts.tolist())
+                if count
+            }
+        )
+
+    def get_out_degrees(self):
+        return numpy.bincount(self.sources, minlength=len(self.terms))
+
+    def get_in_degrees(self):
+        return numpy.bincount(self.targets, minlength=len(self.terms))
+
+    def join(self, other=None):
+        # Returns the indices of all pairs of rows of self and other such
+        # that the target of the first is the source of the second
+        if other is None:
+            other = self
+        elif other.terms is not self.terms:
+            raise ValueError("columnar models must share their term table")
+        order = numpy.argsort(other.sources, kind="stable")
+        sorted_sources = other.sources[order]
+        starts = numpy.searchsorted(sorted_sources, self.targets, side="left")
+        stops = numpy.searchsorted(sorted_sources, self.targets, side="right")
+        counts = stops - starts
+        left_indices = numpy.repeat(numpy.arange(len(self)), counts)
+        right_indices = order[_concatenate_ranges(starts, counts)]
+        return left_indices, right_indices
+
+
+def _concatenate_ranges(starts, counts):
+    # Returns the concatenation of the ranges [start, start + count[
+    offsets = numpy.repeat(starts - numpy.cumsum(counts) + counts, counts)
+    return numpy.arange(counts.sum()) + offsets
@@ -1,12 +1,66 @@
+import collections
 import dataclasses
+import sys
+import weakref
 
 import momapy.core
-import momapy.builder
 
 
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class BELModelElement(momapy.core.ModelElement):
-    pass
+    # The hash of an element is computed once, from the hashes of its
+    # subelements which are themselves cached, and stored on the element.
+    # dataclass() adds its own __hash__ to each class it decorates unless
+    # the class defines one, hence a placeholder is set on each subclass
+    # when it is created. On first use, it is replaced by a function
+    # specialized for the fields of the class. The id_ field is not part of
+    # the hash, as for the generated __hash__. The hash is stored next to
+    # the fields of the element, and read through a class attribute that
+    # defaults to None, so that a miss is a plain attribute lookup rather
+    # than a caught AttributeError. Elements are not slotted: the classes of
+    # momapy.core they derive from have a __dict__, which slotted subclasses
+    # would keep, and on Python 3.11 slots then add about 8 bytes per
+    # instance rather than saving any, see benchmarks/bench_memory.py.
+    _hash = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "__hash__" not in cls.__dict__:
+            cls.__hash__ = BELModelElement.__hash__
+
+    def __hash__(self):
+        element_cls = type(self)
+        element_cls.__hash__ = _make_hash_func(element_cls)
+        return element_cls.__hash__(self)
+
+    def __getstate__(self):
+        # The cached hash is not pickled, as hashes of strings differ from
+        # one interpreter to the other. The state is made from the fields,
+        # as reading __dict__ would allocate it.
+        state = {"id_": self.id_}
+        for field_name in _get_element_field_names(type(self)):
+            state[field_name] = getattr(self, field_name)
+        return state
+
+
+def _make_hash_func(element_cls):
+    field_names = [
+        field_.name
+        for field_ in dataclasses.fields(element_cls)
+        if (field_.compare if field_.hash is None else field_.hash)
+    ]
+    values = "".join([f"self.{field_name}, " for field_name in field_names])
+    source = (
+        "def __hash__(self):\n"
+        "    value = self._hash\n"
+        "    if value is None:\n"
+        f"        value = hash(({values}))\n"
+        "        set_attribute(self, '_hash', value)\n"
+        "    return value\n"
+    )
+    namespace = {"set_attribute": object.__setattr__}
+    exec(source, namespace)
+    return namespace["__hash__"]
 
 
 @dataclasses.dataclass(frozen=True, kw_only=True)
@@ -312,30 +366,57 @@ class TranslatedTo(BELModelElement):
     target: BELModelElement
 
 
-@dataclasses.dataclass(frozen=True, kw_only=True)
+RELATION_CLSES = (
+    Analogous,
+    Association,
+    BiomarkerFor,
+    CausesNoChange,
+    Decreases,
+    DirectlyDecreases,
+    DirectlyIncreases,
+    HasActivity,
+    HasComponent,
+    HasComponents,
+    HasMember,
+    HasMembers,
+    Increases,
+    IsA,
+    NegativeCorrelation,
+    Ortholgous,
+    PositiveCorrelation,
+    PrognosticBiomarkerFor,
+    RateLimitingStepFor,
+    Regulates,
+    SubProcessOf,
+    TranscribedTo,
+    TranslatedTo,
+)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
 class BELNamespaceDefinition:
     name: str
     as_: str | tuple[str]
 
 
-@dataclasses.dataclass(frozen=True, kw_only=True)
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
 class BELGenericAnnotationDefinition:
     name: str
     as_: str | tuple[str]
 
 
-@dataclasses.dataclass(frozen=True, kw_only=True)
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
 class BELAnnotation:
     pass
 
 
-@dataclasses.dataclass(frozen=True, kw_only=True)
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
 class BELGenericAnnotation(BELAnnotation):
     definition: BELGenericAnnotationDefinition | None = None
     args: tuple[str]
 
 
-@dataclasses.dataclass(frozen=True, kw_only=True)
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
 class BELDocumentAnnotation(BELAnnotation):
     name: str | None = None
     authors: str | None = None
@@ -346,6 +427,25 @@ class BELDocumentAnnotation(BELAnnotation):
     version: str | None = None
 
 
+class _ModelIndexProperty:
+    # The index of a model is cached on it on first access, as with
+    # functools.cached_property. momapy.builder copies the property to the
+    # builder class of BELModel, whose statements change: the index of a
+    # builder is made anew on each access, from its current statements.
+    # These may be builders themselves, which are built first, so that they
+    # are indexed by the classes and fields of the elements they build.
+    def __get__(self, obj, obj_cls=None):
+        if obj is None:
+            return self
+        if isinstance(obj, BELModel):
+            index = BELModelIndex(obj.statements)
+            obj.__dict__["index"] = index
+            return index
+        import momapy.builder
+
+        return BELModelIndex(momapy.builder.object_from_builder(obj.statements))
+
+
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class BELModel(momapy.core.Model):
     statements: frozenset[BELModelElement] = dataclasses.field(
@@ -355,8 +455,761 @@ class BELModel(momapy.core.Model):
     def is_submodel(self, other):
         return self.statements.issubset(other.statements)
 
+    index = _ModelIndexProperty()
+
+    def __copy__(self):
+        # Models are immutable, and a copy would rebuild all statements
+        # through __reduce__
+        return self
+
+    def __reduce__(self):
+        # Statements are pickled flattened, see _flatten_elements. The index
+        # is rebuilt on demand rather than pickled.
+        field_name_to_value = {
+            field_.name: getattr(self, field_.name)
+            for field_ in dataclasses.fields(self)
+            if field_.name != "statements"
+        }
+        return (
+            _make_bel_model,
+            (
+                type(self),
+                field_name_to_value,
+                *_flatten_elements(self.statements),
+            ),
+        )
+
+
+# The builder classes of BEL models are made on first access, see
+# __getattr__, since most programs read or write models without editing them
+def _make_bel_model_builder_cls():
+    import momapy.builder
+
+    return momapy.builder.get_or_make_builder_cls(BELModel)
+
+
+def _make_incremental_bel_model_builder_cls():
+    bel_model_builder_cls = _get_lazy_attribute("BELModelBuilder")
+
+    class IncrementalBELModelBuilder(bel_model_builder_cls):
+        # Statements are kept as they are, rather than converted to builders and
+        # rebuilt. They must be added and removed with add_statement() and
+        # remove_statement(), which record them. The index of a built model is
+        # made of the index of a previous model, which is shared, and of the
+        # statements recorded since. Once enough statements are recorded, the
+        # built model gets an index of its own, which becomes the base of the
+        # next ones. The last built model is reused until the builder changes.
+        _base_index = None
+        _added_statements = None
+        _removed_statements = None
+        _bel_model = None
+
+        @classmethod
+        def from_object(cls, obj, object_to_builder=None):
+            builder = cls(id_=obj.id_, statements=set(obj.statements))
+            builder._bel_model = obj
+            index = obj.index
+            if index._base_index is None:
+                builder._base_index = index
+                builder._added_statements = {}
+                builder._removed_statements = {}
+            else:
+                builder._base_index = index._base_index
+                builder._added_statements = dict.fromkeys(
+                    index._added_index._statements
+                )
+                builder._removed_statements = dict(index._removed_statements)
+            return builder
+
+        def _init_recorded_statements(self):
+            if self._base_index is None:
+                self._base_index = BELModelIndex(frozenset(self.statements))
+                self._added_statements = {}
+                self._removed_statements = {}
+
+        @property
+        def index(self):
+            self._init_recorded_statements()
+            return BELModelIndex._from_base_index(
+                self.statements,
+                self._base_index,
+                self._added_statements.copy(),
+                self._removed_statements.copy(),
+            )
+
+        def add_statement(self, statement):
+            self._init_recorded_statements()
+            if statement not in self.statements:
+                self.statements.add(statement)
+                if statement in self._removed_statements:
+                    del self._removed_statements[statement]
+                else:
+                    self._added_statements[statement] = None
+                self._bel_model = None
+
+        def remove_statement(self, statement):
+            self._init_recorded_statements()
+            self.statements.remove(statement)
+            if statement in self._added_statements:
+                del self._added_statements[statement]
+            else:
+                self._removed_statements[statement] = None
+            self._bel_model = None
+
+        def build(self, builder_to_object=None):
+            bel_model = self._bel_model
+            if bel_model is None or bel_model.id_ != self.id_:
+                self._init_recorded_statements()
+                # Hashes of statements are copied from the set of the builder
+                statements = frozenset(self.statements)
+                bel_model = BELModel(id_=self.id_, statements=statements)
+                n_recorded_statements = len(self._added_statements) + len(
+                    self._removed_statements
+                )
+                if n_recorded_statements > len(statements) // 8:
+                    self._base_index = bel_model.index
+                    self._added_statements = {}
+                    self._removed_statements = {}
+                else:
+                    bel_model.__dict__["index"] = BELModelIndex._from_base_index(
+                        statements,
+                        self._base_index,
+                        self._added_statements.copy(),
+                        self._removed_statements.copy(),
+                    )
+                self._bel_model = bel_model
+            return bel_model
+    IncrementalBELModelBuilder.__qualname__ = "IncrementalBELModelBuilder"
+    return IncrementalBELModelBuilder
+
+
+_LAZY_ATTRIBUTE_NAME_TO_MAKE_FUNC = {
+    "BELModelBuilder": _make_bel_model_builder_cls,
+    "IncrementalBELModelBuilder": _make_incremental_bel_model_builder_cls,
+}
+
+
+def _get_lazy_attribute(name):
+    value = globals().get(name)
+    if value is None:
+        value = _LAZY_ATTRIBUTE_NAME_TO_MAKE_FUNC[name]()
+        globals()[name] = value
+    return value
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTE_NAME_TO_MAKE_FUNC:
+        return _get_lazy_attribute(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTE_NAME_TO_MAKE_FUNC))
+
+
+class BELModelIndex:
+    # Each index maps keys to the statements they index, stored as the keys
+    # of a dict. An index is built on its first query, in one pass over the
+    # statements. Queries answer in time proportional to the number of
+    # statements they return. An index may also be made of a base index,
+    # which is shared and never modified, together with the statements that
+    # were added to and removed from it: see IncrementalBELModelBuilder.
+    def __init__(self, statements):
+        self._statements = statements
+        self._index_name_to_key_to_statements = {}
+        self._base_index = None
+        self._added_index = None
+        self._removed_statements = None
+
+    @classmethod
+    def _from_base_index(
+        cls, statements, base_index, added_statements, removed_statements
+    ):
+        index = cls(statements)
+        index._base_index = base_index
+        index._added_index = cls(added_statements)
+        index._removed_statements = removed_statements
+        return index
+
+    def _get_key_to_statements(self, index_name):
+        key_to_statements = self._index_name_to_key_to_statements.get(index_name)
+        if key_to_statements is None:
+            get_statement_keys = _INDEX_NAME_TO_GET_STATEMENT_KEYS[index_name]
+            key_to_statements = {}
+            # Keys of subelements are memoized, as subelements are often
+            # shared between statements
+            memo = {}
+            for statement in self._statements:
+                for key in get_statement_keys(statement, memo):
+                    key_statements = key_to_statements.get(key)
+                    if key_statements is None:
+                        key_to_statements[key] = {statement: None}
+                    else:
+                        key_statements[statement] = None
+            self._index_name_to_key_to_statements[index_name] = key_to_statements
+        return key_to_statements
+
+    def _get_keys(self, index_name):
+        if self._base_index is None:
+            return list(self._get_key_to_statements(index_name))
+        keys = self._base_index._get_keys(index_name)
+        keys += self._added_index._get_keys(index_name)
+        return list(dict.fromkeys(keys))
+
+    def _get_statements(self, index_name, key):
+        if self._base_index is None:
+            return list(self._get_key_to_statements(index_name).get(key, {}))
+        removed_statements = self._removed_statements
+        statements = [
+            statement
+            for statement in self._base_index._get_statements(index_name, key)
+            if statement not in removed_statements
+        ]
+        statements += self._added_index._get_statements(index_name, key)
+        return statements
+
+    def get_statements_by_class(self, statement_cls, with_subclasses=True):
+        if with_subclasses:
+            statement_clses = [
+                cls_
+                for cls_ in self._get_keys("class")
+                if issubclass(cls_, statement_cls)
+            ]
+        else:
+            statement_clses = [statement_cls]
+        statements = []
+        for statement_cls in statement_clses:
+            statements += self._get_statements("class", statement_cls)
+        return tuple(statements)
+
+    def get_statements_by_source(self, source):
+        return tuple(self._get_statements("source", source))
+
+    def get_statements_by_target(self, target):
+        return tuple(self._get_statements("target", target))
+
+    def get_statements_by_namespace_identifier(self, namespace, identifier):
+        return tuple(
+            self._get_statements("namespace_identifier", (namespace, identifier))
+        )
+
+    def get_statements_by_location(self, location):
+        return tuple(self._get_statements("location", location))
+
+
+_CLS_TO_ELEMENT_FIELD_NAMES = {}
+
+
+def _get_element_field_names(element_cls):
+    field_names = _CLS_TO_ELEMENT_FIELD_NAMES.get(element_cls)
+    if field_names is None:
+        field_names = tuple(
+            field_.name
+            for field_ in dataclasses.fields(element_cls)
+            if field_.name != "id_"
+        )
+        _CLS_TO_ELEMENT_FIELD_NAMES[element_cls] = field_names
+    return field_names
+
+
+class _ValueMapper:
+    # Maps the values of fields of elements: None, strings, elements, and
+    # tuples and frozensets of values, each by the method of its kind, and
+    # other values by _map_other. Tuples and frozensets are mapped from the
+    # lists of their mapped members. Values are mapped to themselves unless
+    # the methods are overridden.
+    _none_value = None
+
+    def _map_value(self, value):
+        if value is None:
+            return self._none_value
+        if isinstance(value, str):
+            return self._map_string(value)
+        if isinstance(value, BELModelElement):
+            return self._map_element(value)
+        if isinstance(value, tuple):
+            return self._map_tuple(
+                [self._map_value(member) for member in value]
+            )
+        if isinstance(value, frozenset):
+            return self._map_frozenset(
+                [self._map_value(member) for member in value]
+            )
+        return self._map_other(value)
+
+    def _map_string(self, string):
+        return string
+
+    def _map_element(self, element):
+        return element
+
+    def _map_tuple(self, members):
+        return tuple(members)
+
+    def _map_frozenset(self, members):
+        return frozenset(members)
+
+    def _map_other(self, value):
+        return value
+
+
+def get_sort_key(element, memo=None):
+    # Sort keys order elements by class name, then by the values of their
+    # fields in order, members of frozensets being sorted, so that the
+    # order of elements does not depend on hashes, which differ from one
+    # interpreter to the other. The memo maps ids of elements to their
+    # keys: elements must outlive it.
+    if memo is None:
+        memo = {}
+    return _SortKeyMapper(memo)._map_element(element)[1]
+
+
+class _SortKeyMapper(_ValueMapper):
+    # Values are tagged with their type, so that keys of values of
+    # different types compare
+    _none_value = (0,)
+
+    def __init__(self, memo):
+        self._memo = memo
+
+    def _map_string(self, string):
+        return (1, string)
+
+    def _map_element(self, element):
+        sort_key = self._memo.get(id(element))
+        if sort_key is None:
+            element_cls = type(element)
+            sort_key = (element_cls.__name__,) + tuple(
+                [
+                    self._map_value(getattr(element, field_name))
+                    for field_name in _get_element_field_names(element_cls)
+                ]
+            )
+            self._memo[id(element)] = sort_key
+        return (2, sort_key)
+
+    def _map_tuple(self, members):
+        return (3, tuple(members))
+
+    def _map_frozenset(self, members):
+        members.sort()
+        return (4, tuple(members))
+
+    def _map_other(self, value):
+        return (5, repr(value))
+
+
+def _get_subelements(element):
+    subelements = []
+    for field_name in _get_element_field_names(type(element)):
+        value = getattr(element, field_name)
+        if isinstance(value, BELModelElement):
+            subelements.append(value)
+        elif isinstance(value, (frozenset, tuple)):
+            subelements += [
+                subvalue
+                for subvalue in value
+                if isinstance(subvalue, BELModelElement)
+            ]
+    return subelements
+
+
+def _get_subelement_keys(element, get_keys, memo):
+    # Returns the keys of the element and of its subelements
+    keys = memo.get(element)
+    if keys is None:
+        keys = set(get_keys(element))
+        for subelement in _get_subelements(element):
+            keys.update(_get_subelement_keys(subelement, get_keys, memo))
+        keys = tuple(keys)
+        memo[element] = keys
+    return keys
+
+
+def _get_namespace_identifiers(element):
+    if type(element) is Fusion:
+        return [
+            (element.namespace5, element.identifier5),
+            (element.namespace3, element.identifier3),
+        ]
+    identifier = getattr(element, "identifier", None)
+    if identifier is None:
+        return []
+    return [(element.namespace, identifier)]
+
+
+def _get_locations(element):
+    if type(element) is Location:
+        return [element]
+    return []
+
+
+def _get_statement_subelement_keys(statement, get_keys, memo):
+    keys = get_keys(statement)
+    for subelement in _get_subelements(statement):
+        keys += _get_subelement_keys(subelement, get_keys, memo)
+    return keys
+
+
+def _get_statement_cls(statement, memo):
+    return [type(statement)]
+
+
+def _get_statement_source(statement, memo):
+    if type(statement) in _RELATION_CLS_SET:
+        return [statement.source]
+    return []
+
+
+def _get_statement_target(statement, memo):
+    if type(statement) in _RELATION_CLS_SET:
+        return [statement.target]
+    return []
+
+
+def _get_statement_namespace_identifiers(statement, memo):
+    # A statement may contain the same key several times
+    return _get_statement_subelement_keys(
+        statement, _get_namespace_identifiers, memo
+    )
+
+
+def _get_statement_locations(statement, memo):
+    return _get_statement_subelement_keys(statement, _get_locations, memo)
+
+
+_RELATION_CLS_SET = frozenset(RELATION_CLSES)
+_INDEX_NAME_TO_GET_STATEMENT_KEYS = {
+    "class": _get_statement_cls,
+    "source": _get_statement_source,
+    "target": _get_statement_target,
+    "namespace_identifier": _get_statement_namespace_identifiers,
+    "location": _get_statement_locations,
+}
+
+
+class BELElementInterner(_ValueMapper):
+    # Canonical elements are keyed on their class and the values of their
+    # compared fields, with their subelements already canonical, so that
+    # keys compare by identity in the common case. Values are weakly
+    # referenced: a canonical element that is not used anymore is freed and
+    # its entry removed.
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.saved_bytes = 0
+        self._key_to_element = weakref.WeakValueDictionary()
+        self._cls_to_field_names = {}
+
+    def __len__(self):
+        return len(self._key_to_element)
+
+    def intern(self, element):
+        if not isinstance(element, BELModelElement):
+            return element
+        field_names = self._get_field_names(type(element))
+        values = tuple(
+            self._map_value(getattr(element, field_name))
+            for field_name in field_names
+        )
+        key = (type(element), values)
+        canonical_element = self._key_to_element.get(key)
+        if canonical_element is not None:
+            self.hits += 1
+            if canonical_element is not element:
+                self.saved_bytes += _get_element_size(element)
+            return canonical_element
+        self.misses += 1
+        if any(
+            value is not getattr(element, field_name)
+            for field_name, value in zip(field_names, values)
+        ):
+            element = dataclasses.replace(
+                element, **dict(zip(field_names, values))
+            )
+        self._key_to_element[key] = element
+        return element
+
+    def make(self, element_cls, **kwargs):
+        field_names = self._get_field_names(element_cls)
+        for field_ in dataclasses.fields(element_cls):
+            if field_.name in field_names and field_.name not in kwargs:
+                if field_.default is not dataclasses.MISSING:
+                    kwargs[field_.name] = field_.default
+                elif field_.default_factory is not dataclasses.MISSING:
+                    kwargs[field_.name] = field_.default_factory()
+        values = tuple(
+            self._map_value(kwargs[field_name]) for field_name in field_names
+        )
+        key = (element_cls, values)
+        canonical_element = self._key_to_element.get(key)
+        if canonical_element is not None:
+            self.hits += 1
+            self.saved_bytes += _get_element_size(canonical_element)
+            return canonical_element
+        self.misses += 1
+        kwargs.update(zip(field_names, values))
+        element = element_cls(**kwargs)
+        self._key_to_element[key] = element
+        return element
+
+    def intern_model(self, bel_model):
+        return dataclasses.replace(
+            bel_model,
+            statements=frozenset(
+                self.intern(statement) for statement in bel_model.statements
+            ),
+        )
+
+    def clear(self):
+        self._key_to_element.clear()
+        self.hits = 0
+        self.misses = 0
+        self.saved_bytes = 0
+
+    def _get_field_names(self, element_cls):
+        field_names = self._cls_to_field_names.get(element_cls)
+        if field_names is None:
+            field_names = tuple(
+                field_.name
+                for field_ in dataclasses.fields(element_cls)
+                if field_.compare
+            )
+            self._cls_to_field_names[element_cls] = field_names
+        return field_names
+
+    def _map_value(self, value):
+        # Tuples and frozensets whose members are all canonical already are
+        # kept as they are, so that elements holding them are not rebuilt
+        if value.__class__ is tuple or value.__class__ is frozenset:
+            members = [self._map_value(member) for member in value]
+            if all(
+                mapped_member is member
+                for mapped_member, member in zip(members, value)
+            ):
+                return value
+            return value.__class__(members)
+        return super()._map_value(value)
+
+    def _map_string(self, string):
+        return sys.intern(string)
+
+    def _map_element(self, element):
+        return self.intern(element)
+
+
+BELSymbol = collections.namedtuple(
+    "BELSymbol", ["namespace", "identifier", "token"]
+)
+
+
+class BELSymbolTable:
+    # Symbols are made once for each namespace and identifier pair, with
+    # their token, the text of the pair in BEL, rendered once. Identifiers
+    # that are not alphanumeric are quoted, their quotes and backslashes
+    # escaped. Namespaces and identifiers are interned with sys.intern, as
+    # by BELElementInterner, so that they are the same strings as those of
+    # interned elements. Once the table holds maxsize symbols, it is cleared
+    # before the next symbol is added, so that memory does not grow with the
+    # number of distinct pairs.
+    def __init__(self, maxsize: int | None = 65536):
+        self.maxsize = maxsize
+        self._n_symbols = 0
+        self._namespace_to_identifier_to_symbol = {}
+
+    def __len__(self):
+        return self._n_symbols
+
+    def get_symbol(self, namespace, identifier):
+        identifier_to_symbol = self._namespace_to_identifier_to_symbol.get(
+            namespace
+        )
+        if identifier_to_symbol is not None:
+            symbol = identifier_to_symbol.get(identifier)
+            if symbol is not None:
+                return symbol
+        if self.maxsize is not None and self._n_symbols >= self.maxsize:
+            self.clear()
+            identifier_to_symbol = None
+        if namespace is not None:
+            namespace = sys.intern(namespace)
+        if identifier_to_symbol is None:
+            identifier_to_symbol = {}
+            self._namespace_to_identifier_to_symbol[namespace] = (
+                identifier_to_symbol
+            )
+        identifier = sys.intern(identifier)
+        symbol = BELSymbol(
+            namespace, identifier, _make_token(namespace, identifier)
+        )
+        identifier_to_symbol[identifier] = symbol
+        self._n_symbols += 1
+        return symbol
+
+    def get_token(self, namespace, identifier):
+        # Tokens are looked up first without a call to get_symbol, as they
+        # are rendered many times for each pair
+        try:
+            return self._namespace_to_identifier_to_symbol[namespace][
+                identifier
+            ].token
+        except KeyError:
+            return self.get_symbol(namespace, identifier).token
+
+    def clear(self):
+        self._namespace_to_identifier_to_symbol.clear()
+        self._n_symbols = 0
+
+
+def _make_token(namespace, identifier):
+    if not identifier.isalnum():
+        identifier = _quote(identifier)
+    if namespace:
+        return f"{namespace}:{identifier}"
+    return identifier
+
+
+def _quote(string):
+    escaped_string = string.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped_string}"'
+
+
+def _get_element_size(element):
+    # From Python 3.11 on, the values of the __dict__ of an element are
+    # stored inline, one pointer per field, id_ included, and are not
+    # counted by sys.getsizeof. The __dict__ is not accessed, as that would
+    # allocate it.
+    return sys.getsizeof(element) + 8 * (
+        len(_get_element_field_names(type(element))) + 1
+    )
+
+
+def _make_bel_model(
+    bel_model_cls, field_name_to_value, element_clses, codes, element_ids
+):
+    return bel_model_cls(
+        statements=frozenset(
+            _unflatten_elements(element_clses, codes, element_ids)
+        ),
+        **field_name_to_value,
+    )
+
 
-BELModelBuilder = momapy.builder.get_or_make_builder_cls(BELModel)
+_FlatValue = collections.namedtuple("_FlatValue", ["value"])
+
+
+class _ElementFlattener(_ValueMapper):
+    # Objects, elements and other dataclasses, are flattened into a list of
+    # codes, each after the objects it refers to, as the index of its class,
+    # its id_ if it is an element and with_ids is set, and the codes of its
+    # fields. Objects are coded as their index among flattened objects,
+    # strings and None as themselves, tuples and frozensets as tuples and
+    # frozensets of codes, and other values wrapped in _FlatValue. Equal
+    # objects are flattened once, with the id_ of the first one, and equal
+    # strings are coded as the same object, so that pickle stores them once.
+    # Objects are first looked up by identity, which spares hashing and
+    # comparing them when they are shared. They must outlive the flattener.
+    def __init__(self, with_ids=True):
+        self.with_ids = with_ids
+        self.clses = []
+        self.codes = []
+        self._cls_to_cls_info = {}
+        self._obj_to_id = {}
+        self._obj_id_to_id = {}
+        self._strings = {}
+
+    def flatten(self, obj):
+        obj_id = self._obj_id_to_id.get(id(obj))
+        if obj_id is None:
+            obj_id = self._obj_to_id.get(obj)
+            if obj_id is None:
+                obj_cls = type(obj)
+                cls_info = self._cls_to_cls_info.get(obj_cls)
+                if cls_info is None:
+                    cls_info = (
+                        len(self.clses),
+                        _get_element_field_names(obj_cls),
+                        self.with_ids and _has_id(obj_cls),
+                    )
+                    self._cls_to_cls_info[obj_cls] = cls_info
+                    self.clses.append(obj_cls)
+                cls_id, field_names, with_id = cls_info
+                obj_codes = [cls_id]
+                if with_id:
+                    obj_codes.append(obj.id_)
+                for field_name in field_names:
+                    obj_codes.append(self._map_value(getattr(obj, field_name)))
+                obj_id = len(self._obj_to_id)
+                self._obj_to_id[obj] = obj_id
+                self.codes += obj_codes
+            self._obj_id_to_id[id(obj)] = obj_id
+        return obj_id
+
+    def _map_string(self, string):
+        return self._strings.setdefault(string, string)
+
+    _map_element = flatten
+
+    def _map_other(self, value):
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            return self.flatten(value)
+        return _FlatValue(value)
+
+
+def _has_id(obj_cls):
+    return issubclass(obj_cls, BELModelElement)
+
+
+def _flatten_elements(elements):
+    # Returns the classes of the flattened elements, their codes, and the
+    # indices of the given elements among them
+    flattener = _ElementFlattener()
+    element_ids = [flattener.flatten(element) for element in elements]
+    return tuple(flattener.clses), flattener.codes, element_ids
+
+
+def _unflatten_elements(element_clses, codes, element_ids):
+    field_names_list = [
+        _get_element_field_names(element_cls) for element_cls in element_clses
+    ]
+    has_id_list = [_has_id(element_cls) for element_cls in element_clses]
+    elements = []
+    position = 0
+    n_codes = len(codes)
+    while position < n_codes:
+        cls_id = codes[position]
+        position += 1
+        if has_id_list[cls_id]:
+            kwargs = {"id_": codes[position]}
+            position += 1
+        else:
+            kwargs = {}
+        for field_name in field_names_list[cls_id]:
+            code = codes[position]
+            position += 1
+            code_cls = code.__class__
+            if code_cls is int:
+                code = elements[code]
+            elif code_cls is not str and code is not None:
+                code = _unflatten_value(code, elements)
+            kwargs[field_name] = code
+        elements.append(element_clses[cls_id](**kwargs))
+    return [elements[element_id] for element_id in element_ids]
+
+
+def _unflatten_value(code, elements):
+    code_cls = code.__class__
+    if code_cls is int:
+        return elements[code]
+    if code_cls is tuple:
+        return tuple([_unflatten_value(member, elements) for member in code])
+    if code_cls is frozenset:
+        return frozenset(
+            [_unflatten_value(member, elements) for member in code]
+        )
+    if code_cls is _FlatValue:
+        return code.value
+    return code
 
 
 def _make_namespace_identifier_arg(namespace, identifier):
@@ -0,0 +1,242 @@
+import dataclasses
+import functools
+import weakref
+
+import numpy
+
+import momapy_bel.columnar
+import momapy_bel.core
+
+CAUSAL_RELATION_CLS_TO_SIGN = {
+    momapy_bel.core.Increases: 1,
+    momapy_bel.core.DirectlyIncreases: 1,
+    momapy_bel.core.Decreases: -1,
+    momapy_bel.core.DirectlyDecreases: -1,
+    momapy_bel.core.Regulates: 0,
+    momapy_bel.core.RateLimitingStepFor: 0,
+}
+
+_DIRECTIONS = ("downstream", "upstream", "both")
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, eq=False)
+class CausalGraph:
+    # Edges are stored sorted by source, so that the edges going out of node
+    # i are those in range(out_offsets[i], out_offsets[i + 1]). The edges
+    # going in node i are in_edges[in_offsets[i]:in_offsets[i + 1]]. Each
+    # edge has the relation code of its statement, as in
+    # momapy_bel.columnar, and its sign.
+    nodes: tuple[momapy_bel.core.BELModelElement, ...] = ()
+    sources: numpy.ndarray
+    targets: numpy.ndarray
+    relations: numpy.ndarray
+    signs: numpy.ndarray
+    out_offsets: numpy.ndarray
+    in_edges: numpy.ndarray
+    in_offsets: numpy.ndarray
+
+    @functools.cached_property
+    def node_to_id(self):
+        return {node: node_id for node_id, node in enumerate(self.nodes)}
+
+    @classmethod
+    def from_bel_model(cls, bel_model):
+        node_to_id = {}
+        sources = []
+        targets = []
+        relations = []
+        signs = []
+        for relation_cls, sign in CAUSAL_RELATION_CLS_TO_SIGN.items():
+            relation_code = momapy_bel.columnar.get_relation_code(relation_cls)
+            for statement in bel_model.index.get_statements_by_class(
+                relation_cls, with_subclasses=False
+            ):
+                sources.append(
+                    node_to_id.setdefault(statement.source, len(node_to_id))
+                )
+                targets.append(
+                    node_to_id.setdefault(statement.target, len(node_to_id))
+                )
+                relations.append(relation_code)
+                signs.append(sign)
+        n_nodes = len(node_to_id)
+        sources = numpy.array(sources, dtype=numpy.intp)
+        targets = numpy.array(targets, dtype=numpy.intp)
+        order = numpy.lexsort((targets, sources))
+        sources = sources[order]
+        targets = targets[order]
+        in_edges = numpy.argsort(targets, kind="stable")
+        causal_graph = cls(
+            nodes=tuple(node_to_id),
+            sources=sources,
+            targets=targets,
+            relations=numpy.array(relations, dtype=numpy.uint8)[order],
+            signs=numpy.array(signs, dtype=numpy.int8)[order],
+            out_offsets=_make_offsets(sources, n_nodes),
+            in_edges=in_edges,
+            in_offsets=_make_offsets(targets[in_edges], n_nodes),
+        )
+        causal_graph.__dict__["node_to_id"] = node_to_id
+        return causal_graph
+
+    def get_node_ids(self, nodes):
+        # Nodes that are not in the graph are ignored
+        node_to_id = self.node_to_id
+        return numpy.array(
+            [node_to_id[node] for node in nodes if node in node_to_id],
+            dtype=numpy.intp,
+        )
+
+    def get_nodes(self, node_ids):
+        return tuple(self.nodes[node_id] for node_id in node_ids.tolist())
+
+    def _expand(self, node_ids, direction, signs):
+        # Returns the edges going out of (downstream), in (upstream) or
+        # both the given nodes, with for each edge the position of the node
+        # it comes from in node_ids and the node it leads to
+        positions = []
+        neighbors = []
+        edges = []
+        node_positions = numpy.arange(len(node_ids))
+        if direction != "upstream":
+            starts = self.out_offsets[node_ids]
+            counts = self.out_offsets[node_ids + 1] - starts
+            out_edges = momapy_bel.columnar._concatenate_ranges(starts, counts)
+            positions.append(numpy.repeat(node_positions, counts))
+            neighbors.append(self.targets[out_edges])
+            edges.append(out_edges)
+        if direction != "downstream":
+            starts = self.in_offsets[node_ids]
+            counts = self.in_offsets[node_ids + 1] - starts
+            in_edges = self.in_edges[
+                momapy_bel.columnar._concatenate_ranges(starts, counts)
+            ]
+            positions.append(numpy.repeat(node_positions, counts))
+            neighbors.append(self.sources[in_edges])
+            edges.append(in_edges)
+        positions = numpy.concatenate(positions)
+        neighbors = numpy.concatenate(neighbors)
+        edges = numpy.concatenate(edges)
+        if signs is not None:
+            mask = numpy.isin(self.signs[edges], list(signs))
+            positions = positions[mask]
+            neighbors = neighbors[mask]
+            edges = edges[mask]
+        return positions, neighbors, edges
+
+    def bfs(
+        self, node_collections, direction="downstream", max_depth=None, signs=None
+    ):
+        # Runs one breadth-first search from each collection of nodes, all
+        # searches being expanded together level by level. Returns the
+        # index of the search, the id and the depth of each node reached,
+        # starting nodes included, sorted by search and node id. Nodes
+        # reached by a search are encoded as search index * n + node id.
+        _check_direction(direction)
+        n_nodes = len(self.nodes)
+        node_ids = [self.get_node_ids(nodes) for nodes in node_collections]
+        search_indices = numpy.repeat(
+            numpy.arange(len(node_ids)), [len(ids) for ids in node_ids]
+        )
+        keys = numpy.unique(
+            search_indices * n_nodes
+            + numpy.concatenate(node_ids + [numpy.empty(0, dtype=numpy.intp)])
+        )
+        visited_keys = keys
+        level_keys = [keys]
+        level_depths = [numpy.zeros(len(keys), dtype=numpy.intp)]
+        depth = 0
+        while len(keys) and (max_depth is None or depth < max_depth):
+            depth += 1
+            frontier_search_indices, frontier = numpy.divmod(keys, n_nodes)
+            positions, neighbors, _ = self._expand(frontier, direction, signs)
+            keys = numpy.unique(
+                frontier_search_indices[positions] * n_nodes + neighbors
+            )
+            # Visited keys are sorted: they are looked up by bisection, and
+            # merged with the new ones by a stable sort, which merges runs
+            indices = numpy.minimum(
+                numpy.searchsorted(visited_keys, keys), len(visited_keys) - 1
+            )
+            keys = keys[visited_keys[indices] != keys]
+            visited_keys = numpy.sort(
+                numpy.concatenate([visited_keys, keys]), kind="stable"
+            )
+            level_keys.append(keys)
+            level_depths.append(numpy.full(len(keys), depth, dtype=numpy.intp))
+        keys = numpy.concatenate(level_keys)
+        order = numpy.argsort(keys)
+        search_indices, node_ids = numpy.divmod(keys[order], n_nodes)
+        return search_indices, node_ids, numpy.concatenate(level_depths)[order]
+
+    def k_hop(self, node_collections, k, direction="downstream", signs=None):
+        # Returns, for each collection of nodes, the nodes at most k edges
+        # away from them, except themselves
+        search_indices, node_ids, depths = self.bfs(
+            node_collections, direction=direction, max_depth=k, signs=signs
+        )
+        mask = depths > 0
+        search_indices = search_indices[mask]
+        node_ids = node_ids[mask]
+        bounds = numpy.searchsorted(
+            search_indices, numpy.arange(len(node_collections) + 1)
+        ).tolist()
+        nodes = self.get_nodes(node_ids)
+        return [nodes[start:stop] for start, stop in zip(bounds, bounds[1:])]
+
+    def shortest_path(self, source, target, direction="downstream", signs=None):
+        # Returns the nodes of a shortest path from source to target, or
+        # None if there is none
+        _check_direction(direction)
+        source_id = self.node_to_id.get(source)
+        target_id = self.node_to_id.get(target)
+        if source_id is None or target_id is None:
+            return None
+        parents = numpy.full(len(self.nodes), -1, dtype=numpy.intp)
+        parents[source_id] = source_id
+        frontier = numpy.array([source_id], dtype=numpy.intp)
+        while parents[target_id] < 0:
+            if not len(frontier):
+                return None
+            positions, neighbors, _ = self._expand(frontier, direction, signs)
+            mask = parents[neighbors] < 0
+            next_frontier, first_indices = numpy.unique(
+                neighbors[mask], return_index=True
+            )
+            parents[next_frontier] = frontier[positions[mask][first_indices]]
+            frontier = next_frontier
+        path = [target_id]
+        while path[-1] != source_id:
+            path.append(int(parents[path[-1]]))
+        return self.get_nodes(numpy.array(path[::-1]))
+
+
+# Models are mapped by id, as in momapy_bel.algebra, so that the graph of a
+# model is never looked up by comparing it deeply with an equal model
+_bel_model_id_to_causal_graph = {}
+
+
+def get_causal_graph(bel_model):
+    # Graphs are built once per model, and freed with it
+    causal_graph = _bel_model_id_to_causal_graph.get(id(bel_model))
+    if causal_graph is None:
+        causal_graph = CausalGraph.from_bel_model(bel_model)
+        _bel_model_id_to_causal_graph[id(bel_model)] = causal_graph
+        weakref.finalize(
+            bel_model,
+            _bel_model_id_to_causal_graph.pop,
+            id(bel_model),
+            None,
+        )
+    return causal_graph
+
+
+def _check_direction(direction):
+    if direction not in _DIRECTIONS:
+        raise ValueError(f"unknown direction {direction!r}")
+
+
+def _make_offsets(sorted_node_ids, n_nodes):
+    offsets = numpy.zeros(n_nodes + 1, dtype=numpy.intp)
+    numpy.cumsum(numpy.bincount(sorted_node_ids, minlength=n_nodes), out=offsets[1:])
+    return offsets
@@ -1,9 +1,431 @@
+# Modules only needed by parallel writes and reads are imported by the
+# methods that use them, so that importing this module stays fast
+import bz2
+import collections
+import contextvars
+import dataclasses
+import gzip
+import io
+import lzma
+import os
+import re
+import sys
+import time
+import typing
 import urllib.parse
 
+import frozendict
+
 import momapy.io
 import momapy_bel.core
 
 
+class BELElementStringCache:
+    def __init__(self, maxsize: int | None = 65536):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._element_to_string = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._element_to_string)
+
+    def get(self, element):
+        bel_string = self._element_to_string.get(element)
+        if bel_string is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._element_to_string.move_to_end(element)
+        return bel_string
+
+    def put(self, element, bel_string):
+        self._element_to_string[element] = bel_string
+        if (
+            self.maxsize is not None
+            and len(self._element_to_string) > self.maxsize
+        ):
+            self._element_to_string.popitem(last=False)
+
+    def clear(self):
+        self._element_to_string.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+
+class BELStatementBlockCache:
+    # Keeps, from one canonical write to the next, the sort keys of the
+    # statements written and their strings by blocks of statements, so that
+    # writing a model that shares most of its statements with the previous
+    # one only sorts and renders the statements that changed. Blocks end
+    # after each statement whose hash is a multiple of block_size, so that
+    # adding or removing a statement only changes its own block, and only
+    # the blocks of the last write are kept. Statements are looked up by
+    # their hashes, which elements cache, rather than by digests of their
+    # content: a cache is only valid within a process, and for one writer
+    # class, as element string caches are.
+    def __init__(self, block_size: int = 64):
+        self.block_size = block_size
+        self.hits = 0
+        self.misses = 0
+        self._sorted_statements = []
+        self._statement_to_sort_key = {}
+        self._block_to_strings = {}
+
+    def __len__(self):
+        return len(self._block_to_strings)
+
+    def clear(self):
+        self._sorted_statements = []
+        self._statement_to_sort_key = {}
+        self._block_to_strings = {}
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def _sort_statements(self, bel_statements):
+        # Statements of the previous write that are still written keep
+        # their order, and new statements are sorted and merged with them
+        bel_statements = set(bel_statements)
+        statement_to_sort_key = self._statement_to_sort_key
+        memo = {}
+        new_statements = []
+        for bel_statement in bel_statements:
+            if bel_statement not in statement_to_sort_key:
+                statement_to_sort_key[bel_statement] = (
+                    momapy_bel.core.get_sort_key(bel_statement, memo)
+                )
+                new_statements.append(bel_statement)
+        new_statements.sort(key=statement_to_sort_key.__getitem__)
+        # Sorting the concatenation of the two sorted runs merges them
+        sorted_statements = sorted(
+            [
+                bel_statement
+                for bel_statement in self._sorted_statements
+                if bel_statement in bel_statements
+            ]
+            + new_statements,
+            key=statement_to_sort_key.__getitem__,
+        )
+        self._sorted_statements = sorted_statements
+        self._statement_to_sort_key = {
+            bel_statement: statement_to_sort_key[bel_statement]
+            for bel_statement in sorted_statements
+        }
+        return sorted_statements
+
+    def _iter_lines(self, writer_cls, items, cache, symbol_table):
+        # Items are cut into blocks, whose statements are rendered unless
+        # the previous write had the same block
+        block_to_strings = {}
+        block_size = self.block_size
+        block_items = []
+        block = []
+        for item in items:
+            block_items.append(item)
+            if item.__class__ is not str:
+                block.append(item)
+                if hash(item) % block_size == 0:
+                    yield from self._iter_block_lines(
+                        writer_cls,
+                        block_items,
+                        block,
+                        block_to_strings,
+                        cache,
+                        symbol_table,
+                    )
+                    block_items = []
+                    block = []
+        if block_items:
+            yield from self._iter_block_lines(
+                writer_cls,
+                block_items,
+                block,
+                block_to_strings,
+                cache,
+                symbol_table,
+            )
+        self._block_to_strings = block_to_strings
+
+    def _iter_block_lines(
+        self,
+        writer_cls,
+        block_items,
+        block,
+        block_to_strings,
+        cache,
+        symbol_table,
+    ):
+        block = tuple(block)
+        statement_strings = self._block_to_strings.get(block)
+        if statement_strings is None:
+            self.misses += 1
+            statement_strings = [
+                writer_cls._bel_statement_to_string(
+                    bel_statement, cache, symbol_table
+                )
+                for bel_statement in block
+            ]
+        else:
+            self.hits += 1
+        block_to_strings[block] = statement_strings
+        return writer_cls._merge_chunk(block_items, statement_strings)
+
+
+@dataclasses.dataclass(slots=True)
+class BELWriterHandlerStats:
+    calls: int = 0
+    cumulative_time: float = 0.0
+    self_time: float = 0.0
+    output_size: int = 0
+
+
+class BELWriterProfile:
+    # Filled in by a write with profile set, see _make_profiled_writer_cls.
+    # Handlers are the transformation functions of _ELEMENT_CLS_TO_FUNC_NAME:
+    # their cumulative time includes that of the handlers they call for
+    # subelements, their self time does not, and their output size is the
+    # number of characters they return. Elements whose string is found in
+    # the cache are not rendered, and hence not counted. Phases are the
+    # filtering and sorting of statements, the rendering of SET and UNSET
+    # lines, and the writing of lines to the file. If set, the hook is
+    # called with the report at the end of each write.
+    def __init__(self, hook: typing.Callable[[dict], None] | None = None):
+        self.hook = hook
+        self.handler_stats = collections.defaultdict(BELWriterHandlerStats)
+        self.phase_times = collections.defaultdict(float)
+        self.total_time = 0.0
+        self._child_times = []
+
+    def report(self):
+        return {
+            "total_time": self.total_time,
+            "phases": dict(self.phase_times),
+            "handlers": {
+                handler_name: dataclasses.asdict(handler_stats)
+                for handler_name, handler_stats in sorted(
+                    self.handler_stats.items(),
+                    key=lambda item: item[1].self_time,
+                    reverse=True,
+                )
+            },
+        }
+
+    def clear(self):
+        self.handler_stats.clear()
+        self.phase_times.clear()
+        self.total_time = 0.0
+
+    def _wrap_renderer(self, renderer):
+        handler_stats = self.handler_stats[renderer.__name__]
+        child_times = self._child_times
+
+        def profiled_renderer(element):
+            child_times.append(0.0)
+            start = time.perf_counter()
+            bel_string = renderer(element)
+            elapsed_time = time.perf_counter() - start
+            handler_stats.calls += 1
+            handler_stats.cumulative_time += elapsed_time
+            handler_stats.self_time += elapsed_time - child_times.pop()
+            handler_stats.output_size += len(bel_string)
+            if child_times:
+                child_times[-1] += elapsed_time
+            return bel_string
+
+        return profiled_renderer
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class BELWriterOptions:
+    # Options of BELWriter.write, which can also be given to it as keyword
+    # arguments replacing those of the given options. Statements of the
+    # classes whose with_*_as_statements option is false are not written
+    # as statements, but only as terms of other statements.
+    with_abundances_as_statements: bool = False
+    with_biological_processes_as_statements: bool = False
+    with_reactions_as_statements: bool = True
+    with_degradations_as_statements: bool = True
+    with_translocations_as_statements: bool = True
+    # Lines are written by buffers of at least buffer_size characters
+    buffer_size: int = 65536
+    encoding: str = "utf-8"
+    # Strings of terms are cached during the write, in the given cache or
+    # else in a new cache of cache_size strings, if cache_size is not zero
+    cache: BELElementStringCache | None = None
+    cache_size: int | None = 65536
+    with_grouped_annotations: bool = False
+    with_canonical_order: bool = False
+    # Canonical writes given a block cache only render the blocks of
+    # statements that changed since the previous write with it, see
+    # BELStatementBlockCache
+    block_cache: BELStatementBlockCache | None = None
+    # Gzip files are compressed by blocks of compression_block_size bytes
+    # in compression_threads threads, see _ParallelGzipFile
+    compression_threads: int | None = None
+    compression_block_size: int = 1 << 20
+    # Statements are rendered by chunks of chunk_size statements in
+    # processes processes, see BELWriter._render_items_in_parallel
+    processes: int | None = None
+    chunk_size: int = 10000
+    profile: BELWriterProfile | None = None
+
+
+# The cache in use by the write being performed in the current context, if
+# any. It is only set while a single statement is being rendered, so that
+# it never leaks out of a suspended line generator.
+_element_string_cache = contextvars.ContextVar(
+    "_element_string_cache", default=None
+)
+# The symbol table of the write or read being performed in the current
+# context, if any, set as the cache is. Each write and read has its own
+# table, so that symbols are freed with it.
+_symbol_table = contextvars.ContextVar("_symbol_table", default=None)
+
+
+def _get_condition_source(condition):
+    kind, *field_names = condition
+    if kind == "is_set":
+        return " and ".join(
+            [f"element.{field_name} is not None" for field_name in field_names]
+        )
+    if kind == "is_nonempty":
+        return f"element.{field_names[0]}"
+    raise ValueError(f"unknown condition {kind!r}")
+
+
+def _get_component_source(component):
+    # Returns the expression of a component whose string is always part of
+    # the arguments of the term
+    kind, *args = component
+    if kind == "token":
+        return f"make_token(element.{args[0]}, element.{args[1]})"
+    if kind == "element":
+        return f"render_element(element.{args[0]})"
+    if kind == "string":
+        return f"element.{args[0]}"
+    if kind == "elements":
+        return (
+            f"', '.join([render_element(value) "
+            f"for value in element.{args[0]}])"
+        )
+    if kind == "sorted_elements":
+        return (
+            f"', '.join(sorted([render_element(value) "
+            f"for value in element.{args[0]}]))"
+        )
+    if kind == "function":
+        function_symbol, subcomponent = args
+        return (
+            f"'{function_symbol}(' + "
+            f"{_get_component_source(subcomponent)} + ')'"
+        )
+    if kind == "either":
+        condition, component_if, component_else = args
+        return (
+            f"({_get_component_source(component_if)} "
+            f"if {_get_condition_source(condition)} "
+            f"else {_get_component_source(component_else)})"
+        )
+    raise ValueError(f"unknown component {kind!r}")
+
+
+def _uses_tokens(components):
+    for component in components:
+        kind, *args = component
+        if kind == "token":
+            return True
+        if kind == "function" and _uses_tokens(args[1:]):
+            return True
+        if kind == "either" and _uses_tokens(args[1:]):
+            return True
+    return False
+
+
+def _make_term_renderer_source(function_symbol, components):
+    # Returns the source of a renderer of terms whose arguments are the
+    # given components, in order. The string of the arguments is built as
+    # they are read, rather than from a list of arguments, and the tokens
+    # of namespace and identifier pairs are made by the symbol table of
+    # the write, which is looked up once per term.
+    lines = ["def render(element):"]
+    if _uses_tokens(components):
+        lines += [
+            "    symbol_table = get_symbol_table()",
+            "    if symbol_table is None:",
+            "        make_token = make_plain_token",
+            "    else:",
+            "        make_token = symbol_table.get_token",
+        ]
+    sources = []
+    has_string = False
+    for index, component in enumerate(components):
+        kind, *args = component
+        if index == 0 or kind not in (
+            "optional_element",
+            "optional_string",
+            "elements",
+        ):
+            sources.append(_get_component_source(component))
+            continue
+        if sources:
+            lines.append(
+                f"    string = f\"{_join_sources(sources, has_string)}\""
+            )
+            sources = []
+            has_string = True
+        if kind == "elements":
+            lines += [
+                f"    for value in element.{args[0]}:",
+                "        string = f\"{string}, {render_element(value)}\"",
+            ]
+        else:
+            if kind == "optional_element":
+                value_source = "render_element(value)"
+            else:
+                value_source = "value"
+            lines += [
+                f"    value = element.{args[0]}",
+                "    if value is not None:",
+                f"        string = f\"{{string}}, {{{value_source}}}\"",
+            ]
+    lines.append(
+        f"    return f\"{function_symbol}"
+        f"({_join_sources(sources, has_string)})\""
+    )
+    return "\n".join(lines) + "\n"
+
+
+def _join_sources(sources, has_string):
+    # Returns the replacement fields of the string of the arguments built so
+    # far, if any, followed by those of the given sources
+    if has_string:
+        sources = ["string"] + sources
+    return ", ".join([f"{{{source}}}" for source in sources])
+
+
+def _make_relation_renderer_source(relation_symbol):
+    return (
+        "def render(element):\n"
+        "    return (\n"
+        "        f\"{render_element(element.source)} "
+        f"{relation_symbol} "
+        "{render_element(element.target)}\"\n"
+        "    )\n"
+    )
+
+
 class BELWriter(momapy.io.Writer):
     _ELEMENT_CLS_TO_FUNC_NAME = {
         momapy_bel.core.List: "_list_to_string",
@@ -51,7 +473,7 @@ class BELWriter(momapy.io.Writer):
         momapy_bel.core.Regulates: "_regulates_to_string",
         momapy_bel.core.SubProcessOf: "_subprocess_of_to_string",
         momapy_bel.core.TranscribedTo: "_transcribed_to_to_string",
-        momapy_bel.core.TranslatedTo: "_translated_to",
+        momapy_bel.core.TranslatedTo: "_translated_to_to_string",
         (
             momapy_bel.core.BELGenericAnnotation,
             "set",
@@ -67,34 +489,339 @@ class BELWriter(momapy.io.Writer):
         momapy_bel.core.BELGenericAnnotationDefinition: "_annotation_definition_to_define_string",
         momapy_bel.core.BELNamespaceDefinition: "_namespace_definition_to_define_string",
     }
+    # Components of the terms rendered by transformation functions, from
+    # which renderers specialized for their element class are generated,
+    # see _make_term_renderer_source. Components are a token of a namespace
+    # and identifier pair, a subelement, a string, subelements in order or
+    # sorted, a nested function, either of two components, and an optional
+    # subelement, string or subelements, which are left out when missing.
+    _FUNC_NAME_TO_TERM_SPEC = {
+        "_list_to_string": ("list", [("elements", "elements")]),
+        "_location_to_string": (
+            "loc",
+            [("token", "namespace", "identifier")],
+        ),
+        "_abundance_to_string": (
+            "a",
+            [
+                ("token", "namespace", "identifier"),
+                ("optional_element", "location"),
+            ],
+        ),
+        "_molecular_activity_to_string": (
+            "ma",
+            [("token", "namespace", "identifier")],
+        ),
+        "_activity_to_string": (
+            "act",
+            [
+                ("element", "abundance"),
+                ("optional_element", "molecular_activity"),
+            ],
+        ),
+        "_biological_process_to_string": (
+            "bp",
+            [("token", "namespace", "identifier")],
+        ),
+        "_cell_secretion_to_string": ("sec", [("element", "abundance")]),
+        "_cell_surface_expression_to_string": (
+            "surf",
+            [("element", "abundance")],
+        ),
+        "_complex_abundance_to_string": (
+            "complex",
+            [
+                (
+                    "either",
+                    ("is_nonempty", "members"),
+                    ("sorted_elements", "members"),
+                    ("token", "namespace", "identifier"),
+                ),
+                ("optional_element", "location"),
+            ],
+        ),
+        "_composite_abundance_to_string": (
+            "composite",
+            [
+                (
+                    "either",
+                    ("is_set", "namespace", "identifier"),
+                    ("token", "namespace", "identifier"),
+                    ("sorted_elements", "members"),
+                ),
+            ],
+        ),
+        "_degradation_to_string": ("deg", [("element", "abundance")]),
+        "_fragment_to_string": (
+            "frag",
+            [("string", "start_stop"), ("optional_string", "descriptor")],
+        ),
+        "_fusion_to_string": (
+            "fus",
+            [
+                ("token", "namespace5", "identifier5"),
+                ("string", "range5"),
+                ("token", "namespace3", "identifier3"),
+                ("string", "range3"),
+            ],
+        ),
+        "_variant_to_string": ("var", [("string", "descriptor")]),
+        "_gene_abundance_to_string": (
+            "g",
+            [
+                (
+                    "either",
+                    ("is_set", "namespace", "identifier"),
+                    ("token", "namespace", "identifier"),
+                    ("element", "fusion"),
+                ),
+                ("optional_element", "location"),
+                ("optional_element", "variant"),
+            ],
+        ),
+        "_microrna_abundance_to_string": (
+            "m",
+            [
+                (
+                    "either",
+                    ("is_set", "namespace", "identifier"),
+                    ("token", "namespace", "identifier"),
+                    ("element", "fusion"),
+                ),
+                ("optional_element", "location"),
+                ("optional_element", "variant"),
+            ],
+        ),
+        "_pathology_to_string": (
+            "path",
+            [("token", "namespace", "identifier")],
+        ),
+        "_population_abundance_to_string": (
+            "pop",
+            [
+                ("token", "namespace", "identifier"),
+                ("optional_element", "location"),
+            ],
+        ),
+        "_protein_modification_to_string": (
+            "pmod",
+            [
+                ("token", "namespace", "identifier"),
+                ("optional_string", "amino_acid"),
+                ("optional_string", "residue"),
+            ],
+        ),
+        "_protein_abundance_to_string": (
+            "p",
+            [
+                (
+                    "either",
+                    ("is_set", "namespace", "identifier"),
+                    ("token", "namespace", "identifier"),
+                    ("element", "fusion"),
+                ),
+                ("optional_element", "location"),
+                ("elements", "modifications"),
+                ("optional_element", "variant"),
+            ],
+        ),
+        "_reaction_to_string": (
+            "rxn",
+            [
+                ("function", "reactants", ("sorted_elements", "reactants")),
+                ("function", "products", ("sorted_elements", "products")),
+            ],
+        ),
+        "_rna_abundance_to_string": (
+            "r",
+            [
+                (
+                    "either",
+                    ("is_set", "namespace", "identifier"),
+                    ("token", "namespace", "identifier"),
+                    ("element", "fusion"),
+                ),
+                ("optional_element", "location"),
+                ("optional_element", "variant"),
+            ],
+        ),
+        "_translocation_to_string": (
+            "tloc",
+            [
+                ("element", "abundance"),
+                (
+                    "function",
+                    "fromLoc",
+                    ("token", "from_namespace", "from_identifier"),
+                ),
+                (
+                    "function",
+                    "toLoc",
+                    ("token", "to_namespace", "to_identifier"),
+                ),
+            ],
+        ),
+    }
+    # Symbols of the relations rendered by transformation functions, from
+    # which renderers specialized for their element class are generated,
+    # see _make_relation_renderer_source
+    _FUNC_NAME_TO_RELATION_SYMBOL = {
+        "_analogous_to_string": "analogous",
+        "_association_to_string": "association",
+        "_biomarker_for_to_string": "biomarkerFor",
+        "_causes_no_change_to_string": "cnc",
+        "_decreases_to_string": "-|",
+        "_directly_decreases_to_string": "=|",
+        "_directly_increases_to_string": "=>",
+        "_has_activity_to_string": "hasActivity",
+        "_has_component_to_string": "hasComponent",
+        "_has_components_to_string": "hasComponents",
+        "_has_member_to_string": "hasMember",
+        "_has_members_to_string": "hasMembers",
+        "_increases_to_string": "->",
+        "_is_a_to_string": "isA",
+        "_negative_correlation_to_string": "neg",
+        "_orthologous_to_string": "orthologous",
+        "_positive_correlation_to_string": "pos",
+        "_prognostic_biomarker_for_to_string": "prognosticBiomarkerFor",
+        "_rate_limiting_step_for_to_string": "rateLimitingStepFor",
+        "_regulates_to_string": "reg",
+        "_subprocess_of_to_string": "subProcessOf",
+        "_transcribed_to_to_string": ":>",
+        "_translated_to_to_string": ">>",
+    }
+    # Element class -> renderer, filled in lazily by _get_element_renderer.
+    # Each subclass gets its own table, since renderers are bound to the
+    # writer class they were made for.
+    _element_cls_to_renderer = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._element_cls_to_renderer = {}
 
     @classmethod
     def write(
         cls,
         obj: momapy_bel.core.BELModel,
-        file_path: str,
+        file_path: str | os.PathLike | typing.IO,
+        namespace_definitions,
+        annotation_definitions,
+        annotations,
+        options: BELWriterOptions | None = None,
+        **kwargs,
+    ):
+        # Files ending with .gz, .bz2 or .xz are compressed as they are
+        # written. Gzip files are compressed by blocks in a thread pool if
+        # compression_threads is above one, see _ParallelGzipFile. Profiled
+        # writes are made by a subclass that records the time spent in each
+        # handler, so that writes without a profile are not slowed down.
+        options = _make_writer_options(options, kwargs)
+        profile = options.profile
+        if profile is not None:
+            if options.processes is not None and options.processes > 1:
+                raise ValueError("profiled writes cannot use processes")
+            start = time.perf_counter()
+            _make_profiled_writer_cls(cls, profile).write(
+                obj,
+                file_path,
+                namespace_definitions,
+                annotation_definitions,
+                annotations,
+                dataclasses.replace(options, profile=None),
+            )
+            profile.total_time += time.perf_counter() - start
+            if profile.hook is not None:
+                profile.hook(profile.report())
+            return
+        if options.cache is None and options.cache_size:
+            options = dataclasses.replace(
+                options,
+                cache=BELElementStringCache(maxsize=options.cache_size),
+            )
+        lines = cls._bel_model_to_lines(
+            obj,
+            namespace_definitions,
+            annotation_definitions,
+            annotations,
+            options,
+        )
+        if hasattr(file_path, "write"):
+            cls._write_lines(
+                file_path, lines, options.buffer_size, options.encoding
+            )
+        elif (
+            options.compression_threads is not None
+            and options.compression_threads > 1
+            and _get_compression(file_path) == ".gz"
+        ):
+            with _ParallelGzipFile(
+                file_path,
+                options.compression_threads,
+                options.compression_block_size,
+            ) as f:
+                cls._write_lines(
+                    f, lines, options.buffer_size, options.encoding
+                )
+        else:
+            with _open_text_file(file_path, "w", options.encoding) as f:
+                cls._write_lines(
+                    f, lines, options.buffer_size, options.encoding
+                )
+
+    @classmethod
+    def iter_lines(
+        cls,
+        obj: momapy_bel.core.BELModel,
         namespace_definitions,
         annotation_definitions,
         annotations,
-        with_abundances_as_statements=False,
-        with_biological_processes_as_statements=False,
-        with_reactions_as_statements=True,
-        with_degradations_as_statements=True,
-        with_translocations_as_statements=True,
+        options: BELWriterOptions | None = None,
+        **kwargs,
     ):
-        bel_string = cls._bel_model_to_string(
+        # Options that only apply to files are ignored
+        return cls._bel_model_to_lines(
             obj,
             namespace_definitions,
             annotation_definitions,
             annotations,
-            with_abundances_as_statements=with_abundances_as_statements,
-            with_biological_processes_as_statements=with_biological_processes_as_statements,
-            with_reactions_as_statements=with_reactions_as_statements,
-            with_degradations_as_statements=with_degradations_as_statements,
-            with_translocations_as_statements=with_translocations_as_statements,
+            _make_writer_options(options, kwargs),
         )
-        with open(file_path, "w") as f:
-            f.write(bel_string)
+
+    @classmethod
+    def _is_binary_stream(cls, stream):
+        if isinstance(stream, io.TextIOBase):
+            return False
+        if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+            return True
+        return "b" in getattr(stream, "mode", "")
+
+    @classmethod
+    def _write_lines(cls, stream, lines, buffer_size=65536, encoding="utf-8"):
+        # Lines are accumulated until the buffer holds at least buffer_size
+        # characters, so that at most one buffer plus one line is held in
+        # memory at any time.
+        is_binary = cls._is_binary_stream(stream)
+        buffer = []
+        buffered_size = 0
+        separator = ""
+        for line in lines:
+            buffer.append(separator)
+            buffer.append(line)
+            buffered_size += len(line) + 1
+            separator = "\n"
+            if buffered_size >= buffer_size:
+                cls._write_buffer(stream, buffer, is_binary, encoding)
+                buffer = []
+                buffered_size = 0
+        if buffer:
+            cls._write_buffer(stream, buffer, is_binary, encoding)
+
+    @classmethod
+    def _write_buffer(cls, stream, buffer, is_binary, encoding):
+        chunk = "".join(buffer)
+        if is_binary:
+            chunk = chunk.encode(encoding)
+        stream.write(chunk)
 
     @classmethod
     def _list_to_string(cls, bel_list):
@@ -225,7 +952,7 @@ class BELWriter(momapy.io.Writer):
             ),
             fusion.range3,
         ]
-        return cls._make_namespace_identifier_arg("fus", args)
+        return cls._make_function_string("fus", args)
 
     @classmethod
     def _variant_to_string(cls, variant):
@@ -304,16 +1031,24 @@ class BELWriter(momapy.io.Writer):
 
     @classmethod
     def _protein_abundance_to_string(cls, protein_abundance):
-        args = [
-            cls._make_namespace_identifier_arg(
-                protein_abundance.namespace, protein_abundance.identifier
-            )
-        ]
+        if (
+            protein_abundance.namespace is not None
+            and protein_abundance.identifier is not None
+        ):
+            args = [
+                cls._make_namespace_identifier_arg(
+                    protein_abundance.namespace, protein_abundance.identifier
+                )
+            ]
+        else:
+            args = [cls._bel_element_to_string(protein_abundance.fusion)]
         if protein_abundance.location is not None:
             args.append(cls._bel_element_to_string(protein_abundance.location))
         if protein_abundance.modifications:
             for modification in protein_abundance.modifications:
                 args.append(cls._bel_element_to_string(modification))
+        if protein_abundance.variant is not None:
+            args.append(cls._bel_element_to_string(protein_abundance.variant))
         return cls._make_function_string("p", args)
 
     @classmethod
@@ -586,7 +1321,7 @@ class BELWriter(momapy.io.Writer):
 
     @classmethod
     def _get_as_type_from_as(cls, as_):
-        if isinstance(as_, list):
+        if isinstance(as_, (list, tuple)):
             as_type = "LIST"
         elif cls._is_url(as_):
             as_type = "URL"
@@ -637,95 +1372,394 @@ class BELWriter(momapy.io.Writer):
                     "DOCUMENT Authors", [document_annotation.authors]
                 )
             )
+        if document_annotation.contact_info is not None:
+            output_strings.append(
+                cls._make_set_string(
+                    "DOCUMENT ContactInfo", [document_annotation.contact_info]
+                )
+            )
+        if document_annotation.version is not None:
+            output_strings.append(
+                cls._make_set_string(
+                    "DOCUMENT Version", [document_annotation.version]
+                )
+            )
+        if document_annotation.copyright is not None:
+            output_strings.append(
+                cls._make_set_string(
+                    "DOCUMENT Copyright", [document_annotation.copyright]
+                )
+            )
+        if document_annotation.licenses is not None:
+            output_strings.append(
+                cls._make_set_string(
+                    "DOCUMENT Licenses", [document_annotation.licenses]
+                )
+            )
         return "\n".join(output_strings)
 
     @classmethod
-    def _bel_model_to_string(
+    def _bel_model_to_lines(
+        cls,
+        bel_model,
+        bel_namespace_definitions,
+        bel_annotation_definitions,
+        bel_annotations,
+        options,
+    ):
+        yield from cls._iter_header_lines(
+            bel_model,
+            bel_namespace_definitions,
+            bel_annotation_definitions,
+            bel_annotations,
+        )
+        block_cache = options.block_cache
+        is_parallel = options.processes is not None and options.processes > 1
+        if block_cache is not None:
+            if not options.with_canonical_order:
+                raise ValueError("block caches require with_canonical_order")
+            if is_parallel:
+                raise ValueError("block caches cannot be used with processes")
+        bel_statements = cls._get_output_statements(bel_model, options)
+        if options.with_canonical_order:
+            bel_statements = cls._sort_statements(bel_statements, block_cache)
+        if is_parallel:
+            bel_statements = list(bel_statements)
+        if options.with_grouped_annotations:
+            items = cls._iter_grouped_statement_items(
+                bel_statements, bel_annotations
+            )
+        else:
+            items = cls._iter_statement_items(bel_statements, bel_annotations)
+        if is_parallel:
+            yield from cls._render_items_in_parallel(
+                items, bel_statements, options
+            )
+        elif block_cache is not None:
+            yield from block_cache._iter_lines(
+                cls, items, options.cache, momapy_bel.core.BELSymbolTable()
+            )
+        else:
+            cache = options.cache
+            symbol_table = momapy_bel.core.BELSymbolTable()
+            for item in items:
+                if item.__class__ is str:
+                    yield item
+                else:
+                    yield cls._bel_statement_to_string(
+                        item, cache, symbol_table
+                    )
+
+    @classmethod
+    def _iter_header_lines(
         cls,
         bel_model,
         bel_namespace_definitions,
         bel_annotation_definitions,
         bel_annotations,
-        with_abundances_as_statements=False,
-        with_biological_processes_as_statements=False,
-        with_reactions_as_statements=True,
-        with_degradations_as_statements=True,
-        with_translocations_as_statements=True,
     ):
-        output_strings = []
         bel_model_annotations = bel_annotations.get(bel_model)
         if bel_model_annotations is not None:
             for bel_model_annotation in bel_model_annotations:
-                output_strings.append(
-                    cls._bel_annotation_to_string(bel_model_annotation)
-                )
+                yield cls._bel_annotation_to_string(bel_model_annotation)
         for bel_namespace_definition in bel_namespace_definitions:
             define_string = cls._namespace_definition_to_define_string(
                 bel_namespace_definition
             )
-            output_strings.append(define_string)
+            yield define_string
         for bel_annotation_definition in bel_annotation_definitions:
             define_string = cls._annotation_definition_to_define_string(
                 bel_annotation_definition
             )
-            output_strings.append(define_string)
-        for bel_statement in bel_model.statements:
-            if (
+            yield define_string
+
+    @classmethod
+    def _get_output_statements(cls, bel_model, options):
+        # Statements are filtered on their class in a single pass, rather
+        # than through the index of the model, which would be built and
+        # kept on the model of the caller. Whether a class is excluded is
+        # looked up once per class.
+        excluded_statement_clses = tuple(
+            statement_cls
+            for with_statements, statement_cls in [
                 (
-                    with_abundances_as_statements
-                    or not isinstance(bel_statement, momapy_bel.core.Abundance)
+                    options.with_abundances_as_statements,
+                    momapy_bel.core.Abundance,
+                ),
+                (
+                    options.with_biological_processes_as_statements,
+                    momapy_bel.core.BiologicalProcess,
+                ),
+                (
+                    options.with_reactions_as_statements,
+                    momapy_bel.core.Reaction,
+                ),
+                (
+                    options.with_degradations_as_statements,
+                    momapy_bel.core.Degradation,
+                ),
+                (
+                    options.with_translocations_as_statements,
+                    momapy_bel.core.Translocation,
+                ),
+            ]
+            if not with_statements
+        )
+        statement_cls_to_is_excluded = {}
+        for bel_statement in bel_model.statements:
+            statement_cls = type(bel_statement)
+            is_excluded = statement_cls_to_is_excluded.get(statement_cls)
+            if is_excluded is None:
+                is_excluded = issubclass(
+                    statement_cls, excluded_statement_clses
                 )
-                and (
-                    with_biological_processes_as_statements
-                    or not isinstance(
-                        bel_statement, momapy_bel.core.BiologicalProcess
+                statement_cls_to_is_excluded[statement_cls] = is_excluded
+            if not is_excluded:
+                yield bel_statement
+
+    @classmethod
+    def _sort_statements(cls, bel_statements, block_cache=None):
+        # Statements are sorted on structural keys rather than on their
+        # rendering, with keys of shared subterms computed once. A block
+        # cache keeps the keys of the previous write.
+        if block_cache is not None:
+            return block_cache._sort_statements(bel_statements)
+        memo = {}
+        return sorted(
+            bel_statements,
+            key=lambda bel_statement: momapy_bel.core.get_sort_key(
+                bel_statement, memo
+            ),
+        )
+
+    @classmethod
+    def _iter_statement_items(cls, bel_statements, bel_annotations):
+        # Items are either lines, or statements to render. Each statement is
+        # surrounded by a SET and an UNSET line for each of its annotations.
+        annotation_to_strings = {}
+        for bel_statement in bel_statements:
+            unset_strings = []
+            bel_statement_annotations = bel_annotations.get(bel_statement)
+            if bel_statement_annotations is not None:
+                for bel_annotation in bel_statement_annotations:
+                    set_string, unset_string = cls._get_annotation_strings(
+                        bel_annotation, annotation_to_strings
                     )
-                )
-                and (
-                    with_reactions_as_statements
-                    or not isinstance(bel_statement, momapy_bel.core.Reaction)
-                )
-                and (
-                    with_degradations_as_statements
-                    or not isinstance(
-                        bel_statement, momapy_bel.core.Degradation
+                    yield set_string
+                    unset_strings.append(unset_string)
+            yield bel_statement
+            yield from unset_strings
+
+    @classmethod
+    def _get_annotation_strings(cls, bel_annotation, annotation_to_strings):
+        # Annotations are mostly shared by many statements, hence their SET
+        # and UNSET lines are rendered once per write
+        strings = annotation_to_strings.get(bel_annotation)
+        if strings is None:
+            strings = (
+                cls._bel_annotation_to_string(
+                    bel_annotation, set_or_unset="set"
+                ),
+                cls._bel_annotation_to_string(
+                    bel_annotation, set_or_unset="unset"
+                ),
+            )
+            annotation_to_strings[bel_annotation] = strings
+        return strings
+
+    @classmethod
+    def _iter_grouped_statement_items(cls, bel_statements, bel_annotations):
+        # Statements with the same annotations are written together, under a
+        # single SET of each annotation. Groups are sorted by the values of
+        # their annotations, the annotations shared by the most statements
+        # first, so that groups that share the values of these annotations
+        # follow each other, as in a depth-first traversal of a trie. Only
+        # the annotations that differ between two consecutive groups are
+        # unset and set. As when reading, a later annotation with the same
+        # name as an earlier one replaces it.
+        annotations_to_statements = {}
+        for bel_statement in bel_statements:
+            name_to_annotation = {}
+            bel_statement_annotations = bel_annotations.get(bel_statement)
+            if bel_statement_annotations is not None:
+                for bel_annotation in bel_statement_annotations:
+                    name_to_annotation[bel_annotation.definition.name] = (
+                        bel_annotation
                     )
-                )
-                and (
-                    with_translocations_as_statements
-                    or not isinstance(
-                        bel_statement, momapy_bel.core.Translocation
+            annotations_to_statements.setdefault(
+                frozenset(name_to_annotation.items()), []
+            ).append(bel_statement)
+        name_to_count = collections.Counter()
+        for annotations, group_statements in annotations_to_statements.items():
+            for name, _ in annotations:
+                name_to_count[name] += len(group_statements)
+        names = sorted(
+            name_to_count, key=lambda name: (-name_to_count[name], name)
+        )
+        active_name_to_annotation = {}
+        for annotations in sorted(
+            annotations_to_statements,
+            key=lambda annotations: cls._get_annotation_group_sort_key(
+                annotations, names
+            ),
+        ):
+            name_to_annotation = dict(annotations)
+            for name in list(active_name_to_annotation):
+                if name not in name_to_annotation:
+                    yield cls._bel_annotation_to_string(
+                        active_name_to_annotation.pop(name),
+                        set_or_unset="unset",
                     )
-                )
+            for name in names:
+                bel_annotation = name_to_annotation.get(name)
+                if (
+                    bel_annotation is not None
+                    and active_name_to_annotation.get(name) != bel_annotation
+                ):
+                    yield cls._bel_annotation_to_string(
+                        bel_annotation, set_or_unset="set"
+                    )
+                    active_name_to_annotation[name] = bel_annotation
+            yield from annotations_to_statements[annotations]
+
+    @classmethod
+    def _render_items_in_parallel(cls, items, bel_statements, options):
+        # Items are cut into chunks of chunk_size statements, which are
+        # rendered in a pool of processes, or of threads when the GIL is
+        # disabled. Processes are given the statements once, when they
+        # start: forked processes inherit them, and other processes receive
+        # them flattened, as models are pickled. Chunks are then sent as
+        # indices of their statements. Rendered chunks are merged back with
+        # their lines in order, with at most two chunks per worker in
+        # flight, so that the output is that of the serial writer. Each
+        # chunk is rendered with its own cache, of the size of the given
+        # one.
+        import concurrent.futures
+        import multiprocessing
+
+        processes = options.processes
+        if options.cache is not None:
+            cache_size = options.cache.maxsize
+        else:
+            cache_size = 0
+        if _is_gil_enabled():
+            if "fork" in multiprocessing.get_all_start_methods():
+                initargs = (bel_statements,)
+                mp_context = multiprocessing.get_context("fork")
+            else:
+                initargs = momapy_bel.core._flatten_elements(bel_statements)
+                mp_context = None
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=mp_context,
+                initializer=_set_worker_bel_statements,
+                initargs=initargs,
+            )
+        else:
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=processes
+            )
+        # Threads share the statements of this write
+        if isinstance(executor, concurrent.futures.ThreadPoolExecutor):
+            worker_bel_statements = bel_statements
+        else:
+            worker_bel_statements = None
+        statement_id_to_index = {
+            id(bel_statement): index
+            for index, bel_statement in enumerate(bel_statements)
+        }
+        chunks_and_args = (
+            (
+                chunk_items,
+                (
+                    cls,
+                    cache_size,
+                    [
+                        statement_id_to_index[id(item)]
+                        for item in chunk_items
+                        if item.__class__ is not str
+                    ],
+                    worker_bel_statements,
+                ),
+            )
+            for chunk_items in cls._iter_item_chunks(items, options.chunk_size)
+        )
+        with executor:
+            for chunk_items, statement_strings in _iter_results_in_order(
+                executor,
+                _render_worker_bel_statements,
+                chunks_and_args,
+                2 * processes,
             ):
-                unset_strings = []
-                bel_statement_annotations = bel_annotations.get(bel_statement)
-                if bel_statement_annotations is not None:
-                    for bel_annotation in bel_statement_annotations:
-                        set_string = cls._bel_annotation_to_string(
-                            bel_annotation, set_or_unset="set"
-                        )
-                        output_strings.append(set_string)
-                        unset_string = cls._bel_annotation_to_string(
-                            bel_annotation, set_or_unset="unset"
-                        )
-                        unset_strings.append(unset_string)
-                output_strings.append(
-                    cls._bel_element_to_string(bel_statement)
-                )
-                for unset_string in unset_strings:
-                    output_strings.append(unset_string)
-        bel_string = "\n".join(output_strings)
+                yield from cls._merge_chunk(chunk_items, statement_strings)
+
+    @classmethod
+    def _iter_item_chunks(cls, items, chunk_size):
+        chunk_items = []
+        n_statements = 0
+        for item in items:
+            chunk_items.append(item)
+            if item.__class__ is not str:
+                n_statements += 1
+                if n_statements == chunk_size:
+                    yield chunk_items
+                    chunk_items = []
+                    n_statements = 0
+        if chunk_items:
+            yield chunk_items
+
+    @classmethod
+    def _merge_chunk(cls, chunk_items, statement_strings):
+        statement_strings = iter(statement_strings)
+        for item in chunk_items:
+            if item.__class__ is str:
+                yield item
+            else:
+                yield next(statement_strings)
+
+    @classmethod
+    def _get_annotation_group_sort_key(cls, annotations, names):
+        # Groups without an annotation come before those with it
+        name_to_annotation = dict(annotations)
+        sort_key = []
+        for name in names:
+            bel_annotation = name_to_annotation.get(name)
+            if bel_annotation is None:
+                sort_key.append(())
+            else:
+                sort_key.append((bel_annotation.args,))
+        return sort_key
+
+    @classmethod
+    def _bel_model_to_string(
+        cls,
+        bel_model,
+        bel_namespace_definitions,
+        bel_annotation_definitions,
+        bel_annotations,
+        options=None,
+    ):
+        if options is None:
+            options = BELWriterOptions()
+        bel_string = "\n".join(
+            cls._bel_model_to_lines(
+                bel_model,
+                bel_namespace_definitions,
+                bel_annotation_definitions,
+                bel_annotations,
+                options,
+            )
+        )
         return bel_string
 
     @classmethod
     def _make_namespace_identifier_arg(cls, namespace, identifier):
-        if not identifier.isalnum():
-            identifier = f'"{identifier}"'
-        if namespace:
-            return f"{namespace}:{identifier}"
-        else:
-            return identifier
+        # Tokens of namespace and identifier pairs are rendered once per
+        # write, by its symbol table
+        symbol_table = _symbol_table.get()
+        if symbol_table is None:
+            return momapy_bel.core._make_token(namespace, identifier)
+        return symbol_table.get_token(namespace, identifier)
 
     @classmethod
     def _make_function_string(cls, function_symbol, args):
@@ -737,7 +1771,9 @@ class BELWriter(momapy.io.Writer):
 
     @classmethod
     def _make_set_or_define_args_string(cls, args):
-        args = [f'"{arg}"' for arg in args]
+        # Values are quoted and escaped as identifiers of terms are, so that
+        # quotes and commas they contain are read back as part of them
+        args = [momapy_bel.core._quote(arg) for arg in args]
         if len(args) > 1:
             args_string = f"{{{', '.join(args)}}}"
         else:
@@ -763,14 +1799,104 @@ class BELWriter(momapy.io.Writer):
         transformation_func = cls._ELEMENT_CLS_TO_FUNC_NAME[key]
         return transformation_func
 
+    @classmethod
+    def _bel_statement_to_string(
+        cls, bel_statement, cache=None, symbol_table=None
+    ):
+        # Statements are rendered without going through the cache, as they
+        # are unique within a model and would only evict shared subterms
+        cache_token = _element_string_cache.set(cache)
+        symbol_table_token = _symbol_table.set(symbol_table)
+        try:
+            bel_string = cls._get_element_renderer(type(bel_statement))(
+                bel_statement
+            )
+        finally:
+            _symbol_table.reset(symbol_table_token)
+            _element_string_cache.reset(cache_token)
+        return bel_string
+
     @classmethod
     def _bel_element_to_string(cls, bel_element):
-        key = type(bel_element)
-        transformation_func_name = cls._get_transformation_func(key)
-        transformation_func = getattr(cls, transformation_func_name)
-        bel_string = transformation_func(bel_element)
+        cache = _element_string_cache.get()
+        if cache is not None:
+            bel_string = cache.get(bel_element)
+            if bel_string is not None:
+                return bel_string
+        renderer = cls._element_cls_to_renderer.get(type(bel_element))
+        if renderer is None:
+            renderer = cls._get_element_renderer(type(bel_element))
+        bel_string = renderer(bel_element)
+        if cache is not None:
+            cache.put(bel_element, bel_string)
         return bel_string
 
+    @classmethod
+    def _get_element_renderer(cls, element_cls):
+        renderer = cls._element_cls_to_renderer.get(element_cls)
+        if renderer is None:
+            renderer = cls._make_element_renderer(element_cls)
+            cls._element_cls_to_renderer[element_cls] = renderer
+        return renderer
+
+    @classmethod
+    def _make_element_renderer(cls, element_cls):
+        # Subclasses of BEL elements are rendered as their closest ancestor
+        # that has a transformation function
+        for ancestor_cls in element_cls.__mro__:
+            transformation_func_name = cls._ELEMENT_CLS_TO_FUNC_NAME.get(
+                ancestor_cls
+            )
+            if transformation_func_name is not None:
+                renderer = cls._make_specialized_renderer(
+                    transformation_func_name
+                )
+                if renderer is None:
+                    renderer = getattr(cls, transformation_func_name)
+                return renderer
+        raise TypeError(
+            f"no transformation function for element of type {element_cls}"
+        )
+
+    @classmethod
+    def _make_specialized_renderer(cls, transformation_func_name):
+        # Renderers are generated from the specs of the transformation
+        # functions of BELWriter, unless the writer class overrides the
+        # transformation function or a function it is made of, in which case
+        # None is returned and the transformation function is used
+        for func_name in [
+            transformation_func_name,
+            "_make_namespace_identifier_arg",
+            "_make_function_string",
+            "_make_relation_string",
+        ]:
+            if (
+                getattr(cls, func_name).__func__
+                is not getattr(BELWriter, func_name).__func__
+            ):
+                return None
+        spec = cls._FUNC_NAME_TO_TERM_SPEC.get(transformation_func_name)
+        if spec is not None:
+            source = _make_term_renderer_source(*spec)
+        else:
+            relation_symbol = cls._FUNC_NAME_TO_RELATION_SYMBOL.get(
+                transformation_func_name
+            )
+            if relation_symbol is None:
+                return None
+            source = _make_relation_renderer_source(relation_symbol)
+        namespace = {
+            "render_element": cls._bel_element_to_string,
+            "get_symbol_table": _symbol_table.get,
+            "make_plain_token": momapy_bel.core._make_token,
+        }
+        exec(source, namespace)
+        # Renderers are named after their transformation function, by which
+        # profiles report them
+        renderer = namespace["render"]
+        renderer.__name__ = renderer.__qualname__ = transformation_func_name
+        return renderer
+
     @classmethod
     def _bel_annotation_to_string(cls, bel_annotation, set_or_unset="set"):
         key = (
@@ -783,4 +1909,1277 @@ class BELWriter(momapy.io.Writer):
         return bel_string
 
 
+@dataclasses.dataclass(kw_only=True)
+class BELReaderResult(momapy.io.ReaderResult):
+    namespace_definitions: tuple[momapy_bel.core.BELNamespaceDefinition] = ()
+    annotation_definitions: tuple[
+        momapy_bel.core.BELGenericAnnotationDefinition
+    ] = ()
+
+
+@dataclasses.dataclass(kw_only=True)
+class BELReadingContext:
+    namespace_definitions: dict[
+        str, momapy_bel.core.BELNamespaceDefinition
+    ] = dataclasses.field(default_factory=dict)
+    annotation_definitions: dict[
+        str, momapy_bel.core.BELGenericAnnotationDefinition
+    ] = dataclasses.field(default_factory=dict)
+    document_fields: dict[str, str] = dataclasses.field(default_factory=dict)
+    annotations: dict[str, momapy_bel.core.BELGenericAnnotation] = (
+        dataclasses.field(default_factory=dict)
+    )
+    # The SET annotations in a tuple, that is shared by all statements read
+    # until the next SET or UNSET
+    _active_annotations: tuple[momapy_bel.core.BELGenericAnnotation] | None = (
+        dataclasses.field(default=None, init=False, repr=False, compare=False)
+    )
+
+    def copy(self):
+        return dataclasses.replace(
+            self,
+            namespace_definitions=dict(self.namespace_definitions),
+            annotation_definitions=dict(self.annotation_definitions),
+            document_fields=dict(self.document_fields),
+            annotations=dict(self.annotations),
+        )
+
+    def set_annotation(self, bel_annotation):
+        self.annotations[bel_annotation.definition.name] = bel_annotation
+        self._active_annotations = None
+
+    def unset_annotation(self, name):
+        if self.annotations.pop(name, None) is not None:
+            self._active_annotations = None
+
+    def unset_all_annotations(self):
+        self.annotations.clear()
+        self._active_annotations = None
+
+    def get_active_annotations(self):
+        if self._active_annotations is None:
+            self._active_annotations = tuple(self.annotations.values())
+        return self._active_annotations
+
+    def get_statement_group(self):
+        bel_annotation = self.annotations.get("STATEMENT_GROUP")
+        if bel_annotation is None:
+            return None
+        return bel_annotation.args[0]
+
+    def get_document_annotation(self):
+        if not self.document_fields:
+            return None
+        return momapy_bel.core.BELDocumentAnnotation(**self.document_fields)
+
+
+# Intermediary values produced while parsing the arguments of a BEL function.
+# Namespace and identifier arguments are symbols of the shared symbol table.
+_BELFunction = collections.namedtuple("_BELFunction", ["name", "args"])
+
+_NO_SYMBOL = momapy_bel.core.BELSymbol(None, None, None)
+
+
+class BELReader(momapy.io.Reader):
+    # Tokens are quoted strings, relation symbols, punctuation, and words;
+    # the tokenizer is a single regular expression applied with findall
+    _TOKEN_REGEX = re.compile(
+        r'\s*("(?:[^"\\]|\\.)*"|->|-\||=>|=\||:>|>>|[(),:]|[^\s(),:"]+)'
+    )
+    # A statement made of a source term, a relation and a target term; the
+    # source ends with the first closing parenthesis followed by a relation
+    # and the name of a function
+    _STATEMENT_REGEX = re.compile(
+        r"(.*?\))\s+(\S+)\s+([^\s()]+\(.*)", re.S
+    )
+    _SET_REGEX = re.compile(r"SET\s+(?:(DOCUMENT)\s+)?(\S+?)\s*=\s*(.*)", re.S)
+    _UNSET_REGEX = re.compile(r"UNSET\s+(.*)", re.S)
+    _DEFINE_REGEX = re.compile(
+        r"DEFINE\s+(NAMESPACE|ANNOTATION)\s+(\S+)\s+AS\s+(URL|LIST|PATTERN)\s+(.*)",
+        re.S,
+    )
+    _VALUE_REGEX = re.compile(r'"((?:[^"\\]|\\.)*)"|([^\s,{}"]+)')
+    _ESCAPE_REGEX = re.compile(r"\\(.)", re.S)
+    _FUNCTION_SYMBOL_TO_FUNC_NAME = {
+        "a": "_make_abundance",
+        "abundance": "_make_abundance",
+        "act": "_make_activity",
+        "activity": "_make_activity",
+        "bp": "_make_biological_process",
+        "biologicalProcess": "_make_biological_process",
+        "complex": "_make_complex_abundance",
+        "complexAbundance": "_make_complex_abundance",
+        "composite": "_make_composite_abundance",
+        "compositeAbundance": "_make_composite_abundance",
+        "deg": "_make_degradation",
+        "degradation": "_make_degradation",
+        "frag": "_make_fragment",
+        "fragment": "_make_fragment",
+        "fromLoc": "_make_function",
+        "fus": "_make_fusion",
+        "fusion": "_make_fusion",
+        "g": "_make_gene_abundance",
+        "geneAbundance": "_make_gene_abundance",
+        "list": "_make_list",
+        "loc": "_make_location",
+        "location": "_make_location",
+        "m": "_make_microrna_abundance",
+        "microRNAAbundance": "_make_microrna_abundance",
+        "ma": "_make_molecular_activity",
+        "molecularActivity": "_make_molecular_activity",
+        "p": "_make_protein_abundance",
+        "proteinAbundance": "_make_protein_abundance",
+        "path": "_make_pathology",
+        "pathology": "_make_pathology",
+        "pmod": "_make_protein_modification",
+        "proteinModification": "_make_protein_modification",
+        "pop": "_make_population_abundance",
+        "populationAbundance": "_make_population_abundance",
+        "products": "_make_function",
+        "r": "_make_rna_abundance",
+        "rnaAbundance": "_make_rna_abundance",
+        "reactants": "_make_function",
+        "rxn": "_make_reaction",
+        "reaction": "_make_reaction",
+        "sec": "_make_cell_secretion",
+        "cellSecretion": "_make_cell_secretion",
+        "surf": "_make_cell_surface_expression",
+        "cellSurfaceExpression": "_make_cell_surface_expression",
+        "tloc": "_make_translocation",
+        "translocation": "_make_translocation",
+        "toLoc": "_make_function",
+        "var": "_make_variant",
+        "variant": "_make_variant",
+    }
+    _RELATION_SYMBOL_TO_ELEMENT_CLS = {
+        "analogous": momapy_bel.core.Analogous,
+        "analogousTo": momapy_bel.core.Analogous,
+        "association": momapy_bel.core.Association,
+        "--": momapy_bel.core.Association,
+        "biomarkerFor": momapy_bel.core.BiomarkerFor,
+        "cnc": momapy_bel.core.CausesNoChange,
+        "causesNoChange": momapy_bel.core.CausesNoChange,
+        "-|": momapy_bel.core.Decreases,
+        "decreases": momapy_bel.core.Decreases,
+        "=|": momapy_bel.core.DirectlyDecreases,
+        "directlyDecreases": momapy_bel.core.DirectlyDecreases,
+        "=>": momapy_bel.core.DirectlyIncreases,
+        "directlyIncreases": momapy_bel.core.DirectlyIncreases,
+        "hasActivity": momapy_bel.core.HasActivity,
+        "hasComponent": momapy_bel.core.HasComponent,
+        "hasComponents": momapy_bel.core.HasComponents,
+        "hasMember": momapy_bel.core.HasMember,
+        "hasMembers": momapy_bel.core.HasMembers,
+        "->": momapy_bel.core.Increases,
+        "increases": momapy_bel.core.Increases,
+        "isA": momapy_bel.core.IsA,
+        "neg": momapy_bel.core.NegativeCorrelation,
+        "negativeCorrelation": momapy_bel.core.NegativeCorrelation,
+        "orthologous": momapy_bel.core.Ortholgous,
+        "pos": momapy_bel.core.PositiveCorrelation,
+        "positiveCorrelation": momapy_bel.core.PositiveCorrelation,
+        "prognosticBiomarkerFor": momapy_bel.core.PrognosticBiomarkerFor,
+        "rateLimitingStepFor": momapy_bel.core.RateLimitingStepFor,
+        "reg": momapy_bel.core.Regulates,
+        "regulates": momapy_bel.core.Regulates,
+        "subProcessOf": momapy_bel.core.SubProcessOf,
+        ":>": momapy_bel.core.TranscribedTo,
+        "transcribedTo": momapy_bel.core.TranscribedTo,
+        ">>": momapy_bel.core.TranslatedTo,
+        "translatedTo": momapy_bel.core.TranslatedTo,
+    }
+    _DOCUMENT_KEY_TO_FIELD_NAME = {
+        "Name": "name",
+        "Authors": "authors",
+        "ContactInfo": "contact_info",
+        "Description": "description",
+        "Licenses": "licenses",
+        "License": "licenses",
+        "Copyright": "copyright",
+        "Version": "version",
+    }
+    # Function symbol -> parser, filled in lazily by _get_function_parser
+    _function_symbol_to_parser = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._function_symbol_to_parser = {}
+
+    @classmethod
+    def check_file(cls, file_path: str | os.PathLike):
+        compression = _get_compression(file_path)
+        if compression is not None:
+            file_path_ = os.fspath(file_path)[: -len(compression)]
+        else:
+            file_path_ = os.fspath(file_path)
+        if file_path_.endswith(".bel"):
+            return True
+        try:
+            with _open_text_file(file_path, "r", "utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        return line.startswith(("SET ", "DEFINE "))
+        except (OSError, EOFError, UnicodeDecodeError, lzma.LZMAError):
+            return False
+        return False
+
+    @classmethod
+    def read(
+        cls,
+        file_path: str | os.PathLike,
+        with_annotations=True,
+        encoding="utf-8",
+        processes: int | None = None,
+        chunk_size: int = 20000,
+        **options,
+    ) -> BELReaderResult:
+        _check_reader_options(options)
+        context = BELReadingContext()
+        statements = set()
+        statement_to_annotations = {}
+        if processes is not None and processes > 1:
+            for statements_and_annotations in cls._iter_chunk_results(
+                file_path, context, encoding, processes, chunk_size
+            ):
+                cls._add_statements_and_annotations(
+                    statements_and_annotations,
+                    statements,
+                    statement_to_annotations,
+                    with_annotations,
+                )
+        else:
+            cls._add_statements_and_annotations(
+                cls.iter_statements(
+                    file_path,
+                    context=context,
+                    encoding=encoding,
+                    term_memo_size=None,
+                ),
+                statements,
+                statement_to_annotations,
+                with_annotations,
+            )
+        bel_model = momapy_bel.core.BELModel(statements=frozenset(statements))
+        element_to_annotations = {
+            statement: tuple(bel_annotations)
+            for statement, bel_annotations in statement_to_annotations.items()
+        }
+        document_annotation = context.get_document_annotation()
+        if with_annotations and document_annotation is not None:
+            element_to_annotations[bel_model] = (document_annotation,)
+        return BELReaderResult(
+            obj=bel_model,
+            element_to_annotations=frozendict.frozendict(
+                element_to_annotations
+            ),
+            namespace_definitions=tuple(
+                context.namespace_definitions.values()
+            ),
+            annotation_definitions=tuple(
+                context.annotation_definitions.values()
+            ),
+            file_path=file_path,
+        )
+
+    @classmethod
+    def _add_statements_and_annotations(
+        cls,
+        statements_and_annotations,
+        statements,
+        statement_to_annotations,
+        with_annotations=True,
+    ):
+        for statement, bel_annotations in statements_and_annotations:
+            statements.add(statement)
+            if with_annotations and bel_annotations:
+                statement_annotations = statement_to_annotations.setdefault(
+                    statement, []
+                )
+                for bel_annotation in bel_annotations:
+                    if bel_annotation not in statement_annotations:
+                        statement_annotations.append(bel_annotation)
+
+    @classmethod
+    def _iter_chunk_results(
+        cls, file_path, context, encoding, processes, chunk_size
+    ):
+        # Chunks are parsed in a process pool and their results are yielded
+        # in file order, with at most two chunks per process in flight
+        import concurrent.futures
+
+        with _open_text_file(file_path, "r", encoding) as f:
+            chunks_and_args = (
+                (None, (cls, chunk_lines, chunk_context, file_path))
+                for chunk_context, chunk_lines in cls._iter_chunks(
+                    f, context, chunk_size
+                )
+            )
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=processes
+            ) as executor:
+                for _, statements_and_annotations in _iter_results_in_order(
+                    executor, _read_bel_chunk, chunks_and_args, 2 * processes
+                ):
+                    yield statements_and_annotations
+
+    @classmethod
+    def _iter_chunks(cls, lines, context, chunk_size):
+        # Splits the logical lines at statement boundaries into chunks of
+        # chunk_size statements. Each chunk comes with a copy of the context
+        # that was active at its first line, and its control lines are also
+        # applied to the given context so that it is up to date for the next
+        # chunk and ends up holding the context of the whole document.
+        chunk_context = context.copy()
+        chunk_lines = []
+        n_statements = 0
+        for line_number, line in cls._iter_logical_lines(lines):
+            chunk_lines.append((line_number, line))
+            if line.startswith(("SET", "UNSET", "DEFINE")):
+                cls._read_control_line(line, context)
+            else:
+                n_statements += 1
+                if n_statements == chunk_size:
+                    yield chunk_context, chunk_lines
+                    chunk_context = context.copy()
+                    chunk_lines = []
+                    n_statements = 0
+        if chunk_lines:
+            yield chunk_context, chunk_lines
+
+    @classmethod
+    def iter_statements(
+        cls,
+        file_path: str | os.PathLike | typing.IO,
+        context: "BELReadingContext | None" = None,
+        encoding="utf-8",
+        term_memo_size: int | None = 65536,
+    ) -> typing.Iterator[
+        tuple[
+            momapy_bel.core.BELModelElement,
+            tuple[momapy_bel.core.BELGenericAnnotation],
+        ]
+    ]:
+        if hasattr(file_path, "read"):
+            yield from cls._iter_statements_from_logical_lines(
+                cls._iter_logical_lines(file_path),
+                context,
+                file_path,
+                term_memo_size,
+            )
+        else:
+            with _open_text_file(file_path, "r", encoding) as f:
+                yield from cls._iter_statements_from_logical_lines(
+                    cls._iter_logical_lines(f),
+                    context,
+                    file_path,
+                    term_memo_size,
+                )
+
+    @classmethod
+    def _iter_statements_from_logical_lines(
+        cls, logical_lines, context=None, source=None, term_memo_size=None
+    ):
+        if context is None:
+            context = BELReadingContext()
+        term_memo = {}
+        symbol_table = momapy_bel.core.BELSymbolTable(maxsize=term_memo_size)
+        for line_number, line in logical_lines:
+            try:
+                if line.startswith(("SET", "UNSET", "DEFINE")):
+                    cls._read_control_line(line, context)
+                else:
+                    # The memo is dropped when it is full, so that memory
+                    # does not grow with the number of distinct terms
+                    if (
+                        term_memo_size is not None
+                        and len(term_memo) >= term_memo_size
+                    ):
+                        term_memo = {}
+                    # The symbol table is only set while the statement is
+                    # parsed, as the cache of the writer is
+                    token = _symbol_table.set(symbol_table)
+                    try:
+                        statement = cls._parse_statement(line, term_memo)
+                    finally:
+                        _symbol_table.reset(token)
+                    yield statement, context.get_active_annotations()
+            except (ValueError, IndexError) as e:
+                raise ValueError(
+                    f"could not parse line {line_number} of {source}: {e}"
+                ) from e
+
+    @classmethod
+    def _read_control_line(cls, line, context):
+        if line.startswith("SET"):
+            cls._read_set_line(line, context)
+        elif line.startswith("UNSET"):
+            cls._read_unset_line(line, context)
+        else:
+            cls._read_define_line(line, context)
+
+    @classmethod
+    def _iter_logical_lines(cls, lines):
+        # Joins lines continued with a trailing backslash, as well as lines
+        # that end inside a quoted string, and skips comments and blank lines.
+        # Each line is scanned once, from the quoting state at its start.
+        logical_line = None
+        start_line_number = None
+        is_quoted = False
+        for line_number, line in enumerate(lines, 1):
+            line = line.rstrip("\r\n")
+            if logical_line is None:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                start_line_number = line_number
+                logical_line = line
+            else:
+                logical_line = f"{logical_line}{line}"
+            is_quoted, is_escaping = cls._scan_quotes(line, is_quoted)
+            if is_escaping or not is_quoted and line.endswith("\\"):
+                logical_line = logical_line[:-1]
+                continue
+            if is_quoted:
+                logical_line = f"{logical_line}\n"
+                continue
+            yield start_line_number, logical_line.strip()
+            logical_line = None
+        if logical_line is not None:
+            yield start_line_number, logical_line.strip()
+
+    @classmethod
+    def _unquote(cls, token):
+        if token.startswith('"'):
+            token = token[1:-1]
+            if "\\" in token:
+                token = cls._ESCAPE_REGEX.sub(r"\1", token)
+        return token
+
+    @classmethod
+    def _parse_values(cls, values_string):
+        return tuple(
+            cls._ESCAPE_REGEX.sub(r"\1", quoted) if quoted else unquoted
+            for quoted, unquoted in cls._VALUE_REGEX.findall(values_string)
+        )
+
+    @classmethod
+    def _read_set_line(cls, line, context):
+        match = cls._SET_REGEX.fullmatch(line)
+        if match is None:
+            raise ValueError(f"malformed SET {line!r}")
+        is_document, name, values_string = match.groups()
+        args = cls._parse_values(values_string)
+        if not args:
+            raise ValueError(f"no value for {name} in SET")
+        if is_document:
+            field_name = cls._DOCUMENT_KEY_TO_FIELD_NAME.get(name)
+            if field_name is not None:
+                context.document_fields[field_name] = ", ".join(args)
+        else:
+            definition = context.annotation_definitions.get(name)
+            if definition is None:
+                definition = momapy_bel.core.BELGenericAnnotationDefinition(
+                    name=name, as_=None
+                )
+            context.set_annotation(
+                momapy_bel.core.BELGenericAnnotation(
+                    definition=definition, args=args
+                )
+            )
+
+    @classmethod
+    def _read_unset_line(cls, line, context):
+        match = cls._UNSET_REGEX.fullmatch(line)
+        if match is None:
+            raise ValueError(f"malformed UNSET {line!r}")
+        names = cls._parse_values(match.group(1))
+        if not names:
+            raise ValueError("no annotation name in UNSET")
+        for name in names:
+            if name == "ALL":
+                context.unset_all_annotations()
+            else:
+                context.unset_annotation(name)
+
+    @classmethod
+    def _read_define_line(cls, line, context):
+        match = cls._DEFINE_REGEX.fullmatch(line)
+        if match is None:
+            raise ValueError(f"malformed DEFINE {line!r}")
+        define_type, name, as_type, values_string = match.groups()
+        values = cls._parse_values(values_string)
+        if as_type == "LIST":
+            if not values:
+                raise ValueError(f"no value for {name} in DEFINE")
+            as_ = values
+        else:
+            if len(values) != 1:
+                raise ValueError(
+                    f"{as_type} of {name} in DEFINE takes one value, "
+                    f"got {len(values)}"
+                )
+            as_ = values[0]
+        if define_type == "NAMESPACE":
+            context.namespace_definitions[name] = (
+                momapy_bel.core.BELNamespaceDefinition(name=name, as_=as_)
+            )
+        else:
+            context.annotation_definitions[name] = (
+                momapy_bel.core.BELGenericAnnotationDefinition(
+                    name=name, as_=as_
+                )
+            )
+
+    @classmethod
+    def _parse_statement(cls, statement_string, term_memo=None):
+        if term_memo is None:
+            term_memo = {}
+        # Fast path: most statements are made of two terms separated by a
+        # relation, which can be split without tokenizing, so that terms
+        # already seen are found in the memo from their text alone
+        match = cls._STATEMENT_REGEX.fullmatch(statement_string)
+        if match is not None:
+            source_string, relation_symbol, target_string = match.groups()
+            relation_cls = cls._RELATION_SYMBOL_TO_ELEMENT_CLS.get(
+                relation_symbol
+            )
+            if relation_cls is not None and cls._has_balanced_quotes(
+                source_string
+            ):
+                try:
+                    source = cls._parse_term_string(source_string, term_memo)
+                    target = cls._parse_term_string(target_string, term_memo)
+                except (ValueError, IndexError):
+                    pass
+                else:
+                    return relation_cls(source=source, target=target)
+        elif statement_string in term_memo:
+            return term_memo[statement_string]
+        tokens = cls._TOKEN_REGEX.findall(statement_string)
+        statement, position = cls._parse_statement_tokens(tokens, 0)
+        if position != len(tokens):
+            raise ValueError(f"unexpected token {tokens[position]!r}")
+        return statement
+
+    @classmethod
+    def _has_balanced_quotes(cls, string):
+        return not cls._scan_quotes(string)[0]
+
+    @classmethod
+    def _scan_quotes(cls, string, is_quoted=False):
+        # Returns whether the string ends inside a quoted string, and whether
+        # it ends with a backslash escaping the character that follows it.
+        # Backslashes only escape characters inside quoted strings, as in
+        # tokens, so that a value ending with an escaped backslash closes its
+        # quoted string.
+        if "\\" not in string:
+            return is_quoted != string.count('"') % 2, False
+        is_escaping = False
+        for character in string:
+            if is_escaping:
+                is_escaping = False
+            elif character == '"':
+                is_quoted = not is_quoted
+            elif character == "\\" and is_quoted:
+                is_escaping = True
+        return is_quoted, is_escaping
+
+    @classmethod
+    def _parse_term_string(cls, term_string, term_memo):
+        # Terms are memoized on their text, so that a term that occurs in
+        # many statements is only built once and is shared by all of them
+        term = term_memo.get(term_string)
+        if term is None:
+            tokens = cls._TOKEN_REGEX.findall(term_string)
+            term, position = cls._parse_function(tokens, 0)
+            if position != len(tokens):
+                raise ValueError(f"unexpected token {tokens[position]!r}")
+            cls._check_term(term)
+            term_memo[term_string] = term
+        return term
+
+    @classmethod
+    def _check_term(cls, term):
+        # Functions that are only arguments of other functions, such as
+        # reactants(), cannot be terms on their own
+        if not isinstance(term, momapy_bel.core.BELModelElement):
+            if isinstance(term, _BELFunction):
+                raise ValueError(f"{term.name}() is not a term")
+            raise ValueError(f"{term!r} is not a term")
+
+    @classmethod
+    def _parse_statement_tokens(cls, tokens, position):
+        source, position = cls._parse_function(tokens, position)
+        cls._check_term(source)
+        if position == len(tokens) or tokens[position] == ")":
+            return source, position
+        relation_symbol = tokens[position]
+        relation_cls = cls._RELATION_SYMBOL_TO_ELEMENT_CLS.get(relation_symbol)
+        if relation_cls is None:
+            raise ValueError(f"unknown relation {relation_symbol!r}")
+        position += 1
+        if position == len(tokens):
+            raise ValueError(f"no target after {relation_symbol!r}")
+        if tokens[position] == "(":
+            target, position = cls._parse_statement_tokens(
+                tokens, position + 1
+            )
+            if tokens[position] != ")":
+                raise ValueError(f"unexpected token {tokens[position]!r}")
+            position += 1
+        else:
+            target, position = cls._parse_function(tokens, position)
+            cls._check_term(target)
+        return relation_cls(source=source, target=target), position
+
+    @classmethod
+    def _parse_function(cls, tokens, position):
+        function_symbol = tokens[position]
+        if tokens[position + 1] != "(":
+            raise ValueError(f"expected '(' after {function_symbol!r}")
+        position += 2
+        args = []
+        if tokens[position] == ")":
+            position += 1
+        else:
+            while True:
+                arg, position = cls._parse_arg(tokens, position)
+                args.append(arg)
+                token = tokens[position]
+                position += 1
+                if token == ")":
+                    break
+                if token != ",":
+                    raise ValueError(f"unexpected token {token!r}")
+        parser = cls._function_symbol_to_parser.get(function_symbol)
+        if parser is None:
+            parser = cls._get_function_parser(function_symbol)
+        return parser(function_symbol, args), position
+
+    @classmethod
+    def _parse_arg(cls, tokens, position):
+        token = tokens[position]
+        next_token = tokens[position + 1]
+        if next_token == "(":
+            return cls._parse_function(tokens, position)
+        if next_token == ":":
+            namespace = cls._unquote(token)
+            identifier = cls._unquote(tokens[position + 2])
+            position += 3
+            while tokens[position] == ":":
+                identifier = (
+                    f"{identifier}:{cls._unquote(tokens[position + 1])}"
+                )
+                position += 2
+            return cls._get_symbol(namespace, identifier), position
+        return cls._get_symbol("", cls._unquote(token)), position + 1
+
+    @classmethod
+    def _get_symbol(cls, namespace, identifier):
+        # Symbols are shared through the symbol table of the read, if any
+        symbol_table = _symbol_table.get()
+        if symbol_table is None:
+            return momapy_bel.core.BELSymbol(
+                namespace,
+                identifier,
+                momapy_bel.core._make_token(namespace, identifier),
+            )
+        return symbol_table.get_symbol(namespace, identifier)
+
+    @classmethod
+    def _get_function_parser(cls, function_symbol):
+        parser = cls._function_symbol_to_parser.get(function_symbol)
+        if parser is None:
+            func_name = cls._FUNCTION_SYMBOL_TO_FUNC_NAME.get(function_symbol)
+            if func_name is None:
+                raise ValueError(f"unknown function {function_symbol!r}")
+            parser = getattr(cls, func_name)
+            cls._function_symbol_to_parser[function_symbol] = parser
+        return parser
+
+    @classmethod
+    def _check_args(cls, function_symbol, args, arg_types):
+        for arg in args:
+            if not isinstance(arg, arg_types):
+                raise ValueError(
+                    f"unsupported argument {arg!r} in {function_symbol}()"
+                )
+
+    @classmethod
+    def _check_n_args(cls, function_symbol, args, min_n_args, max_n_args=None):
+        n_args = len(args)
+        if n_args >= min_n_args and (max_n_args is None or n_args <= max_n_args):
+            return
+        if max_n_args is None:
+            expected = f"at least {min_n_args}"
+        elif max_n_args == min_n_args:
+            expected = str(min_n_args)
+        else:
+            expected = f"{min_n_args} to {max_n_args}"
+        raise ValueError(
+            f"{function_symbol}() takes {expected} arguments, got {n_args}"
+        )
+
+    @classmethod
+    def _get_arg(cls, function_symbol, args, arg_type, default=None):
+        # Arguments that the element has a single field for may only be
+        # given once, rather than the first one being kept
+        found_arg = default
+        is_found = False
+        for arg in args:
+            if isinstance(arg, arg_type):
+                if is_found:
+                    raise ValueError(
+                        f"several {arg_type.__name__} arguments in "
+                        f"{function_symbol}()"
+                    )
+                found_arg = arg
+                is_found = True
+        return found_arg
+
+    @classmethod
+    def _get_namespace_identifier_fields(cls, function_symbol, arg):
+        if isinstance(arg, momapy_bel.core.Fusion):
+            return {"namespace": None, "identifier": None, "fusion": arg}
+        cls._check_args(function_symbol, [arg], momapy_bel.core.BELSymbol)
+        return {
+            "namespace": arg.namespace,
+            "identifier": arg.identifier,
+            "fusion": None,
+        }
+
+    @classmethod
+    def _make_function(cls, function_symbol, args):
+        return _BELFunction(function_symbol, args)
+
+    @classmethod
+    def _make_list(cls, function_symbol, args):
+        cls._check_args(
+            function_symbol, args, momapy_bel.core.BELModelElement
+        )
+        return momapy_bel.core.List(elements=tuple(args))
+
+    @classmethod
+    def _make_location(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 1)
+        cls._check_args(function_symbol, args, momapy_bel.core.BELSymbol)
+        return momapy_bel.core.Location(
+            namespace=args[0].namespace, identifier=args[0].identifier
+        )
+
+    @classmethod
+    def _make_abundance(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 2)
+        cls._check_args(function_symbol, args[:1], momapy_bel.core.BELSymbol)
+        cls._check_args(
+            function_symbol, args[1:], momapy_bel.core.Location
+        )
+        return momapy_bel.core.Abundance(
+            namespace=args[0].namespace,
+            identifier=args[0].identifier,
+            location=cls._get_arg(
+                function_symbol, args, momapy_bel.core.Location
+            ),
+        )
+
+    @classmethod
+    def _make_molecular_activity(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 1)
+        cls._check_args(function_symbol, args, momapy_bel.core.BELSymbol)
+        return momapy_bel.core.MolecularActivity(
+            namespace=args[0].namespace, identifier=args[0].identifier
+        )
+
+    @classmethod
+    def _make_activity(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 2)
+        cls._check_args(
+            function_symbol, args[:1], momapy_bel.core.BELModelElement
+        )
+        cls._check_args(
+            function_symbol,
+            args[1:],
+            momapy_bel.core.MolecularActivity,
+        )
+        return momapy_bel.core.Activity(
+            abundance=args[0],
+            molecular_activity=cls._get_arg(
+                function_symbol, args, momapy_bel.core.MolecularActivity
+            ),
+        )
+
+    @classmethod
+    def _make_biological_process(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 1)
+        cls._check_args(function_symbol, args, momapy_bel.core.BELSymbol)
+        return momapy_bel.core.BiologicalProcess(
+            namespace=args[0].namespace, identifier=args[0].identifier
+        )
+
+    @classmethod
+    def _make_cell_secretion(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 1)
+        cls._check_args(
+            function_symbol, args, momapy_bel.core.BELModelElement
+        )
+        return momapy_bel.core.CellSecretion(abundance=args[0])
+
+    @classmethod
+    def _make_cell_surface_expression(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 1)
+        cls._check_args(
+            function_symbol, args, momapy_bel.core.BELModelElement
+        )
+        return momapy_bel.core.CellSurfaceExpression(abundance=args[0])
+
+    @classmethod
+    def _make_complex_abundance(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1)
+        cls._check_args(
+            function_symbol,
+            args,
+            (
+                momapy_bel.core.BELSymbol,
+                momapy_bel.core.Abundance,
+                momapy_bel.core.Location,
+            ),
+        )
+        namespace_identifier = cls._get_arg(
+            function_symbol, args, momapy_bel.core.BELSymbol, _NO_SYMBOL
+        )
+        return momapy_bel.core.ComplexAbundance(
+            namespace=namespace_identifier.namespace,
+            identifier=namespace_identifier.identifier,
+            members=frozenset(
+                arg for arg in args if isinstance(arg, momapy_bel.core.Abundance)
+            ),
+            location=cls._get_arg(
+                function_symbol, args, momapy_bel.core.Location
+            ),
+        )
+
+    @classmethod
+    def _make_composite_abundance(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1)
+        cls._check_args(
+            function_symbol,
+            args,
+            (momapy_bel.core.BELSymbol, momapy_bel.core.Abundance),
+        )
+        namespace_identifier = cls._get_arg(
+            function_symbol, args, momapy_bel.core.BELSymbol, _NO_SYMBOL
+        )
+        return momapy_bel.core.CompositeAbundance(
+            namespace=namespace_identifier.namespace,
+            identifier=namespace_identifier.identifier,
+            members=frozenset(
+                arg for arg in args if isinstance(arg, momapy_bel.core.Abundance)
+            ),
+        )
+
+    @classmethod
+    def _make_degradation(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 1)
+        cls._check_args(
+            function_symbol, args, momapy_bel.core.BELModelElement
+        )
+        return momapy_bel.core.Degradation(abundance=args[0])
+
+    @classmethod
+    def _make_fragment(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 2)
+        cls._check_args(function_symbol, args, momapy_bel.core.BELSymbol)
+        return momapy_bel.core.Fragment(
+            start_stop=args[0].identifier,
+            descriptor=args[1].identifier if len(args) > 1 else None,
+        )
+
+    @classmethod
+    def _make_fusion(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 4, 4)
+        cls._check_args(function_symbol, args, momapy_bel.core.BELSymbol)
+        return momapy_bel.core.Fusion(
+            namespace5=args[0].namespace,
+            identifier5=args[0].identifier,
+            range5=args[1].identifier,
+            namespace3=args[2].namespace,
+            identifier3=args[2].identifier,
+            range3=args[3].identifier,
+        )
+
+    @classmethod
+    def _make_variant(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 1)
+        cls._check_args(function_symbol, args, momapy_bel.core.BELSymbol)
+        return momapy_bel.core.Variant(descriptor=args[0].identifier)
+
+    @classmethod
+    def _make_nucleic_acid_abundance(cls, element_cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 3)
+        cls._check_args(
+            function_symbol,
+            args[1:],
+            (momapy_bel.core.Location, momapy_bel.core.Variant),
+        )
+        return element_cls(
+            **cls._get_namespace_identifier_fields(function_symbol, args[0]),
+            location=cls._get_arg(
+                function_symbol, args, momapy_bel.core.Location
+            ),
+            variant=cls._get_arg(
+                function_symbol, args[1:], momapy_bel.core.Variant
+            ),
+        )
+
+    @classmethod
+    def _make_gene_abundance(cls, function_symbol, args):
+        return cls._make_nucleic_acid_abundance(
+            momapy_bel.core.GeneAbundance, function_symbol, args
+        )
+
+    @classmethod
+    def _make_microrna_abundance(cls, function_symbol, args):
+        return cls._make_nucleic_acid_abundance(
+            momapy_bel.core.MicroRNAAbundance, function_symbol, args
+        )
+
+    @classmethod
+    def _make_rna_abundance(cls, function_symbol, args):
+        return cls._make_nucleic_acid_abundance(
+            momapy_bel.core.RNAAbundance, function_symbol, args
+        )
+
+    @classmethod
+    def _make_pathology(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 1)
+        cls._check_args(function_symbol, args, momapy_bel.core.BELSymbol)
+        return momapy_bel.core.Pathology(
+            namespace=args[0].namespace, identifier=args[0].identifier
+        )
+
+    @classmethod
+    def _make_population_abundance(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 2)
+        cls._check_args(function_symbol, args[:1], momapy_bel.core.BELSymbol)
+        cls._check_args(
+            function_symbol, args[1:], momapy_bel.core.Location
+        )
+        return momapy_bel.core.PopulationAbundance(
+            namespace=args[0].namespace,
+            identifier=args[0].identifier,
+            location=cls._get_arg(
+                function_symbol, args, momapy_bel.core.Location
+            ),
+        )
+
+    @classmethod
+    def _make_protein_modification(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1, 3)
+        cls._check_args(function_symbol, args, momapy_bel.core.BELSymbol)
+        return momapy_bel.core.ProteinModification(
+            namespace=args[0].namespace,
+            identifier=args[0].identifier,
+            amino_acid=args[1].identifier if len(args) > 1 else None,
+            residue=args[2].identifier if len(args) > 2 else None,
+        )
+
+    @classmethod
+    def _make_protein_abundance(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 1)
+        cls._check_args(
+            function_symbol,
+            args[1:],
+            (
+                momapy_bel.core.Location,
+                momapy_bel.core.ProteinModification,
+                momapy_bel.core.Variant,
+            ),
+        )
+        return momapy_bel.core.ProteinAbundance(
+            **cls._get_namespace_identifier_fields(function_symbol, args[0]),
+            location=cls._get_arg(
+                function_symbol, args, momapy_bel.core.Location
+            ),
+            variant=cls._get_arg(
+                function_symbol, args[1:], momapy_bel.core.Variant
+            ),
+            modifications=tuple(
+                arg
+                for arg in args
+                if isinstance(arg, momapy_bel.core.ProteinModification)
+            ),
+        )
+
+    @classmethod
+    def _make_reaction(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 2, 2)
+        cls._check_args(function_symbol, args, _BELFunction)
+        name_to_members = {}
+        for arg in args:
+            if arg.name not in ("reactants", "products"):
+                raise ValueError(
+                    f"unsupported argument {arg.name}() in {function_symbol}()"
+                )
+            if arg.name in name_to_members:
+                raise ValueError(
+                    f"several {arg.name}() arguments in {function_symbol}()"
+                )
+            cls._check_args(arg.name, arg.args, momapy_bel.core.BELModelElement)
+            name_to_members[arg.name] = frozenset(arg.args)
+        return momapy_bel.core.Reaction(
+            reactants=name_to_members["reactants"],
+            products=name_to_members["products"],
+        )
+
+    @classmethod
+    def _make_translocation(cls, function_symbol, args):
+        cls._check_n_args(function_symbol, args, 3, 3)
+        cls._check_args(
+            function_symbol, args[:1], momapy_bel.core.BELModelElement
+        )
+        # The locations are given either as fromLoc() and toLoc(), or
+        # directly as namespace:identifier pairs
+        location_args = []
+        for arg, location_function_symbol in zip(
+            args[1:], ("fromLoc", "toLoc")
+        ):
+            if isinstance(arg, _BELFunction):
+                if arg.name != location_function_symbol:
+                    raise ValueError(
+                        f"unsupported argument {arg.name}() in "
+                        f"{function_symbol}()"
+                    )
+                cls._check_n_args(arg.name, arg.args, 1, 1)
+                arg = arg.args[0]
+            location_args.append(arg)
+        cls._check_args(
+            function_symbol, location_args, momapy_bel.core.BELSymbol
+        )
+        from_arg, to_arg = location_args
+        return momapy_bel.core.Translocation(
+            abundance=args[0],
+            from_namespace=from_arg.namespace,
+            from_identifier=from_arg.identifier,
+            to_namespace=to_arg.namespace,
+            to_identifier=to_arg.identifier,
+        )
+
+
+def _make_writer_options(options, kwargs):
+    if options is None:
+        return BELWriterOptions(**kwargs)
+    if kwargs:
+        return dataclasses.replace(options, **kwargs)
+    return options
+
+
+# Options that momapy.io.read passes to every reader. BEL models have no
+# layout nor notes, hence these options are accepted but have no effect,
+# except for layouts being requested.
+_MOMAPY_READER_OPTIONS = frozenset(
+    ["return_type", "with_model", "with_layout", "with_notes"]
+)
+
+
+def _check_reader_options(options):
+    for option in options:
+        if option not in _MOMAPY_READER_OPTIONS:
+            raise TypeError(
+                f"read() got an unexpected keyword argument {option!r}"
+            )
+    if options.get("return_type") == "layout":
+        raise NotImplementedError("BEL files have no layout")
+
+
+def _make_profiled_writer_cls(writer_cls, profile):
+    # A subclass gets its own renderer table, whose renderers are wrapped to
+    # record their calls into the profile. Phases are timed by overriding
+    # the methods that perform them; generators are consumed at once so
+    # that their time is not spread over the rest of the write.
+    class ProfiledWriter(writer_cls):
+        @classmethod
+        def _make_element_renderer(cls, element_cls):
+            return profile._wrap_renderer(
+                super()._make_element_renderer(element_cls)
+            )
+
+        @classmethod
+        def _get_output_statements(cls, bel_model, options):
+            start = time.perf_counter()
+            bel_statements = list(
+                super()._get_output_statements(bel_model, options)
+            )
+            profile.phase_times["filter"] += time.perf_counter() - start
+            return bel_statements
+
+        @classmethod
+        def _sort_statements(cls, bel_statements, block_cache=None):
+            start = time.perf_counter()
+            bel_statements = super()._sort_statements(
+                bel_statements, block_cache
+            )
+            profile.phase_times["sort"] += time.perf_counter() - start
+            return bel_statements
+
+        @classmethod
+        def _bel_annotation_to_string(cls, bel_annotation, set_or_unset="set"):
+            start = time.perf_counter()
+            bel_string = super()._bel_annotation_to_string(
+                bel_annotation, set_or_unset
+            )
+            profile.phase_times["annotations"] += time.perf_counter() - start
+            return bel_string
+
+        @classmethod
+        def _write_buffer(cls, stream, buffer, is_binary, encoding):
+            start = time.perf_counter()
+            super()._write_buffer(stream, buffer, is_binary, encoding)
+            profile.phase_times["io"] += time.perf_counter() - start
+
+    ProfiledWriter.__name__ = ProfiledWriter.__qualname__ = (
+        f"Profiled{writer_cls.__name__}"
+    )
+    return ProfiledWriter
+
+
+_COMPRESSION_TO_OPEN_FUNC = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+
+
+def _get_compression(file_path):
+    for compression in _COMPRESSION_TO_OPEN_FUNC:
+        if os.fspath(file_path).endswith(compression):
+            return compression
+    return None
+
+
+def _open_text_file(file_path, mode, encoding):
+    compression = _get_compression(file_path)
+    if compression is None:
+        return open(file_path, mode, encoding=encoding)
+    return _COMPRESSION_TO_OPEN_FUNC[compression](
+        file_path, f"{mode}t", encoding=encoding
+    )
+
+
+class _ParallelGzipFile(io.BufferedIOBase):
+    # Written data is cut into blocks of block_size bytes, that are
+    # compressed in a thread pool as independent gzip members, and written
+    # in order. A file made of several members is a valid gzip file, read
+    # back as their concatenation. Compression releases the GIL, and at
+    # most two blocks per thread are in flight.
+    def __init__(
+        self, file_path, threads, block_size=1 << 20, compresslevel=9
+    ):
+        import concurrent.futures
+
+        self._file = open(file_path, "wb")
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=threads
+        )
+        self._threads = threads
+        self._block_size = block_size
+        self._compresslevel = compresslevel
+        self._block = bytearray()
+        self._futures = collections.deque()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._block += data
+        if len(self._block) >= self._block_size:
+            self._submit_block()
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._block:
+                self._submit_block()
+            while self._futures:
+                self._file.write(self._futures.popleft().result())
+        finally:
+            self._executor.shutdown()
+            self._file.close()
+            super().close()
+
+    def _submit_block(self):
+        self._futures.append(
+            self._executor.submit(
+                gzip.compress, bytes(self._block), self._compresslevel
+            )
+        )
+        self._block = bytearray()
+        if len(self._futures) >= 2 * self._threads:
+            self._file.write(self._futures.popleft().result())
+
+
+def _is_gil_enabled():
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled is None:
+        return True
+    return is_gil_enabled()
+
+
+def _iter_results_in_order(executor, func, keys_and_args, max_n_pending):
+    # Calls func with each tuple of args in the executor, and yields the
+    # key given with the args and the result of the call, in order. At most
+    # max_n_pending calls are in flight, so that results are not produced
+    # much faster than they are consumed.
+    futures = collections.deque()
+    for key, args in keys_and_args:
+        futures.append((key, executor.submit(func, *args)))
+        if len(futures) >= max_n_pending:
+            key, future = futures.popleft()
+            yield key, future.result()
+    while futures:
+        key, future = futures.popleft()
+        yield key, future.result()
+
+
+# The statements being written, in the processes of a parallel write
+_worker_bel_statements = None
+
+
+def _set_worker_bel_statements(*args):
+    global _worker_bel_statements
+    if len(args) == 1:
+        _worker_bel_statements = args[0]
+    else:
+        _worker_bel_statements = momapy_bel.core._unflatten_elements(*args)
+
+
+def _render_worker_bel_statements(
+    writer_cls, cache_size, indices, bel_statements=None
+):
+    if cache_size:
+        cache = BELElementStringCache(maxsize=cache_size)
+    else:
+        cache = None
+    if bel_statements is None:
+        bel_statements = _worker_bel_statements
+    symbol_table = momapy_bel.core.BELSymbolTable()
+    return [
+        writer_cls._bel_statement_to_string(
+            bel_statements[index], cache, symbol_table
+        )
+        for index in indices
+    ]
+
+
+def _read_bel_chunk(reader_cls, chunk_lines, context, source):
+    return list(
+        reader_cls._iter_statements_from_logical_lines(
+            chunk_lines, context, source
+        )
+    )
+
+
 momapy.io.register_writer("bel", BELWriter)
+momapy.io.register_reader("bel", BELReader)
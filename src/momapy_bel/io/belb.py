@@ -0,0 +1,822 @@
+import array
+import collections.abc
+import dataclasses
+import itertools
+import mmap
+import operator
+import os
+import sys
+import typing
+
+import frozendict
+
+import momapy.io
+import momapy_bel.core
+import momapy_bel.io.bel
+
+# A BELB file is the magic number, followed by integer arrays and a string
+# blob, each prefixed by its number of items as a little-endian unsigned
+# 64-bit integer and padded to a multiple of 8 bytes. Arrays hold
+# little-endian signed integers, of 64 bits for offsets and of 32 bits
+# otherwise. The string blob is the UTF-8 encoding of all strings of the
+# string table concatenated, and the string offsets array gives the byte
+# offsets of their starts and of the end of the last one. Classes are
+# strings of the string table made of the name of a class of
+# momapy_bel.core followed by the names of its encoded fields, separated by
+# spaces. Objects are stored in the object table in an order such that an
+# object only refers to objects that come before it, each as the id of its
+# class followed by the encoding of its fields, and starting at its offset
+# in the object offsets array. Offsets make strings and objects readable
+# one by one, from a memory-mapped file. The magic number is the signature
+# followed by the version of the format, as a big-endian 16-bit integer.
+_SIGNATURE = b"BELB"
+_VERSION = 2
+_MAGIC = _SIGNATURE + _VERSION.to_bytes(2, "big")
+_SECTION_TO_TYPECODE = {
+    "string_offsets": "q",
+    "classes": "i",
+    "object_offsets": "q",
+    "objects": "i",
+    "statements": "i",
+    "namespace_definitions": "i",
+    "annotation_definitions": "i",
+    "annotation_tuples": "i",
+    "annotations": "i",
+}
+# Values are encoded as a tag, followed by a string id, an object id, or a
+# number of members followed by their encodings
+_NONE = 0
+_STRING = 1
+_OBJECT = 2
+_TUPLE = 3
+_FROZENSET = 4
+# Tuples of annotations are stored once in the annotation tuples array, each
+# as its number of annotations followed by their ids, since most statements
+# share theirs with others. The annotations array holds, for each annotated
+# element, its id and the id of its tuple of annotations. The element id -1
+# stands for the model.
+_MODEL_ID = -1
+# Errors that decoding corrupted arrays may raise, besides those of the
+# checks of ids and offsets
+_DECODE_ERRORS = (IndexError, TypeError, ValueError, RecursionError)
+
+
+class BELBWriter(momapy.io.Writer):
+    @classmethod
+    def write(
+        cls,
+        obj: momapy_bel.core.BELModel,
+        file_path: str | os.PathLike | typing.IO,
+        namespace_definitions=(),
+        annotation_definitions=(),
+        annotations=None,
+    ):
+        # Objects are flattened, then encoded, see _BELBEncoder
+        flattener = momapy_bel.core._ElementFlattener(with_ids=False)
+        statements = array.array(
+            "i",
+            [flattener.flatten(statement) for statement in obj.statements],
+        )
+        namespace_definitions = array.array(
+            "i",
+            [
+                flattener.flatten(namespace_definition)
+                for namespace_definition in namespace_definitions
+            ],
+        )
+        annotation_definitions = array.array(
+            "i",
+            [
+                flattener.flatten(annotation_definition)
+                for annotation_definition in annotation_definitions
+            ],
+        )
+        annotation_codes = []
+        annotation_tuple_codes = []
+        annotation_ids_to_tuple_id = {}
+        # Tuples of annotations that are the same object, as those of
+        # statements read under the same SET lines, are encoded once
+        annotations_id_to_tuple_id = {}
+        if annotations:
+            for element, element_annotations in annotations.items():
+                if element is obj:
+                    annotation_codes.append(_MODEL_ID)
+                else:
+                    annotation_codes.append(flattener.flatten(element))
+                tuple_id = annotations_id_to_tuple_id.get(
+                    id(element_annotations)
+                )
+                if tuple_id is None:
+                    annotation_ids = tuple(
+                        flattener.flatten(annotation)
+                        for annotation in element_annotations
+                    )
+                    tuple_id = annotation_ids_to_tuple_id.get(annotation_ids)
+                    if tuple_id is None:
+                        tuple_id = len(annotation_ids_to_tuple_id)
+                        annotation_ids_to_tuple_id[annotation_ids] = tuple_id
+                        annotation_tuple_codes.append(len(annotation_ids))
+                        annotation_tuple_codes += annotation_ids
+                    annotations_id_to_tuple_id[id(element_annotations)] = (
+                        tuple_id
+                    )
+                annotation_codes.append(tuple_id)
+        encoder = _BELBEncoder()
+        encoder.encode_objects(flattener.clses, flattener.codes)
+        encoded_strings = [
+            string.encode("utf-8") for string in encoder.string_to_id
+        ]
+        section_to_array = {
+            "string_offsets": array.array(
+                "q",
+                itertools.accumulate(
+                    map(len, encoded_strings), initial=0
+                ),
+            ),
+            "classes": array.array("i", encoder.cls_string_ids),
+            "object_offsets": array.array("q", encoder.object_offsets),
+            "objects": array.array("i", encoder.codes),
+            "statements": statements,
+            "namespace_definitions": namespace_definitions,
+            "annotation_definitions": annotation_definitions,
+            "annotation_tuples": array.array("i", annotation_tuple_codes),
+            "annotations": array.array("i", annotation_codes),
+        }
+        blob = b"".join(encoded_strings)
+        if hasattr(file_path, "write"):
+            cls._write_sections(file_path, section_to_array, blob)
+        else:
+            with open(file_path, "wb") as f:
+                cls._write_sections(f, section_to_array, blob)
+
+    @classmethod
+    def _write_sections(cls, stream, section_to_array, blob):
+        stream.write(_MAGIC)
+        stream.write(bytes(_get_padding(len(_MAGIC))))
+        for section in _SECTION_TO_TYPECODE:
+            codes = section_to_array[section]
+            if sys.byteorder == "big":
+                codes.byteswap()
+            data = codes.tobytes()
+            stream.write(len(codes).to_bytes(8, "little"))
+            stream.write(data)
+            stream.write(bytes(_get_padding(len(data))))
+        stream.write(len(blob).to_bytes(8, "little"))
+        stream.write(blob)
+
+
+class _BELBEncoder:
+    # Encodes objects flattened by momapy_bel.core._ElementFlattener, whose
+    # ids are kept, and which come after the objects they refer to
+    def __init__(self):
+        self.string_to_id = {}
+        self.cls_string_ids = []
+        self.object_offsets = []
+        self.codes = []
+
+    def encode_string(self, string):
+        string_id = self.string_to_id.get(string)
+        if string_id is None:
+            string_id = len(self.string_to_id)
+            self.string_to_id[string] = string_id
+        return string_id
+
+    def encode_objects(self, obj_clses, flat_codes):
+        n_fields_list = []
+        for obj_cls in obj_clses:
+            if getattr(momapy_bel.core, obj_cls.__name__, None) is not obj_cls:
+                raise TypeError(
+                    f"cannot encode object of type {obj_cls}, which is not "
+                    "a class of momapy_bel.core"
+                )
+            field_names = momapy_bel.core._get_element_field_names(obj_cls)
+            n_fields_list.append(len(field_names))
+            self.cls_string_ids.append(
+                self.encode_string(" ".join([obj_cls.__name__, *field_names]))
+            )
+        position = 0
+        n_flat_codes = len(flat_codes)
+        while position < n_flat_codes:
+            cls_id = flat_codes[position]
+            position += 1
+            self.object_offsets.append(len(self.codes))
+            self.codes.append(cls_id)
+            for flat_code in flat_codes[
+                position : position + n_fields_list[cls_id]
+            ]:
+                self._encode_flat_code(flat_code)
+            position += n_fields_list[cls_id]
+
+    def _encode_flat_code(self, flat_code):
+        flat_code_cls = flat_code.__class__
+        if flat_code_cls is str:
+            self.codes.append(_STRING)
+            self.codes.append(self.encode_string(flat_code))
+        elif flat_code_cls is int:
+            self.codes.append(_OBJECT)
+            self.codes.append(flat_code)
+        elif flat_code is None:
+            self.codes.append(_NONE)
+        elif flat_code_cls is tuple or flat_code_cls is frozenset:
+            self.codes.append(_TUPLE if flat_code_cls is tuple else _FROZENSET)
+            self.codes.append(len(flat_code))
+            for member in flat_code:
+                self._encode_flat_code(member)
+        else:
+            raise TypeError(
+                f"cannot encode value {flat_code.value!r}, which is not a "
+                "string, an object, a tuple or a frozenset"
+            )
+
+
+class BELBReader(momapy.io.Reader):
+    @classmethod
+    def check_file(cls, file_path: str | os.PathLike):
+        try:
+            with open(file_path, "rb") as f:
+                return f.read(len(_MAGIC)) == _MAGIC
+        except OSError:
+            return False
+
+    @classmethod
+    def read(
+        cls,
+        file_path: str | os.PathLike,
+        with_annotations=True,
+        mapped=False,
+        **options,
+    ) -> momapy_bel.io.bel.BELReaderResult:
+        momapy_bel.io.bel._check_reader_options(options)
+        # When mapped is set, the file is memory-mapped and its strings and
+        # objects are decoded only when they are accessed, see MappedBELB
+        if mapped:
+            return MappedBELB(file_path).get_reader_result(with_annotations)
+        with open(file_path, "rb") as f:
+            data = f.read()
+        section_to_codes, blob = _get_sections(memoryview(data))
+        section_to_codes = {
+            section: codes.tolist()
+            for section, codes in section_to_codes.items()
+        }
+        try:
+            return cls._decode_sections(
+                section_to_codes, blob, with_annotations, file_path
+            )
+        except _CorruptedBELBError:
+            raise
+        except _DECODE_ERRORS as error:
+            raise _CorruptedBELBError(str(error)) from error
+
+    @classmethod
+    def _decode_sections(
+        cls, section_to_codes, blob, with_annotations, file_path
+    ):
+        strings = cls._decode_strings(section_to_codes["string_offsets"], blob)
+        _check_ids(section_to_codes["classes"], len(strings), "classes")
+        clses = [
+            _get_cls_and_field_names(strings[string_id])
+            for string_id in section_to_codes["classes"]
+        ]
+        objects = []
+        codes = section_to_codes["objects"]
+        for position in section_to_codes["object_offsets"]:
+            objects.append(
+                cls._decode_object(
+                    codes, position, len(objects), strings, clses, objects
+                )
+            )
+        for section in [
+            "statements",
+            "namespace_definitions",
+            "annotation_definitions",
+        ]:
+            _check_ids(section_to_codes[section], len(objects), section)
+        bel_model = momapy_bel.core.BELModel(
+            statements=frozenset(
+                [objects[obj_id] for obj_id in section_to_codes["statements"]]
+            )
+        )
+        if with_annotations:
+            element_to_annotations = cls._decode_annotations(
+                section_to_codes["annotations"],
+                section_to_codes["annotation_tuples"],
+                objects,
+                bel_model,
+            )
+        else:
+            element_to_annotations = {}
+        return momapy_bel.io.bel.BELReaderResult(
+            obj=bel_model,
+            element_to_annotations=frozendict.frozendict(
+                element_to_annotations
+            ),
+            namespace_definitions=tuple(
+                objects[obj_id]
+                for obj_id in section_to_codes["namespace_definitions"]
+            ),
+            annotation_definitions=tuple(
+                objects[obj_id]
+                for obj_id in section_to_codes["annotation_definitions"]
+            ),
+            file_path=file_path,
+        )
+
+    @classmethod
+    def _decode_strings(cls, string_offsets, blob):
+        # ASCII strings, the common case, have as many characters as bytes,
+        # and are sliced from the decoded blob. The first and last offsets
+        # are checked with the sections.
+        if any(map(operator.gt, string_offsets, string_offsets[1:])):
+            raise _CorruptedBELBError("string offsets are not sorted")
+        text = str(blob, "utf-8")
+        if len(text) == len(blob):
+            return [
+                text[start:end]
+                for start, end in zip(string_offsets, string_offsets[1:])
+            ]
+        return [
+            str(blob[start:end], "utf-8")
+            for start, end in zip(string_offsets, string_offsets[1:])
+        ]
+
+    @classmethod
+    def _decode_object(cls, codes, position, obj_id, strings, clses, objects):
+        # Strings, objects and None are decoded inline, as they make up most
+        # fields. Ids are checked, as negative ones would index from the end,
+        # and the object obj_id may only refer to objects that come before
+        # it, so that decoding a corrupted file cannot loop.
+        if not 0 <= position < len(codes):
+            raise _CorruptedBELBError(
+                f"offset {position} of object {obj_id} is out of range"
+            )
+        cls_id = codes[position]
+        if not 0 <= cls_id < len(clses):
+            raise _CorruptedBELBError(
+                f"unknown class id {cls_id} of object {obj_id}"
+            )
+        obj_cls, field_names = clses[cls_id]
+        position += 1
+        n_strings = len(strings)
+        kwargs = {}
+        for field_name in field_names:
+            tag = codes[position]
+            if tag == _STRING:
+                string_id = codes[position + 1]
+                if not 0 <= string_id < n_strings:
+                    raise _CorruptedBELBError(
+                        f"unknown string id {string_id} in object {obj_id}"
+                    )
+                kwargs[field_name] = strings[string_id]
+                position += 2
+            elif tag == _OBJECT:
+                ref_id = codes[position + 1]
+                if not 0 <= ref_id < obj_id:
+                    raise _CorruptedBELBError(
+                        f"object {obj_id} refers to object {ref_id}"
+                    )
+                kwargs[field_name] = objects[ref_id]
+                position += 2
+            elif tag == _NONE:
+                kwargs[field_name] = None
+                position += 1
+            else:
+                kwargs[field_name], position = cls._decode_value(
+                    codes, position, obj_id, strings, objects
+                )
+        return obj_cls(**kwargs)
+
+    @classmethod
+    def _decode_annotations(
+        cls, annotation_codes, annotation_tuple_codes, objects, bel_model
+    ):
+        n_objects = len(objects)
+        annotation_tuples = []
+        position = 0
+        while position < len(annotation_tuple_codes):
+            n_annotations = annotation_tuple_codes[position]
+            position += 1
+            if not 0 <= n_annotations <= len(annotation_tuple_codes) - position:
+                raise _CorruptedBELBError(
+                    f"annotation tuple {len(annotation_tuples)} is truncated"
+                )
+            _check_ids(
+                annotation_tuple_codes[position : position + n_annotations],
+                n_objects,
+                "annotation_tuples",
+            )
+            annotation_tuples.append(
+                tuple(
+                    [
+                        objects[obj_id]
+                        for obj_id in annotation_tuple_codes[
+                            position : position + n_annotations
+                        ]
+                    ]
+                )
+            )
+            position += n_annotations
+        if len(annotation_codes) % 2 != 0:
+            raise _CorruptedBELBError("annotations are truncated")
+        element_to_annotations = {}
+        for element_id, tuple_id in zip(
+            annotation_codes[::2], annotation_codes[1::2]
+        ):
+            if element_id == _MODEL_ID:
+                element = bel_model
+            elif 0 <= element_id < n_objects:
+                element = objects[element_id]
+            else:
+                raise _CorruptedBELBError(
+                    f"unknown object id {element_id} in section annotations"
+                )
+            if not 0 <= tuple_id < len(annotation_tuples):
+                raise _CorruptedBELBError(
+                    f"unknown annotation tuple id {tuple_id}"
+                )
+            element_to_annotations[element] = annotation_tuples[tuple_id]
+        return element_to_annotations
+
+    @classmethod
+    def _decode_value(cls, codes, position, obj_id, strings, objects):
+        # Values are checked as the fields of _decode_object
+        tag = codes[position]
+        if tag == _STRING:
+            string_id = codes[position + 1]
+            if not 0 <= string_id < len(strings):
+                raise _CorruptedBELBError(
+                    f"unknown string id {string_id} in object {obj_id}"
+                )
+            return strings[string_id], position + 2
+        if tag == _OBJECT:
+            ref_id = codes[position + 1]
+            if not 0 <= ref_id < obj_id:
+                raise _CorruptedBELBError(
+                    f"object {obj_id} refers to object {ref_id}"
+                )
+            return objects[ref_id], position + 2
+        if tag == _NONE:
+            return None, position + 1
+        if tag != _TUPLE and tag != _FROZENSET:
+            raise _CorruptedBELBError(
+                f"unknown value tag {tag} in object {obj_id}"
+            )
+        n_members = codes[position + 1]
+        position += 2
+        members = []
+        for _ in range(n_members):
+            member, position = cls._decode_value(
+                codes, position, obj_id, strings, objects
+            )
+            members.append(member)
+        if tag == _TUPLE:
+            return tuple(members), position
+        return frozenset(members), position
+
+
+class MappedBELB:
+    # A memory-mapped BELB file. Strings and objects are decoded from the
+    # mapped file when they are first accessed, and kept. Processes that
+    # map the same file share its pages through the page cache, and only
+    # hold the objects they accessed. Ids and offsets are checked as they
+    # are accessed, so that corrupted files raise a ValueError then. Once
+    # closed, strings and objects decoded already stay available, and
+    # accessing others raises a ValueError.
+    def __init__(self, file_path: str | os.PathLike):
+        with open(file_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.file_path = file_path
+        self._buffer = memoryview(self._mmap)
+        self._section_to_codes, self._blob = _get_sections(self._buffer)
+        self.strings = _MappedStrings(
+            self._section_to_codes["string_offsets"], self._blob, self._mmap
+        )
+        _check_ids(
+            self._section_to_codes["classes"], len(self.strings), "classes"
+        )
+        clses = [
+            _get_cls_and_field_names(self.strings[string_id])
+            for string_id in self._section_to_codes["classes"]
+        ]
+        self.objects = _MappedObjects(
+            self._section_to_codes["objects"],
+            self._section_to_codes["object_offsets"],
+            self.strings,
+            clses,
+            self._mmap,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def closed(self):
+        return self._mmap.closed
+
+    def close(self):
+        # The views of the map are released first, as a map cannot be
+        # closed while they exist
+        if self._mmap.closed:
+            return
+        for codes in self._section_to_codes.values():
+            if isinstance(codes, memoryview):
+                codes.release()
+        self._blob.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def get_reader_result(self, with_annotations=True):
+        bel_model = momapy_bel.core.BELModel(
+            statements=MappedStatements(
+                self._section_to_codes["statements"], self.objects
+            )
+        )
+        if with_annotations:
+            element_to_annotations = _MappedAnnotations(
+                self._section_to_codes["annotations"],
+                self._section_to_codes["annotation_tuples"],
+                self.objects,
+                bel_model,
+            )
+        else:
+            element_to_annotations = frozendict.frozendict()
+        for section in ["namespace_definitions", "annotation_definitions"]:
+            _check_ids(
+                self._section_to_codes[section], len(self.objects), section
+            )
+        return momapy_bel.io.bel.BELReaderResult(
+            obj=bel_model,
+            element_to_annotations=element_to_annotations,
+            namespace_definitions=tuple(
+                self.objects[obj_id]
+                for obj_id in self._section_to_codes["namespace_definitions"]
+            ),
+            annotation_definitions=tuple(
+                self.objects[obj_id]
+                for obj_id in self._section_to_codes["annotation_definitions"]
+            ),
+            file_path=self.file_path,
+        )
+
+
+class _MappedStrings(collections.abc.Sequence):
+    def __init__(self, string_offsets, blob, mmap_):
+        self._string_offsets = string_offsets
+        self._blob = blob
+        self._mmap = mmap_
+        self._n_strings = len(string_offsets) - 1
+        self._string_id_to_string = {}
+
+    def __len__(self):
+        return self._n_strings
+
+    def __getitem__(self, string_id):
+        string = self._string_id_to_string.get(string_id)
+        if string is None:
+            if self._mmap.closed:
+                raise ValueError("cannot decode strings of a closed BELB file")
+            if not 0 <= string_id < len(self):
+                raise IndexError(f"string id {string_id} out of range")
+            start = self._string_offsets[string_id]
+            end = self._string_offsets[string_id + 1]
+            if not 0 <= start <= end <= len(self._blob):
+                raise _CorruptedBELBError(
+                    f"offsets of string {string_id} are out of range"
+                )
+            try:
+                string = str(self._blob[start:end], "utf-8")
+            except UnicodeDecodeError as error:
+                raise _CorruptedBELBError(str(error)) from error
+            self._string_id_to_string[string_id] = string
+        return string
+
+
+class _MappedObjects(collections.abc.Sequence):
+    def __init__(self, codes, object_offsets, strings, clses, mmap_):
+        self._codes = codes
+        self._object_offsets = object_offsets
+        self._strings = strings
+        self._clses = clses
+        self._mmap = mmap_
+        self._n_objects = len(object_offsets)
+        self._obj_id_to_obj = {}
+
+    def __len__(self):
+        return self._n_objects
+
+    def __getitem__(self, obj_id):
+        obj = self._obj_id_to_obj.get(obj_id)
+        if obj is None:
+            if self._mmap.closed:
+                raise ValueError("cannot decode objects of a closed BELB file")
+            if not 0 <= obj_id < len(self):
+                raise IndexError(f"object id {obj_id} out of range")
+            # Errors of subobjects are raised as they are
+            try:
+                obj = BELBReader._decode_object(
+                    self._codes,
+                    self._object_offsets[obj_id],
+                    obj_id,
+                    self._strings,
+                    self._clses,
+                    self,
+                )
+            except _CorruptedBELBError:
+                raise
+            except _DECODE_ERRORS as error:
+                raise _CorruptedBELBError(str(error)) from error
+            self._obj_id_to_obj[obj_id] = obj
+        return obj
+
+
+class MappedStatements(collections.abc.Set):
+    # The statements of a memory-mapped BELB file, in place of the frozenset
+    # of a BELModel. Statements are decoded as they are iterated over.
+    # Membership tests, hashing and set operations decode all statements,
+    # once. Set operations return frozensets, and their methods accept any
+    # iterables, as those of frozensets.
+    def __init__(self, statement_ids, objects):
+        self._statement_ids = statement_ids
+        self._objects = objects
+        self._statements = None
+
+    def __len__(self):
+        return len(self._statement_ids)
+
+    def __iter__(self):
+        objects = self._objects
+        n_objects = len(objects)
+        for statement_id in self._statement_ids:
+            if not 0 <= statement_id < n_objects:
+                raise _CorruptedBELBError(
+                    f"unknown object id {statement_id} in section statements"
+                )
+            yield objects[statement_id]
+
+    def __contains__(self, statement):
+        return statement in self._get_statements()
+
+    def __hash__(self):
+        return hash(self._get_statements())
+
+    def __reduce__(self):
+        # Memory maps cannot be pickled
+        return (frozenset, (list(self),))
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return frozenset(iterable)
+
+    def union(self, *others):
+        return self._get_statements().union(*others)
+
+    def intersection(self, *others):
+        return self._get_statements().intersection(*others)
+
+    def difference(self, *others):
+        return self._get_statements().difference(*others)
+
+    def symmetric_difference(self, other):
+        return self._get_statements().symmetric_difference(other)
+
+    def issubset(self, other):
+        return self._get_statements().issubset(other)
+
+    def issuperset(self, other):
+        return self._get_statements().issuperset(other)
+
+    def copy(self):
+        return self._get_statements()
+
+    def get_statement(self, index):
+        statement_id = self._statement_ids[index]
+        if not 0 <= statement_id < len(self._objects):
+            raise _CorruptedBELBError(
+                f"unknown object id {statement_id} in section statements"
+            )
+        return self._objects[statement_id]
+
+    def _get_statements(self):
+        if self._statements is None:
+            self._statements = frozenset(self)
+        return self._statements
+
+
+class _MappedAnnotations(collections.abc.Mapping):
+    # Annotations are keyed by elements, hence are all decoded on first
+    # access
+    def __init__(
+        self, annotation_codes, annotation_tuple_codes, objects, bel_model
+    ):
+        self._annotation_codes = annotation_codes
+        self._annotation_tuple_codes = annotation_tuple_codes
+        self._objects = objects
+        self._bel_model = bel_model
+        self._element_to_annotations = None
+
+    def __getitem__(self, element):
+        return self._get_element_to_annotations()[element]
+
+    def __iter__(self):
+        return iter(self._get_element_to_annotations())
+
+    def __len__(self):
+        return len(self._get_element_to_annotations())
+
+    def _get_element_to_annotations(self):
+        if self._element_to_annotations is None:
+            self._element_to_annotations = frozendict.frozendict(
+                BELBReader._decode_annotations(
+                    self._annotation_codes,
+                    self._annotation_tuple_codes,
+                    self._objects,
+                    self._bel_model,
+                )
+            )
+        return self._element_to_annotations
+
+
+class _CorruptedBELBError(ValueError):
+    # Raised once for the first error found decoding a corrupted file, and
+    # not wrapped again by decodings of objects that refer to its object
+    def __init__(self, message):
+        super().__init__(f"corrupted BELB file: {message}")
+
+
+def _get_sections(buffer):
+    # Returns the arrays of the file as views of the buffer, or as copies on
+    # big-endian platforms, and the string blob as a view of the buffer.
+    # Sizes are checked against that of the buffer, but arrays are not read.
+    if buffer[: len(_SIGNATURE)] != _SIGNATURE:
+        raise ValueError("not a BELB file")
+    if len(buffer) < len(_MAGIC):
+        raise ValueError("truncated BELB file in header")
+    version = int.from_bytes(buffer[len(_SIGNATURE) : len(_MAGIC)], "big")
+    if version != _VERSION:
+        raise ValueError(
+            f"unsupported BELB version {version}, expected {_VERSION}"
+        )
+    position = len(_MAGIC) + _get_padding(len(_MAGIC))
+    section_to_codes = {}
+    for section, typecode in _SECTION_TO_TYPECODE.items():
+        n_codes = _get_size(buffer, position, section)
+        position += 8
+        size = n_codes * array.array(typecode).itemsize
+        if position + size > len(buffer):
+            raise ValueError(f"truncated BELB file in section {section}")
+        codes = buffer[position : position + size].cast(typecode)
+        if sys.byteorder == "big":
+            codes = array.array(typecode, codes)
+            codes.byteswap()
+        section_to_codes[section] = codes
+        position += size + _get_padding(size)
+    blob_size = _get_size(buffer, position, "string blob")
+    position += 8
+    if position + blob_size > len(buffer):
+        raise ValueError("truncated BELB file in section string blob")
+    if position + blob_size < len(buffer):
+        raise ValueError("unexpected data at the end of BELB file")
+    string_offsets = section_to_codes["string_offsets"]
+    if not string_offsets or string_offsets[0] != 0:
+        raise _CorruptedBELBError("first string offset is not 0")
+    if string_offsets[-1] != blob_size:
+        raise _CorruptedBELBError(
+            "last string offset is not the size of the string blob"
+        )
+    return section_to_codes, buffer[position:]
+
+
+def _get_size(buffer, position, section):
+    if position + 8 > len(buffer):
+        raise ValueError(f"truncated BELB file in section {section}")
+    return int.from_bytes(buffer[position : position + 8], "little")
+
+
+def _check_ids(ids, n_ids, section):
+    # Ids are checked, as negative ones would index from the end
+    if len(ids) != 0 and not (0 <= min(ids) and max(ids) < n_ids):
+        raise _CorruptedBELBError(f"ids out of range in section {section}")
+
+
+def _get_padding(size):
+    return -size % 8
+
+
+def _get_cls_and_field_names(cls_string):
+    cls_name, *field_names = cls_string.split(" ")
+    obj_cls = getattr(momapy_bel.core, cls_name, None)
+    if not isinstance(obj_cls, type) or not dataclasses.is_dataclass(obj_cls):
+        raise _CorruptedBELBError(f"unknown class {cls_name}")
+    cls_field_names = {field_.name for field_ in dataclasses.fields(obj_cls)}
+    for field_name in field_names:
+        if field_name not in cls_field_names:
+            raise _CorruptedBELBError(
+                f"unknown field {field_name} of class {cls_name}"
+            )
+    return obj_cls, field_names
+
+
+momapy.io.register_writer("belb", BELBWriter)
+momapy.io.register_reader("belb", BELBReader)
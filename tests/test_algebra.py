@@ -0,0 +1,192 @@
+import gc
+
+import pytest
+
+import momapy_bel.algebra
+import momapy_bel.core
+
+from .test_bel import make_protein
+
+CITATION_DEFINITION = momapy_bel.core.BELGenericAnnotationDefinition(
+    name="Citation", as_="https://example.org/citation"
+)
+
+
+def make_citation(pubmed_id):
+    return momapy_bel.core.BELGenericAnnotation(
+        definition=CITATION_DEFINITION, args=("PubMed", pubmed_id)
+    )
+
+
+def make_relation(relation_cls, source_identifier, target_identifier):
+    # Terms are made for each statement, so that equal statements of
+    # different models are different objects
+    return relation_cls(
+        source=make_protein(source_identifier),
+        target=make_protein(target_identifier),
+    )
+
+
+def make_bel_model(statements):
+    return momapy_bel.core.BELModel(statements=frozenset(statements))
+
+
+def test_merge():
+    statement = make_relation(momapy_bel.core.Increases, "A", "B")
+    shared_statement = make_relation(momapy_bel.core.Decreases, "B", "C")
+    other_shared_statement = make_relation(momapy_bel.core.Decreases, "B", "C")
+    other_statement = make_relation(momapy_bel.core.Increases, "C", "D")
+    bel_model = make_bel_model([statement, shared_statement])
+    other_bel_model = make_bel_model([other_shared_statement, other_statement])
+    document_annotation = momapy_bel.core.BELDocumentAnnotation(name="first")
+    other_document_annotation = momapy_bel.core.BELDocumentAnnotation(
+        name="second"
+    )
+    element_to_annotations = {
+        bel_model: (document_annotation,),
+        statement: (make_citation("1"),),
+        shared_statement: (make_citation("1"), make_citation("2")),
+    }
+    other_element_to_annotations = {
+        other_bel_model: (other_document_annotation,),
+        other_shared_statement: (make_citation("3"), make_citation("1")),
+        other_statement: (make_citation("3"),),
+    }
+    merged_model, merged_element_to_annotations = momapy_bel.algebra.merge(
+        [bel_model, other_bel_model],
+        [element_to_annotations, other_element_to_annotations],
+    )
+    assert merged_model.statements == frozenset(
+        [statement, shared_statement, other_statement]
+    )
+    # The first of equal statements is kept, with the annotations of all of
+    # them in order of first appearance
+    assert any(
+        merged_statement is shared_statement
+        for merged_statement in merged_model.statements
+    )
+    assert merged_element_to_annotations[shared_statement] == (
+        make_citation("1"),
+        make_citation("2"),
+        make_citation("3"),
+    )
+    assert merged_element_to_annotations[other_statement] == (
+        make_citation("3"),
+    )
+    assert merged_element_to_annotations[merged_model] == (
+        document_annotation,
+        other_document_annotation,
+    )
+    assert momapy_bel.algebra.merge([bel_model, other_bel_model]) == (
+        merged_model,
+        None,
+    )
+    with pytest.raises(ValueError, match="as many annotation maps"):
+        momapy_bel.algebra.merge(
+            [bel_model, other_bel_model], [element_to_annotations]
+        )
+
+
+def test_diff():
+    increases = make_relation(momapy_bel.core.Increases, "A", "B")
+    directly_increases = make_relation(
+        momapy_bel.core.DirectlyIncreases, "A", "B"
+    )
+    shared_statement = make_relation(momapy_bel.core.Decreases, "B", "C")
+    removed_statement = make_relation(momapy_bel.core.Increases, "C", "D")
+    bel_model = make_bel_model(
+        [increases, directly_increases, shared_statement, removed_statement]
+    )
+    decreases = make_relation(momapy_bel.core.Decreases, "A", "B")
+    added_statement = make_relation(momapy_bel.core.Increases, "D", "E")
+    other_shared_statement = make_relation(momapy_bel.core.Decreases, "B", "C")
+    other_bel_model = make_bel_model(
+        [decreases, other_shared_statement, added_statement]
+    )
+    bel_model_diff = momapy_bel.algebra.diff(bel_model, other_bel_model)
+    # Of the two relations between A and B, one is paired with the new one,
+    # always the same, and the other is removed
+    ((old_statement, new_statement),) = bel_model_diff.changed
+    assert old_statement in (increases, directly_increases)
+    assert new_statement is decreases
+    assert bel_model_diff.added == frozenset([added_statement])
+    assert bel_model_diff.removed == frozenset(
+        [removed_statement, increases, directly_increases]
+    ) - frozenset([old_statement])
+    copied_bel_model = make_bel_model(
+        [
+            make_relation(momapy_bel.core.Increases, "A", "B"),
+            make_relation(momapy_bel.core.DirectlyIncreases, "A", "B"),
+            make_relation(momapy_bel.core.Decreases, "B", "C"),
+            make_relation(momapy_bel.core.Increases, "C", "D"),
+        ]
+    )
+    assert (
+        momapy_bel.algebra.diff(copied_bel_model, other_bel_model).changed[0][0]
+        == old_statement
+    )
+    assert not momapy_bel.algebra.diff(bel_model, copied_bel_model)
+    # Annotations are compared only if both maps are given
+    element_to_annotations = {shared_statement: (make_citation("1"),)}
+    other_element_to_annotations = {
+        other_shared_statement: (make_citation("2"),)
+    }
+    bel_model_diff = momapy_bel.algebra.diff(
+        bel_model,
+        other_bel_model,
+        element_to_annotations,
+        other_element_to_annotations,
+    )
+    # Changed relations come first, then statements whose annotations
+    # changed
+    assert bel_model_diff.changed[1:] == (
+        (shared_statement, other_shared_statement),
+    )
+    assert bel_model_diff.changed[1][1] is other_shared_statement
+    ((old_statement, new_statement),) = momapy_bel.algebra.diff(
+        bel_model, copied_bel_model, element_to_annotations, {}
+    ).changed
+    assert old_statement is shared_statement
+    assert new_statement == shared_statement
+
+
+def test_is_submodel_and_contains_statements():
+    statements = [
+        make_relation(momapy_bel.core.Increases, "A", "B"),
+        make_relation(momapy_bel.core.Decreases, "B", "C"),
+    ]
+    bel_model = make_bel_model(statements)
+    bel_submodel = make_bel_model(
+        [make_relation(momapy_bel.core.Increases, "A", "B")]
+    )
+    assert momapy_bel.algebra.is_submodel(bel_submodel, bel_model)
+    assert not momapy_bel.algebra.is_submodel(bel_model, bel_submodel)
+    assert momapy_bel.algebra.contains_statements(
+        bel_model, [make_relation(momapy_bel.core.Decreases, "B", "C")]
+    )
+    assert not momapy_bel.algebra.contains_statements(
+        bel_model, [make_relation(momapy_bel.core.Decreases, "A", "C")]
+    )
+
+
+def test_fingerprints_are_freed_with_their_model():
+    # Models are created and freed in turn, so that their ids are reused:
+    # the fingerprints of each model must be its own, and not those of a
+    # freed model that had the same id
+    fingerprint_to_statement_map = (
+        momapy_bel.algebra._bel_model_id_to_fingerprint_to_statement
+    )
+    bel_model_ids = set()
+    for index in range(20):
+        statement = make_relation(momapy_bel.core.Increases, "A", str(index))
+        bel_model = make_bel_model([statement])
+        assert momapy_bel.algebra.contains_statements(bel_model, [statement])
+        assert list(
+            momapy_bel.algebra.get_fingerprint_to_statement(bel_model).values()
+        ) == [statement]
+        bel_model_id = id(bel_model)
+        bel_model_ids.add(bel_model_id)
+        del bel_model
+        gc.collect()
+        assert bel_model_id not in fingerprint_to_statement_map
+    assert len(bel_model_ids) < 20
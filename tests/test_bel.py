@@ -0,0 +1,812 @@
+import dataclasses
+import gzip
+import io
+import os
+import subprocess
+import sys
+import zlib
+
+import pytest
+
+import momapy_bel.core
+import momapy_bel.io.bel
+
+
+def make_protein(identifier, **kwargs):
+    return momapy_bel.core.ProteinAbundance(
+        namespace="HGNC", identifier=identifier, **kwargs
+    )
+
+
+def make_chemical(identifier):
+    return momapy_bel.core.Abundance(namespace="CHEBI", identifier=identifier)
+
+
+def make_terms():
+    cytoplasm = momapy_bel.core.Location(namespace="GO", identifier="cytoplasm")
+    return [
+        make_protein("AKT1"),
+        make_protein("AKT1", location=cytoplasm),
+        make_protein(
+            "AKT1",
+            modifications=(
+                momapy_bel.core.ProteinModification(
+                    identifier="Ph", amino_acid="Ser", residue="473"
+                ),
+                momapy_bel.core.ProteinModification(identifier="Ac"),
+            ),
+        ),
+        make_protein(
+            "KRAS", variant=momapy_bel.core.Variant(descriptor="p.Gly12Cys")
+        ),
+        momapy_bel.core.ProteinAbundance(
+            fusion=momapy_bel.core.Fusion(
+                namespace5="HGNC",
+                identifier5="BCR",
+                range5="r.1_3500",
+                namespace3="HGNC",
+                identifier3="ABL1",
+                range3="r.3100_6000",
+            )
+        ),
+        momapy_bel.core.GeneAbundance(
+            namespace="HGNC",
+            identifier="TP53",
+            location=None,
+            fusion=None,
+            variant=momapy_bel.core.Variant(descriptor="c.215C>G"),
+        ),
+        momapy_bel.core.RNAAbundance(
+            namespace="HGNC",
+            identifier="TP53",
+            location=cytoplasm,
+            fusion=None,
+            variant=None,
+        ),
+        momapy_bel.core.MicroRNAAbundance(
+            namespace="HGNC",
+            identifier="MIR21",
+            location=None,
+            fusion=None,
+            variant=None,
+        ),
+        make_chemical("glucose"),
+        momapy_bel.core.ComplexAbundance(
+            members=frozenset([make_protein("AKT1"), make_protein("PDPK1")])
+        ),
+        momapy_bel.core.ComplexAbundance(
+            namespace="SCOMP", identifier="AP-1 Complex"
+        ),
+        momapy_bel.core.CompositeAbundance(
+            members=frozenset([make_protein("IL6"), make_chemical("lipid")])
+        ),
+        momapy_bel.core.Activity(
+            abundance=make_protein("AKT1"),
+            molecular_activity=momapy_bel.core.MolecularActivity(
+                namespace="", identifier="kin"
+            ),
+        ),
+        momapy_bel.core.Activity(abundance=make_protein("PDPK1")),
+        momapy_bel.core.BiologicalProcess(
+            namespace="GO", identifier="cell proliferation"
+        ),
+        momapy_bel.core.Pathology(namespace="MESH", identifier="Neoplasms"),
+        momapy_bel.core.PopulationAbundance(
+            namespace="TAX", identifier="Escherichia coli"
+        ),
+        momapy_bel.core.CellSecretion(abundance=make_protein("IL6")),
+        momapy_bel.core.CellSurfaceExpression(abundance=make_protein("EGFR")),
+        momapy_bel.core.Degradation(abundance=make_protein("TP53")),
+        momapy_bel.core.Translocation(
+            abundance=make_protein("FOXO1"),
+            from_namespace="GO",
+            from_identifier="cytoplasm",
+            to_namespace="GO",
+            to_identifier="nucleus",
+        ),
+        momapy_bel.core.Reaction(
+            reactants=frozenset([make_chemical("glucose"), make_chemical("ATP")]),
+            products=frozenset([make_chemical("glucose-6-phosphate")]),
+        ),
+    ]
+
+
+def make_bel_model():
+    terms = make_terms()
+    statements = [
+        relation_cls(
+            source=terms[index % len(terms)],
+            target=terms[(3 * index + 1) % len(terms)],
+        )
+        for index, relation_cls in enumerate(momapy_bel.core.RELATION_CLSES)
+    ]
+    statements.append(
+        momapy_bel.core.HasMembers(
+            source=make_protein("AKT"),
+            target=momapy_bel.core.List(
+                elements=(make_protein("AKT1"), make_protein("AKT2"))
+            ),
+        )
+    )
+    statements.append(terms[-1])
+    return momapy_bel.core.BELModel(statements=frozenset(statements))
+
+
+def write_and_read(
+    tmp_path,
+    bel_model,
+    namespace_definitions=(),
+    annotation_definitions=(),
+    annotations=None,
+    **options,
+):
+    file_path = tmp_path / "model.bel"
+    momapy_bel.io.bel.BELWriter.write(
+        bel_model,
+        file_path,
+        namespace_definitions,
+        annotation_definitions,
+        annotations if annotations is not None else {},
+        **options,
+    )
+    return momapy_bel.io.bel.BELReader.read(file_path)
+
+
+def read_string(tmp_path, bel_string, **options):
+    file_path = tmp_path / "model.bel"
+    file_path.write_text(bel_string)
+    return momapy_bel.io.bel.BELReader.read(file_path, **options)
+
+
+def test_round_trip_statements(tmp_path):
+    bel_model = make_bel_model()
+    result = write_and_read(tmp_path, bel_model)
+    assert result.obj.statements == bel_model.statements
+
+
+def test_round_trip_definitions(tmp_path):
+    namespace_definitions = (
+        momapy_bel.core.BELNamespaceDefinition(
+            name="HGNC", as_="https://example.org/hgnc.belns"
+        ),
+    )
+    annotation_definitions = (
+        momapy_bel.core.BELGenericAnnotationDefinition(
+            name="Species", as_=("9606", "10090")
+        ),
+        momapy_bel.core.BELGenericAnnotationDefinition(
+            name="Cell", as_="https://example.org/cell.belanno"
+        ),
+        momapy_bel.core.BELGenericAnnotationDefinition(
+            name="Tissue", as_="[A-Z]+"
+        ),
+    )
+    result = write_and_read(
+        tmp_path,
+        make_bel_model(),
+        namespace_definitions,
+        annotation_definitions,
+    )
+    assert result.namespace_definitions == namespace_definitions
+    assert result.annotation_definitions == annotation_definitions
+
+
+def make_annotated_bel_model():
+    bel_model = make_bel_model()
+    citation_definition = momapy_bel.core.BELGenericAnnotationDefinition(
+        name="Citation", as_="https://example.org/citation"
+    )
+    evidence_definition = momapy_bel.core.BELGenericAnnotationDefinition(
+        name="Evidence", as_="https://example.org/evidence"
+    )
+    species_definition = momapy_bel.core.BELGenericAnnotationDefinition(
+        name="Species", as_=("9606", "10090")
+    )
+    annotation_definitions = (
+        citation_definition,
+        evidence_definition,
+        species_definition,
+    )
+    annotations = {
+        bel_model: (
+            momapy_bel.core.BELDocumentAnnotation(
+                name="Test corpus",
+                authors="Jane Doe, John Doe",
+                version="1.0",
+            ),
+        )
+    }
+    for index, statement in enumerate(
+        sorted(bel_model.statements, key=momapy_bel.core.get_sort_key)
+    ):
+        statement_annotations = [
+            momapy_bel.core.BELGenericAnnotation(
+                definition=citation_definition,
+                args=("PubMed", str(index // 4)),
+            ),
+            momapy_bel.core.BELGenericAnnotation(
+                definition=evidence_definition,
+                args=(f'Evidence "{index // 4}", with a comma\nand a line',),
+            ),
+        ]
+        if index % 3:
+            statement_annotations.append(
+                momapy_bel.core.BELGenericAnnotation(
+                    definition=species_definition,
+                    args=(("9606", "10090")[index % 2],),
+                )
+            )
+        annotations[statement] = tuple(statement_annotations)
+    return bel_model, annotation_definitions, annotations
+
+
+@pytest.mark.parametrize("with_grouped_annotations", [False, True])
+def test_round_trip_annotations(tmp_path, with_grouped_annotations):
+    bel_model, annotation_definitions, annotations = make_annotated_bel_model()
+    result = write_and_read(
+        tmp_path,
+        bel_model,
+        annotation_definitions=annotation_definitions,
+        annotations=annotations,
+        with_grouped_annotations=with_grouped_annotations,
+    )
+    assert result.obj.statements == bel_model.statements
+    assert result.element_to_annotations[result.obj] == annotations[bel_model]
+    for statement in bel_model.statements:
+        assert set(result.element_to_annotations[statement]) == set(
+            annotations[statement]
+        )
+
+
+def test_grouped_annotations_are_set_once(tmp_path):
+    bel_model, annotation_definitions, annotations = make_annotated_bel_model()
+    file_path = tmp_path / "model.bel"
+    momapy_bel.io.bel.BELWriter.write(
+        bel_model,
+        file_path,
+        (),
+        annotation_definitions,
+        annotations,
+        with_grouped_annotations=True,
+    )
+    set_lines = [
+        line
+        for line in file_path.read_text().split("\n")
+        if line.startswith("SET Citation")
+    ]
+    assert len(set_lines) == len(set(set_lines))
+
+
+def test_unset_annotations(tmp_path):
+    result = read_string(
+        tmp_path,
+        'SET Citation = {"PubMed", "1"}\n'
+        'SET Species = "9606"\n'
+        "p(HGNC:A) -> p(HGNC:B)\n"
+        "UNSET Species\n"
+        "p(HGNC:B) -> p(HGNC:C)\n"
+        "UNSET ALL\n"
+        "p(HGNC:C) -> p(HGNC:D)\n",
+    )
+    name_to_args = {
+        tuple(
+            term.identifier
+            for term in (statement.source, statement.target)
+        ): {
+            annotation.definition.name: annotation.args
+            for annotation in result.element_to_annotations.get(statement, ())
+        }
+        for statement in result.obj.statements
+    }
+    assert name_to_args == {
+        ("A", "B"): {"Citation": ("PubMed", "1"), "Species": ("9606",)},
+        ("B", "C"): {"Citation": ("PubMed", "1")},
+        ("C", "D"): {},
+    }
+
+
+@pytest.mark.parametrize(
+    "identifier",
+    [
+        "with space",
+        'with "quotes"',
+        "with, comma",
+        "with:colon",
+        "with (parentheses)",
+        "étoile",
+        "a\\b",
+        "ends with a backslash\\",
+        'with \\"escaped quotes\\"',
+    ],
+)
+def test_round_trip_quoted_identifiers(tmp_path, identifier):
+    statement = momapy_bel.core.Increases(
+        source=make_protein(identifier),
+        target=momapy_bel.core.BiologicalProcess(
+            namespace="GO", identifier=identifier
+        ),
+    )
+    bel_model = momapy_bel.core.BELModel(statements=frozenset([statement]))
+    result = write_and_read(tmp_path, bel_model)
+    assert result.obj.statements == bel_model.statements
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ('with "quotes"',),
+        ("with, comma",),
+        ('"quoted", "values"', "and another"),
+        ("a\\b",),
+        ("ends with a backslash\\",),
+        ("ends with a backslash\\", "and another\\"),
+        ('with \\"escaped quotes\\"',),
+    ],
+)
+def test_round_trip_quoted_values(tmp_path, args):
+    definition = momapy_bel.core.BELGenericAnnotationDefinition(
+        name="Evidence", as_=args
+    )
+    statement = momapy_bel.core.Increases(
+        source=make_protein("A"), target=make_protein("B")
+    )
+    bel_model = momapy_bel.core.BELModel(statements=frozenset([statement]))
+    annotation = momapy_bel.core.BELGenericAnnotation(
+        definition=definition, args=args
+    )
+    result = write_and_read(
+        tmp_path,
+        bel_model,
+        annotation_definitions=(definition,),
+        annotations={statement: (annotation,)},
+    )
+    assert result.annotation_definitions == (definition,)
+    assert result.element_to_annotations[statement] == (annotation,)
+
+
+def test_read_multi_line_statements(tmp_path):
+    result = read_string(
+        tmp_path,
+        "# A comment\n"
+        'SET Evidence = "first line\n'
+        'second line"\n'
+        "\n"
+        "p(HGNC:A) -> \\\n"
+        "    p(HGNC:B)\n"
+        'bp(GO:"cell\n'
+        'death") -| p(HGNC:C)\n',
+    )
+    statements = {
+        momapy_bel.core.Increases(
+            source=make_protein("A"), target=make_protein("B")
+        ),
+        momapy_bel.core.Decreases(
+            source=momapy_bel.core.BiologicalProcess(
+                namespace="GO", identifier="cell\ndeath"
+            ),
+            target=make_protein("C"),
+        ),
+    }
+    assert result.obj.statements == statements
+    for statement in statements:
+        (annotation,) = result.element_to_annotations[statement]
+        assert annotation.args == ("first line\nsecond line",)
+
+
+def test_read_values_ending_with_backslashes(tmp_path):
+    result = read_string(
+        tmp_path,
+        'SET Evidence = "ends with a backslash\\\\"\n'
+        'p(HGNC:"ABC\\\\") -> p(HGNC:"with \\"quotes\\"")\n'
+        'p(HGNC:"ABC\\\\") -| \\\n'
+        "    p(HGNC:D)\n",
+    )
+    statements = {
+        momapy_bel.core.Increases(
+            source=make_protein("ABC\\"), target=make_protein('with "quotes"')
+        ),
+        momapy_bel.core.Decreases(
+            source=make_protein("ABC\\"), target=make_protein("D")
+        ),
+    }
+    assert result.obj.statements == statements
+    for statement in statements:
+        (annotation,) = result.element_to_annotations[statement]
+        assert annotation.args == ("ends with a backslash\\",)
+
+
+def test_read_in_processes(tmp_path):
+    bel_model, annotation_definitions, annotations = make_annotated_bel_model()
+    file_path = tmp_path / "model.bel"
+    momapy_bel.io.bel.BELWriter.write(
+        bel_model, file_path, (), annotation_definitions, annotations
+    )
+    result = momapy_bel.io.bel.BELReader.read(file_path)
+    parallel_result = momapy_bel.io.bel.BELReader.read(
+        file_path, processes=2, chunk_size=4
+    )
+    assert parallel_result.obj.statements == result.obj.statements
+    assert dict(parallel_result.element_to_annotations) == dict(
+        result.element_to_annotations
+    )
+
+
+def test_read_options(tmp_path):
+    bel_model = make_bel_model()
+    file_path = tmp_path / "model.bel"
+    momapy_bel.io.bel.BELWriter.write(bel_model, file_path, (), (), {})
+    result = momapy_bel.io.bel.BELReader.read(
+        file_path, return_type="model", with_layout=False, with_notes=False
+    )
+    assert result.obj.statements == bel_model.statements
+    for option in ["process", "chunksize"]:
+        with pytest.raises(TypeError, match=option):
+            momapy_bel.io.bel.BELReader.read(file_path, **{option: 2})
+    with pytest.raises(NotImplementedError):
+        momapy_bel.io.bel.BELReader.read(file_path, return_type="layout")
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "p() -> p(HGNC:B)",
+        "p(HGNC:A) -> p(HGNC:B, HGNC:C)",
+        "p(HGNC:A, loc(GO:a), loc(GO:b)) -> p(HGNC:B)",
+        "p(HGNC:A, pmod(Ph, Ser, 473, 474)) -> p(HGNC:B)",
+        "p(HGNC:A, var(p.Gly12Cys, p.Gly13Cys)) -> p(HGNC:B)",
+        "p(fus(HGNC:BCR, r.1_3500, HGNC:ABL1)) -> p(HGNC:B)",
+        "bp(GO:a, GO:b) -> p(HGNC:B)",
+        "act(p(HGNC:A), ma(kin), ma(cat)) -> p(HGNC:B)",
+        "deg(p(HGNC:A), p(HGNC:B)) -> p(HGNC:C)",
+        "rxn(reactants(a(CHEBI:x))) -> p(HGNC:B)",
+        "rxn(reactants(a(CHEBI:x)), reactants(a(CHEBI:y)))",
+        "tloc(p(HGNC:A), fromLoc(GO:a, GO:b), toLoc(GO:c))",
+        "tloc(p(HGNC:A), fromLoc(GO:a))",
+        "reactants(a(CHEBI:x)) -> p(HGNC:B)",
+        "p(HGNC:A) ->",
+        "p(HGNC:A) unknownRelation p(HGNC:B)",
+        "SET Evidence =",
+        'DEFINE ANNOTATION Cell AS URL {"a", "b"}',
+        "UNSET",
+    ],
+)
+def test_read_invalid_line(tmp_path, line):
+    with pytest.raises(ValueError, match=r"line 2 "):
+        read_string(tmp_path, f'SET Citation = {{"PubMed", "1"}}\n{line}\n')
+
+
+def test_write_options(tmp_path):
+    bel_model, annotation_definitions, annotations = make_annotated_bel_model()
+    options = momapy_bel.io.bel.BELWriterOptions(
+        with_grouped_annotations=True, with_canonical_order=True
+    )
+    file_path = tmp_path / "options.bel"
+    momapy_bel.io.bel.BELWriter.write(
+        bel_model, file_path, (), annotation_definitions, annotations, options
+    )
+    kwargs_file_path = tmp_path / "kwargs.bel"
+    momapy_bel.io.bel.BELWriter.write(
+        bel_model,
+        kwargs_file_path,
+        (),
+        annotation_definitions,
+        annotations,
+        with_grouped_annotations=True,
+        with_canonical_order=True,
+    )
+    assert file_path.read_text() == kwargs_file_path.read_text()
+    assert file_path.read_text() == "\n".join(
+        momapy_bel.io.bel.BELWriter.iter_lines(
+            bel_model, (), annotation_definitions, annotations, options
+        )
+    )
+    with pytest.raises(TypeError):
+        momapy_bel.io.bel.BELWriter.write(
+            bel_model, file_path, (), (), {}, options, unknown_option=True
+        )
+
+
+def test_canonical_order_does_not_depend_on_hashes(tmp_path):
+    # Models are written in processes with different string hash seeds
+    code = (
+        "import sys, tests.test_bel, momapy_bel.io.bel\n"
+        "bel_model, annotation_definitions, annotations = "
+        "tests.test_bel.make_annotated_bel_model()\n"
+        "momapy_bel.io.bel.BELWriter.write(bel_model, sys.argv[1], (), "
+        "annotation_definitions, annotations, with_canonical_order=True)\n"
+    )
+    outputs = set()
+    for hash_seed in range(3):
+        file_path = tmp_path / f"{hash_seed}.bel"
+        environment = dict(
+            os.environ,
+            PYTHONHASHSEED=str(hash_seed),
+            PYTHONPATH=os.pathsep.join(sys.path),
+        )
+        subprocess.run(
+            [sys.executable, "-c", code, file_path],
+            env=environment,
+            check=True,
+        )
+        outputs.add(file_path.read_text())
+    assert len(outputs) == 1
+
+
+@pytest.mark.parametrize("with_grouped_annotations", [False, True])
+def test_write_in_processes(with_grouped_annotations):
+    bel_model, annotation_definitions, annotations = make_annotated_bel_model()
+    options = momapy_bel.io.bel.BELWriterOptions(
+        with_grouped_annotations=with_grouped_annotations
+    )
+    lines = list(
+        momapy_bel.io.bel.BELWriter.iter_lines(
+            bel_model, (), annotation_definitions, annotations, options
+        )
+    )
+    parallel_lines = list(
+        momapy_bel.io.bel.BELWriter.iter_lines(
+            bel_model,
+            (),
+            annotation_definitions,
+            annotations,
+            options,
+            processes=2,
+            chunk_size=3,
+        )
+    )
+    assert parallel_lines == lines
+
+
+@pytest.mark.parametrize("with_grouped_annotations", [False, True])
+def test_write_with_block_cache(with_grouped_annotations):
+    bel_model, annotation_definitions, annotations = make_annotated_bel_model()
+    options = momapy_bel.io.bel.BELWriterOptions(
+        with_grouped_annotations=with_grouped_annotations,
+        with_canonical_order=True,
+    )
+    block_cache = momapy_bel.io.bel.BELStatementBlockCache(block_size=2)
+
+    def get_lines(bel_model, block_cache=None):
+        return list(
+            momapy_bel.io.bel.BELWriter.iter_lines(
+                bel_model,
+                (),
+                annotation_definitions,
+                annotations,
+                options,
+                block_cache=block_cache,
+            )
+        )
+
+    assert get_lines(bel_model, block_cache) == get_lines(bel_model)
+    assert block_cache.hits == 0
+    n_blocks = len(block_cache)
+    # A statement is removed and another added: only their blocks are
+    # rendered again
+    statements = sorted(
+        bel_model.statements, key=momapy_bel.core.get_sort_key
+    )
+    new_bel_model = momapy_bel.core.BELModel(
+        statements=frozenset(
+            statements[1:]
+            + [
+                momapy_bel.core.Increases(
+                    source=make_protein("NEW1"), target=make_protein("NEW2")
+                )
+            ]
+        )
+    )
+    assert get_lines(new_bel_model, block_cache) == get_lines(new_bel_model)
+    assert block_cache.misses <= n_blocks + 3
+    assert block_cache.hits >= len(block_cache) - 3
+    with pytest.raises(ValueError, match="with_canonical_order"):
+        list(
+            momapy_bel.io.bel.BELWriter.iter_lines(
+                bel_model, (), (), {}, block_cache=block_cache
+            )
+        )
+    with pytest.raises(ValueError, match="processes"):
+        list(
+            momapy_bel.io.bel.BELWriter.iter_lines(
+                bel_model,
+                (),
+                (),
+                {},
+                options,
+                block_cache=block_cache,
+                processes=2,
+            )
+        )
+
+
+@pytest.mark.parametrize("compression", [".gz", ".bz2", ".xz"])
+def test_round_trip_compressed_file(tmp_path, compression):
+    bel_model, annotation_definitions, annotations = make_annotated_bel_model()
+    file_path = tmp_path / f"model.bel{compression}"
+    momapy_bel.io.bel.BELWriter.write(
+        bel_model, file_path, (), annotation_definitions, annotations
+    )
+    assert not file_path.read_bytes().startswith(b"SET")
+    result = momapy_bel.io.bel.BELReader.read(file_path)
+    element_to_annotations = result.element_to_annotations
+    assert result.obj.statements == bel_model.statements
+    for statement in bel_model.statements:
+        assert element_to_annotations[statement] == annotations[statement]
+
+
+def test_write_gzip_file_in_threads(tmp_path):
+    bel_model, annotation_definitions, annotations = make_annotated_bel_model()
+    file_path = tmp_path / "model.bel"
+    momapy_bel.io.bel.BELWriter.write(
+        bel_model, file_path, (), annotation_definitions, annotations
+    )
+    gzip_file_path = tmp_path / "model.bel.gz"
+    momapy_bel.io.bel.BELWriter.write(
+        bel_model,
+        gzip_file_path,
+        (),
+        annotation_definitions,
+        annotations,
+        buffer_size=64,
+        compression_threads=2,
+        compression_block_size=256,
+    )
+    # The file is made of several gzip members, read back as one
+    data = gzip_file_path.read_bytes()
+    decompressor = zlib.decompressobj(wbits=31)
+    decompressor.decompress(data)
+    assert decompressor.unused_data.startswith(b"\x1f\x8b")
+    with gzip.open(gzip_file_path, "rt", encoding="utf-8") as f:
+        assert f.read() == file_path.read_text()
+    result = momapy_bel.io.bel.BELReader.read(gzip_file_path)
+    assert result.obj.statements == bel_model.statements
+
+
+@pytest.mark.parametrize("with_canonical_order", [False, True])
+def test_profiled_write_output(tmp_path, with_canonical_order):
+    bel_model, annotation_definitions, annotations = make_annotated_bel_model()
+    file_path = tmp_path / "model.bel"
+    profiled_file_path = tmp_path / "profiled.bel"
+    for file_path_, profile in [
+        (file_path, None),
+        (profiled_file_path, momapy_bel.io.bel.BELWriterProfile()),
+    ]:
+        momapy_bel.io.bel.BELWriter.write(
+            bel_model,
+            file_path_,
+            (),
+            annotation_definitions,
+            annotations,
+            with_grouped_annotations=True,
+            with_canonical_order=with_canonical_order,
+            profile=profile,
+        )
+    assert profiled_file_path.read_text() == file_path.read_text()
+
+
+def test_profiled_write_handler_stats():
+    bel_model = momapy_bel.core.BELModel(
+        statements=frozenset(
+            [
+                momapy_bel.core.Increases(
+                    source=make_protein("AKT1"), target=make_protein("PDPK1")
+                ),
+                momapy_bel.core.Decreases(
+                    source=make_protein("PDPK1"),
+                    target=make_chemical("glucose"),
+                ),
+            ]
+        )
+    )
+    reports = []
+    profile = momapy_bel.io.bel.BELWriterProfile(hook=reports.append)
+    # Strings of terms are not cached, so that each term is rendered
+    momapy_bel.io.bel.BELWriter.write(
+        bel_model, io.StringIO(), (), (), {}, profile=profile, cache_size=0
+    )
+    assert {
+        handler_name: (handler_stats.calls, handler_stats.output_size)
+        for handler_name, handler_stats in profile.handler_stats.items()
+    } == {
+        "_increases_to_string": (1, len("p(HGNC:AKT1) -> p(HGNC:PDPK1)")),
+        "_decreases_to_string": (1, len("p(HGNC:PDPK1) -| a(CHEBI:glucose)")),
+        "_protein_abundance_to_string": (
+            3,
+            len("p(HGNC:AKT1)") + 2 * len("p(HGNC:PDPK1)"),
+        ),
+        "_abundance_to_string": (1, len("a(CHEBI:glucose)")),
+    }
+    for handler_stats in profile.handler_stats.values():
+        assert 0 <= handler_stats.self_time <= handler_stats.cumulative_time
+    assert reports == [profile.report()]
+    assert profile.total_time > 0
+    profile.clear()
+    assert not profile.handler_stats
+
+
+def test_write_does_not_index_model():
+    bel_model = make_bel_model()
+    lines = list(momapy_bel.io.bel.BELWriter.iter_lines(bel_model, (), (), {}))
+    assert "index" not in vars(bel_model)
+    abundance_lines = list(
+        momapy_bel.io.bel.BELWriter.iter_lines(
+            bel_model,
+            (),
+            (),
+            {},
+            with_abundances_as_statements=True,
+            with_reactions_as_statements=False,
+        )
+    )
+    assert len(lines) == len(bel_model.statements)
+    assert len(abundance_lines) == len(bel_model.statements) - 1
+    reaction_line = momapy_bel.io.bel.BELWriter._bel_statement_to_string(
+        make_terms()[-1]
+    )
+    assert reaction_line in lines
+    assert reaction_line not in abundance_lines
+
+
+class TransformationFuncBELWriter(momapy_bel.io.bel.BELWriter):
+    @classmethod
+    def _make_specialized_renderer(cls, transformation_func_name):
+        return None
+
+
+class UpperCaseProteinBELWriter(momapy_bel.io.bel.BELWriter):
+    @classmethod
+    def _protein_abundance_to_string(cls, protein_abundance):
+        return super()._protein_abundance_to_string(protein_abundance).upper()
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class TaggedProteinAbundance(momapy_bel.core.ProteinAbundance):
+    tag: str | None = None
+
+
+@pytest.mark.parametrize("with_symbol_table", [False, True])
+def test_generated_renderers_match_transformation_funcs(with_symbol_table):
+    statements = sorted(
+        make_bel_model().statements, key=momapy_bel.core.get_sort_key
+    )
+    statements += [
+        momapy_bel.core.Increases(source=term, target=make_protein("AKT1"))
+        for term in make_terms()
+    ]
+    for statement in statements:
+        symbol_table = momapy_bel.core.BELSymbolTable()
+        bel_string = momapy_bel.io.bel.BELWriter._bel_statement_to_string(
+            statement,
+            symbol_table=symbol_table if with_symbol_table else None,
+        )
+        writer_cls = TransformationFuncBELWriter
+        assert bel_string == writer_cls._bel_statement_to_string(statement)
+
+
+def test_render_subclass_of_element():
+    protein = TaggedProteinAbundance(
+        namespace="HGNC", identifier="AKT1", tag="tagged"
+    )
+    statement = momapy_bel.core.Increases(
+        source=protein, target=make_protein("PDPK1")
+    )
+    for writer_cls in [
+        momapy_bel.io.bel.BELWriter,
+        TransformationFuncBELWriter,
+    ]:
+        assert (
+            writer_cls._bel_statement_to_string(statement)
+            == "p(HGNC:AKT1) -> p(HGNC:PDPK1)"
+        )
+        assert TaggedProteinAbundance in writer_cls._element_cls_to_renderer
+
+
+def test_render_with_overridden_transformation_func():
+    statement = momapy_bel.core.Increases(
+        source=TaggedProteinAbundance(namespace="HGNC", identifier="akt1"),
+        target=make_chemical("glucose"),
+    )
+    assert (
+        UpperCaseProteinBELWriter._bel_statement_to_string(statement)
+        == "P(HGNC:AKT1) -> a(CHEBI:glucose)"
+    )
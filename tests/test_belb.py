@@ -0,0 +1,300 @@
+import array
+import io
+import random
+
+import pytest
+
+import momapy_bel.core
+import momapy_bel.io.belb
+
+from .test_bel import make_annotated_bel_model
+
+
+def write_model(file_path):
+    bel_model, annotation_definitions, annotations = make_annotated_bel_model()
+    namespace_definitions = (
+        momapy_bel.core.BELNamespaceDefinition(
+            name="HGNC", as_="https://example.org/hgnc.belns"
+        ),
+    )
+    momapy_bel.io.belb.BELBWriter.write(
+        bel_model,
+        file_path,
+        namespace_definitions,
+        annotation_definitions,
+        annotations,
+    )
+    return bel_model, namespace_definitions, annotation_definitions, annotations
+
+
+def read_all(file_path, mapped):
+    # Mapped files are decoded as they are accessed, hence are accessed in
+    # full
+    result = momapy_bel.io.belb.BELBReader.read(file_path, mapped=mapped)
+    statements = list(result.obj.statements)
+    element_to_annotations = dict(result.element_to_annotations)
+    return result, statements, element_to_annotations
+
+
+def rewrite_sections(file_path, corrupt):
+    # Rewrites the file with the arrays of its sections changed by corrupt
+    data = file_path.read_bytes()
+    section_to_codes, blob = momapy_bel.io.belb._get_sections(memoryview(data))
+    section_to_array = {
+        section: array.array(codes.format, codes)
+        for section, codes in section_to_codes.items()
+    }
+    corrupt(section_to_array)
+    stream = io.BytesIO()
+    momapy_bel.io.belb.BELBWriter._write_sections(
+        stream, section_to_array, bytes(blob)
+    )
+    file_path.write_bytes(stream.getvalue())
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_round_trip(tmp_path, mapped):
+    file_path = tmp_path / "model.belb"
+    bel_model, namespace_definitions, annotation_definitions, annotations = (
+        write_model(file_path)
+    )
+    result, statements, element_to_annotations = read_all(file_path, mapped)
+    assert frozenset(statements) == bel_model.statements
+    assert result.namespace_definitions == namespace_definitions
+    assert result.annotation_definitions == annotation_definitions
+    assert element_to_annotations[result.obj] == annotations[bel_model]
+    for statement in bel_model.statements:
+        assert element_to_annotations[statement] == annotations[statement]
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_read_options(tmp_path, mapped):
+    file_path = tmp_path / "model.belb"
+    bel_model = write_model(file_path)[0]
+    result = momapy_bel.io.belb.BELBReader.read(
+        file_path, mapped=mapped, return_type="model", with_notes=False
+    )
+    assert result.obj.statements == bel_model.statements
+    with pytest.raises(TypeError, match="maped"):
+        momapy_bel.io.belb.BELBReader.read(file_path, maped=mapped)
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_read_not_belb_file(tmp_path, mapped):
+    file_path = tmp_path / "model.belb"
+    file_path.write_bytes(b"SET DOCUMENT Name = \"model\"\n")
+    with pytest.raises(ValueError, match="not a BELB file"):
+        momapy_bel.io.belb.BELBReader.read(file_path, mapped=mapped)
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_read_other_version(tmp_path, mapped):
+    file_path = tmp_path / "model.belb"
+    write_model(file_path)
+    data = bytearray(file_path.read_bytes())
+    data[4:6] = (3).to_bytes(2, "big")
+    file_path.write_bytes(data)
+    assert not momapy_bel.io.belb.BELBReader.check_file(file_path)
+    with pytest.raises(ValueError, match="unsupported BELB version 3"):
+        momapy_bel.io.belb.BELBReader.read(file_path, mapped=mapped)
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_read_truncated_file(tmp_path, mapped):
+    file_path = tmp_path / "model.belb"
+    write_model(file_path)
+    data = file_path.read_bytes()
+    truncated_file_path = tmp_path / "truncated.belb"
+    for size in range(len(data)):
+        truncated_file_path.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            read_all(truncated_file_path, mapped)
+
+
+def set_forward_reference(section_to_array):
+    # The first object is decoded from the codes of the last one, which
+    # refers to objects that come after it
+    object_offsets = section_to_array["object_offsets"]
+    object_offsets[0] = object_offsets[-1]
+
+
+def set_unknown_class(section_to_array):
+    section_to_array["objects"][0] = len(section_to_array["classes"])
+
+
+def set_unknown_tag(section_to_array):
+    section_to_array["objects"][1] = 9
+
+
+def set_unknown_string(section_to_array):
+    objects = section_to_array["objects"]
+    for object_offset in section_to_array["object_offsets"]:
+        if objects[object_offset + 1] == momapy_bel.io.belb._STRING:
+            objects[object_offset + 2] = -1
+            break
+
+
+def set_object_offset_out_of_range(section_to_array):
+    section_to_array["object_offsets"][0] = len(section_to_array["objects"])
+
+
+def set_statement_out_of_range(section_to_array):
+    section_to_array["statements"][0] = -2
+
+
+def set_annotation_tuple_out_of_range(section_to_array):
+    section_to_array["annotations"][1] = 10000
+
+
+def set_unsorted_string_offsets(section_to_array):
+    # Mapped files do not check the order of all offsets, and decode the
+    # first string, a class, from the first two strings
+    string_offsets = section_to_array["string_offsets"]
+    string_offsets[1], string_offsets[2] = string_offsets[2], string_offsets[1]
+
+
+def set_unknown_class_name(section_to_array):
+    # The last string is that of a field, rather than of a class
+    n_strings = len(section_to_array["string_offsets"]) - 1
+    section_to_array["classes"][0] = n_strings - 1
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+@pytest.mark.parametrize(
+    "corrupt, match",
+    [
+        (set_forward_reference, "object 0 refers to object"),
+        (set_unknown_class, "unknown class id"),
+        (set_unknown_tag, "unknown value tag 9"),
+        (set_unknown_string, "unknown string id -1"),
+        (set_object_offset_out_of_range, "offset .* out of range"),
+        (set_statement_out_of_range, "section statements"),
+        (set_annotation_tuple_out_of_range, "annotation tuple id 10000"),
+        (
+            set_unsorted_string_offsets,
+            "string offsets are not sorted|unknown field",
+        ),
+        (set_unknown_class_name, "unknown (class|field)"),
+    ],
+)
+def test_read_corrupted_file(tmp_path, mapped, corrupt, match):
+    file_path = tmp_path / "model.belb"
+    write_model(file_path)
+    rewrite_sections(file_path, corrupt)
+    with pytest.raises(ValueError, match=f"corrupted BELB file: .*({match})"):
+        read_all(file_path, mapped)
+
+
+def test_read_file_with_trailing_data(tmp_path):
+    file_path = tmp_path / "model.belb"
+    write_model(file_path)
+    file_path.write_bytes(file_path.read_bytes() + b"\x00")
+    with pytest.raises(ValueError, match="unexpected data"):
+        momapy_bel.io.belb.BELBReader.read(file_path)
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_read_file_with_flipped_bytes(tmp_path, mapped):
+    # Flipped bytes may go unnoticed, as in strings, but must not raise
+    # other errors than ValueError, nor make reading loop
+    file_path = tmp_path / "model.belb"
+    write_model(file_path)
+    data = file_path.read_bytes()
+    corrupted_file_path = tmp_path / "corrupted.belb"
+    rng = random.Random(0)
+    for _ in range(500):
+        corrupted_data = bytearray(data)
+        for _ in range(rng.randint(1, 4)):
+            corrupted_data[rng.randrange(len(data))] ^= 1 << rng.randrange(8)
+        corrupted_file_path.write_bytes(corrupted_data)
+        try:
+            read_all(corrupted_file_path, mapped)
+        except ValueError:
+            pass
+
+
+def test_mapped_statements_set_operations(tmp_path):
+    file_path = tmp_path / "model.belb"
+    bel_model = write_model(file_path)[0]
+    statements = bel_model.statements
+    result = momapy_bel.io.belb.BELBReader.read(file_path, mapped=True)
+    mapped_statements = result.obj.statements
+    statement, *other_statements = sorted(
+        statements, key=momapy_bel.core.get_sort_key
+    )
+    some_statements = frozenset(other_statements)
+    assert mapped_statements == statements
+    assert statements == mapped_statements
+    assert hash(mapped_statements) == hash(statements)
+    for operation, args in [
+        ("union", [[statement]]),
+        ("intersection", [other_statements]),
+        ("difference", [other_statements]),
+        ("symmetric_difference", [other_statements]),
+        ("issubset", [other_statements]),
+        ("issuperset", [other_statements]),
+        ("isdisjoint", [other_statements]),
+        ("copy", []),
+    ]:
+        assert getattr(mapped_statements, operation)(*args) == getattr(
+            statements, operation
+        )(*args)
+    for mapped_result, result in [
+        (mapped_statements | some_statements, statements | some_statements),
+        (some_statements | mapped_statements, statements),
+        (mapped_statements & some_statements, some_statements),
+        (some_statements & mapped_statements, some_statements),
+        (mapped_statements - some_statements, frozenset([statement])),
+        (some_statements - mapped_statements, frozenset()),
+        (mapped_statements ^ some_statements, frozenset([statement])),
+        (some_statements ^ mapped_statements, frozenset([statement])),
+    ]:
+        assert type(mapped_result) is frozenset
+        assert mapped_result == result
+    assert mapped_statements >= some_statements
+    assert not mapped_statements <= some_statements
+    assert some_statements < mapped_statements
+
+
+def test_write_value_of_other_type(tmp_path):
+    bel_model = momapy_bel.core.BELModel(
+        statements=frozenset(
+            [momapy_bel.core.ProteinAbundance(namespace="HGNC", identifier=42)]
+        )
+    )
+    with pytest.raises(TypeError, match="cannot encode value 42"):
+        momapy_bel.io.belb.BELBWriter.write(bel_model, tmp_path / "model.belb")
+
+
+def test_close_mapped_file(tmp_path):
+    file_path = tmp_path / "model.belb"
+    bel_model = write_model(file_path)[0]
+    with momapy_bel.io.belb.MappedBELB(file_path) as mapped_belb:
+        result = mapped_belb.get_reader_result()
+        statement = result.obj.statements.get_statement(0)
+        assert not mapped_belb.closed
+    assert mapped_belb.closed
+    mapped_belb.close()
+    # Objects decoded already stay available, others cannot be decoded
+    assert statement in bel_model.statements
+    with pytest.raises(ValueError, match="closed BELB file"):
+        mapped_belb.objects[len(mapped_belb.objects) - 1]
+    with pytest.raises(ValueError):
+        list(result.obj.statements)
+
+
+def test_mapped_annotations_length(tmp_path):
+    file_path = tmp_path / "model.belb"
+    annotations = write_model(file_path)[3]
+
+    def duplicate_first_annotation(section_to_array):
+        section_to_array["annotations"].extend(
+            section_to_array["annotations"][:2]
+        )
+
+    rewrite_sections(file_path, duplicate_first_annotation)
+    with momapy_bel.io.belb.MappedBELB(file_path) as mapped_belb:
+        result = mapped_belb.get_reader_result()
+        element_to_annotations = result.element_to_annotations
+        assert len(element_to_annotations) == len(annotations)
+        assert len(dict(element_to_annotations)) == len(annotations)
@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+BENCHMARKS_DIR_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"
+)
+
+
+@pytest.fixture
+def synthetic(monkeypatch):
+    # Benchmarks import synthetic.py as a top-level module
+    monkeypatch.syspath_prepend(BENCHMARKS_DIR_PATH)
+    import synthetic
+
+    return synthetic
+
+
+def test_synthetic_model_is_deterministic(synthetic):
+    statements, annotation_definitions, statement_to_annotations = (
+        synthetic.make_statements_and_annotations(200)
+    )
+    other_statements, _, other_statement_to_annotations = (
+        synthetic.make_statements_and_annotations(200)
+    )
+    assert len(set(statements)) == 200
+    assert list(statement_to_annotations) == statements
+    # Equal models are made of distinct objects
+    assert other_statements == statements
+    assert all(
+        other_statement is not statement
+        for statement, other_statement in zip(statements, other_statements)
+    )
+    assert other_statement_to_annotations == statement_to_annotations
+    assert [
+        annotation_definition.name
+        for annotation_definition in annotation_definitions
+    ] == ["Citation", "Evidence", "Species"]
+    seeded_statements, _, _ = synthetic.make_statements_and_annotations(
+        200, seed=1
+    )
+    assert seeded_statements != statements
+
+
+def test_bench_suite(tmp_path):
+    # Sizes are measured in processes that import momapy_bel and synthetic
+    output_file_path = tmp_path / "bench_suite.json"
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    subprocess.run(
+        [
+            sys.executable,
+            os.path.join(BENCHMARKS_DIR_PATH, "bench_suite.py"),
+            "--sizes",
+            "100",
+            "50",
+            "--check",
+            "--output",
+            output_file_path,
+        ],
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+    report = json.loads(output_file_path.read_text())
+    assert [results["statements"] for results in report["results"]] == [
+        50,
+        100,
+    ]
+    for results in report["results"]:
+        assert results["file_bytes"] > 0
+        assert results["write_s"] > 0
@@ -0,0 +1,80 @@
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+import momapy_bel.columnar
+import momapy_bel.core
+
+from .test_bel import make_bel_model, make_protein
+
+
+def make_chain_bel_model():
+    a, b, c = [make_protein(identifier) for identifier in "ABC"]
+    statements = [
+        momapy_bel.core.Increases(source=a, target=b),
+        momapy_bel.core.Increases(source=b, target=c),
+        momapy_bel.core.Decreases(source=a, target=c),
+        momapy_bel.core.Reaction(
+            reactants=frozenset([a]), products=frozenset([c])
+        ),
+    ]
+    bel_model = momapy_bel.core.BELModel(statements=frozenset(statements))
+    return bel_model, (a, b, c)
+
+
+def test_round_trip():
+    bel_model = make_bel_model()
+    columnar_model = momapy_bel.columnar.ColumnarBELModel.from_bel_model(
+        bel_model
+    )
+    assert columnar_model.to_bel_model() == bel_model
+    assert len(columnar_model) + len(columnar_model.term_statements) == len(
+        bel_model.statements
+    )
+
+
+def test_queries():
+    bel_model, (a, b, c) = make_chain_bel_model()
+    columnar_model = momapy_bel.columnar.ColumnarBELModel.from_bel_model(
+        bel_model
+    )
+    assert columnar_model.count_relations() == {
+        momapy_bel.core.Increases: 2,
+        momapy_bel.core.Decreases: 1,
+    }
+    selected_model = columnar_model.select(
+        relation_clses=[momapy_bel.core.Increases], sources=[a]
+    )
+    assert selected_model.to_bel_model().statements == frozenset(
+        [momapy_bel.core.Increases(source=a, target=b)]
+    )
+    term_ids = [columnar_model.get_term_id(term) for term in [a, b, c]]
+    assert columnar_model.get_out_degrees()[term_ids].tolist() == [2, 1, 0]
+    assert columnar_model.get_in_degrees()[term_ids].tolist() == [0, 1, 2]
+    with pytest.raises(TypeError, match="not a relation"):
+        momapy_bel.columnar.get_relation_code(momapy_bel.core.Reaction)
+
+
+def test_join():
+    bel_model, (a, b, c) = make_chain_bel_model()
+    columnar_model = momapy_bel.columnar.ColumnarBELModel.from_bel_model(
+        bel_model
+    )
+    left_indices, right_indices = columnar_model.join()
+    terms = columnar_model.terms
+    pairs = [
+        (
+            terms[columnar_model.sources[left_index]],
+            terms[columnar_model.targets[left_index]],
+            terms[columnar_model.targets[right_index]],
+        )
+        for left_index, right_index in zip(
+            left_indices.tolist(), right_indices.tolist()
+        )
+    ]
+    assert pairs == [(a, b, c)]
+    other_columnar_model = momapy_bel.columnar.ColumnarBELModel.from_bel_model(
+        bel_model
+    )
+    with pytest.raises(ValueError, match="term table"):
+        columnar_model.join(other_columnar_model)
@@ -0,0 +1,198 @@
+import momapy_bel.core
+
+
+def test_symbol_table_is_bounded():
+    symbol_table = momapy_bel.core.BELSymbolTable(maxsize=2)
+    first_symbol = symbol_table.get_symbol("HGNC", "A")
+    assert symbol_table.get_symbol("HGNC", "A") is first_symbol
+    symbol_table.get_symbol("HGNC", "B")
+    assert len(symbol_table) == 2
+    symbol_table.get_symbol("GO", "with space")
+    assert len(symbol_table) == 1
+    assert symbol_table.get_token("GO", "with space") == 'GO:"with space"'
+    assert symbol_table.get_token("HGNC", "A") == "HGNC:A"
+    assert len(symbol_table) == 2
+
+
+def test_hash_is_cached_and_not_pickled():
+    import pickle
+
+    location = momapy_bel.core.Location(namespace="GO", identifier="cytoplasm")
+    protein = momapy_bel.core.ProteinAbundance(
+        namespace="HGNC", identifier="AKT1", location=location
+    )
+    other_protein = momapy_bel.core.ProteinAbundance(
+        namespace="HGNC", identifier="AKT1", location=location
+    )
+    assert hash(protein) == hash(other_protein)
+    assert protein._hash == hash(protein)
+    unpickled_protein = pickle.loads(pickle.dumps(protein))
+    assert unpickled_protein._hash is None
+    assert unpickled_protein.id_ == protein.id_
+    assert unpickled_protein == protein
+    assert hash(unpickled_protein) == hash(protein)
+
+
+def test_builder_index():
+    import momapy.builder
+
+    location = momapy_bel.core.Location(namespace="GO", identifier="cytoplasm")
+    akt1 = momapy_bel.core.ProteinAbundance(
+        namespace="HGNC", identifier="AKT1", location=location
+    )
+    pdpk1 = momapy_bel.core.ProteinAbundance(
+        namespace="HGNC", identifier="PDPK1"
+    )
+    statement = momapy_bel.core.Increases(source=pdpk1, target=akt1)
+    other_statement = momapy_bel.core.Decreases(source=akt1, target=pdpk1)
+    bel_model = momapy_bel.core.BELModel(statements=frozenset([statement]))
+    builder = momapy.builder.builder_from_object(bel_model)
+    # Statements of the builder are builders, and it is indexed as built
+    assert builder.index.get_statements_by_class(
+        momapy_bel.core.Increases
+    ) == (statement,)
+    assert builder.index.get_statements_by_namespace_identifier(
+        "HGNC", "AKT1"
+    ) == (statement,)
+    # The index follows the statements of the builder
+    builder.statements.add(other_statement)
+    assert builder.index.get_statements_by_class(
+        momapy_bel.core.Decreases
+    ) == (other_statement,)
+    assert set(
+        builder.index.get_statements_by_namespace_identifier("GO", "cytoplasm")
+    ) == {statement, other_statement}
+
+
+def make_bel_model_with_copied_terms():
+    # Equal terms of the two statements are different objects
+    statements = []
+    for target_identifier in ["AKT1", "PDPK1"]:
+        location = momapy_bel.core.Location(
+            namespace="GO", identifier="cytoplasm"
+        )
+        source = momapy_bel.core.ComplexAbundance(
+            members=frozenset(
+                [
+                    momapy_bel.core.ProteinAbundance(
+                        namespace="HGNC", identifier="MTOR", location=location
+                    ),
+                    # Values of other types are kept as they are
+                    momapy_bel.core.ProteinAbundance(
+                        namespace=None, identifier=42
+                    ),
+                ]
+            )
+        )
+        target = momapy_bel.core.ProteinAbundance(
+            namespace="HGNC", identifier=target_identifier, location=location
+        )
+        statements.append(
+            momapy_bel.core.Increases(source=source, target=target)
+        )
+    return momapy_bel.core.BELModel(statements=frozenset(statements))
+
+
+def test_pickle_bel_model():
+    import pickle
+
+    bel_model = make_bel_model_with_copied_terms()
+    unpickled_bel_model = pickle.loads(pickle.dumps(bel_model))
+    assert unpickled_bel_model == bel_model
+    statement_to_unpickled_statement = {
+        statement: statement for statement in unpickled_bel_model.statements
+    }
+    for statement in bel_model.statements:
+        unpickled_statement = statement_to_unpickled_statement[statement]
+        assert unpickled_statement.id_ == statement.id_
+        assert unpickled_statement.target.id_ == statement.target.id_
+    # Equal terms are unpickled as one object
+    sources = {
+        id(statement.source) for statement in unpickled_bel_model.statements
+    }
+    assert len(sources) == 1
+
+
+def test_copy_bel_model():
+    import copy
+
+    bel_model = make_bel_model_with_copied_terms()
+    assert copy.copy(bel_model) is bel_model
+    deep_copied_bel_model = copy.deepcopy(bel_model)
+    assert deep_copied_bel_model == bel_model
+    assert not any(
+        statement is deep_copied_statement
+        for statement in bel_model.statements
+        for deep_copied_statement in deep_copied_bel_model.statements
+    )
+
+
+def make_complex(*identifiers):
+    return momapy_bel.core.ComplexAbundance(
+        members=frozenset(
+            momapy_bel.core.ProteinAbundance(
+                namespace="HGNC", identifier=identifier
+            )
+            for identifier in identifiers
+        ),
+        location=momapy_bel.core.Location(
+            namespace="GO", identifier="cytoplasm"
+        ),
+    )
+
+
+def test_interner_returns_canonical_elements():
+    interner = momapy_bel.core.BELElementInterner()
+    complex_ = interner.intern(make_complex("AKT1", "PDPK1"))
+    other_complex = interner.intern(make_complex("AKT1", "PDPK1"))
+    assert other_complex is complex_
+    assert interner.hits == 4
+    assert interner.misses == 4
+    assert interner.saved_bytes > 0
+    statement = momapy_bel.core.Increases(
+        source=make_complex("AKT1", "PDPK1"),
+        target=momapy_bel.core.ProteinAbundance(
+            namespace="HGNC", identifier="AKT1"
+        ),
+    )
+    bel_model = interner.intern_model(
+        momapy_bel.core.BELModel(statements=frozenset([statement]))
+    )
+    (interned_statement,) = bel_model.statements
+    assert interned_statement == statement
+    assert interned_statement.source is complex_
+    assert interned_statement.target in complex_.members
+    made_complex = interner.make(
+        momapy_bel.core.ComplexAbundance,
+        members=complex_.members,
+        location=complex_.location,
+    )
+    assert made_complex is complex_
+    interner.clear()
+    assert len(interner) == 0
+    assert interner.hits == interner.misses == 0
+
+
+def test_interner_does_not_rebuild_canonical_elements():
+    interner = momapy_bel.core.BELElementInterner()
+    complex_ = interner.intern(make_complex("AKT1", "PDPK1"))
+    # Elements made of canonical subelements are kept, their frozensets and
+    # tuples of members included
+    for element in [
+        momapy_bel.core.ComplexAbundance(members=complex_.members),
+        momapy_bel.core.List(elements=tuple(complex_.members)),
+    ]:
+        interned_element = interner.intern(element)
+        assert interned_element is element
+        assert interner.intern(element) is element
+
+
+def test_interner_frees_unused_elements():
+    import gc
+
+    interner = momapy_bel.core.BELElementInterner()
+    complex_ = interner.intern(make_complex("AKT1", "PDPK1"))
+    assert len(interner) == 4
+    del complex_
+    gc.collect()
+    assert len(interner) == 0
@@ -0,0 +1,93 @@
+import gc
+
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+import momapy_bel.core
+import momapy_bel.graph
+
+from .test_bel import make_protein
+
+
+def make_causal_bel_model():
+    a, b, c, d, e = [make_protein(identifier) for identifier in "ABCDE"]
+    statements = [
+        momapy_bel.core.Increases(source=a, target=b),
+        momapy_bel.core.Decreases(source=b, target=c),
+        momapy_bel.core.DirectlyIncreases(source=c, target=d),
+        momapy_bel.core.Regulates(source=a, target=e),
+        # Non causal relations are not edges of the graph
+        momapy_bel.core.Association(source=d, target=a),
+    ]
+    bel_model = momapy_bel.core.BELModel(statements=frozenset(statements))
+    return bel_model, (a, b, c, d, e)
+
+
+def test_causal_graph():
+    bel_model, (a, b, c, d, e) = make_causal_bel_model()
+    causal_graph = momapy_bel.graph.CausalGraph.from_bel_model(bel_model)
+    assert set(causal_graph.nodes) == {a, b, c, d, e}
+    edges = {
+        (
+            causal_graph.nodes[source_id],
+            causal_graph.nodes[target_id],
+            sign,
+        )
+        for source_id, target_id, sign in zip(
+            causal_graph.sources.tolist(),
+            causal_graph.targets.tolist(),
+            causal_graph.signs.tolist(),
+        )
+    }
+    assert edges == {(a, b, 1), (b, c, -1), (c, d, 1), (a, e, 0)}
+
+
+def test_bfs_and_k_hop():
+    bel_model, (a, b, c, d, e) = make_causal_bel_model()
+    causal_graph = momapy_bel.graph.get_causal_graph(bel_model)
+    search_indices, node_ids, depths = causal_graph.bfs([[a], [d]])
+    node_to_depth = [{}, {}]
+    for search_index, node, depth in zip(
+        search_indices.tolist(),
+        causal_graph.get_nodes(node_ids),
+        depths.tolist(),
+    ):
+        node_to_depth[search_index][node] = depth
+    assert node_to_depth == [{a: 0, b: 1, e: 1, c: 2, d: 3}, {d: 0}]
+    assert [set(nodes) for nodes in causal_graph.k_hop([[a], [b]], 1)] == [
+        {b, e},
+        {c},
+    ]
+    assert set(causal_graph.k_hop([[d]], 2, direction="upstream")[0]) == {
+        b,
+        c,
+    }
+    assert set(causal_graph.k_hop([[a]], None, signs={1})[0]) == {b}
+    with pytest.raises(ValueError, match="unknown direction"):
+        causal_graph.k_hop([[a]], 1, direction="sideways")
+
+
+def test_shortest_path():
+    bel_model, (a, b, c, d, e) = make_causal_bel_model()
+    causal_graph = momapy_bel.graph.get_causal_graph(bel_model)
+    assert causal_graph.shortest_path(a, d) == (a, b, c, d)
+    assert causal_graph.shortest_path(d, a) is None
+    assert causal_graph.shortest_path(d, a, direction="both") == (d, c, b, a)
+    assert causal_graph.shortest_path(a, d, signs={1}) is None
+    assert causal_graph.shortest_path(a, make_protein("F")) is None
+
+
+def test_causal_graph_cache():
+    bel_model = make_causal_bel_model()[0]
+    causal_graph = momapy_bel.graph.get_causal_graph(bel_model)
+    assert momapy_bel.graph.get_causal_graph(bel_model) is causal_graph
+    # Equal models have their own graphs, which are freed with them
+    other_bel_model = make_causal_bel_model()[0]
+    assert other_bel_model == bel_model
+    other_causal_graph = momapy_bel.graph.get_causal_graph(other_bel_model)
+    assert other_causal_graph is not causal_graph
+    bel_model_id = id(other_bel_model)
+    del other_bel_model, other_causal_graph
+    gc.collect()
+    assert bel_model_id not in momapy_bel.graph._bel_model_id_to_causal_graph